@@ -6,7 +6,7 @@ Endpoints:
   GET    /api/v1/admin/dashboard                        → Platform-wide stats
   GET    /api/v1/admin/organizations                    → All orgs with stats
   GET    /api/v1/admin/organizations/{id}               → Single org full detail
-  PATCH  /api/v1/admin/organizations/{id}               → Update name/status
+  PATCH  /api/v1/admin/organizations/{id}               → Update name/status/timezone/tier
   DELETE /api/v1/admin/organizations/{id}               → Delete org
   GET    /api/v1/admin/organizations/{id}/users         → Users in org
   GET    /api/v1/admin/organizations/{id}/campaigns     → Campaigns in org
@@ -15,10 +15,13 @@ Endpoints:
   POST   /api/v1/admin/organizations/{id}/wallet/credit → Add minutes
   GET    /api/v1/admin/users                            → All users platform-wide
   PATCH  /api/v1/admin/users/{id}/toggle-status         → Activate/deactivate user
+  GET    /api/v1/admin/system/db-pool                   → DB connection pool usage
+  GET    /api/v1/admin/system/bolna                     → Bolna circuit breaker + concurrency limit
 """
 import re
 import uuid
 from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -26,7 +29,9 @@ from sqlalchemy import select, func
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from uuid import UUID
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, get_read_db, get_redis_client
+from app.db.engine import pool_stats
 from app.core.deps import require_super_admin
 from app.core.security import hash_password
 from app.models.organization import Organization
@@ -34,6 +39,7 @@ from app.models.user import User, UserRole
 from app.models.campaigns import Campaign
 from app.models.call_logs import CallLog
 from app.models.lead import Lead
+from app.services import bolna_guard
 from app.models.wallet import Wallet, WalletTransaction
 
 router = APIRouter(tags=["Super Admin"])
@@ -68,6 +74,26 @@ class RegisterAdminRequest(BaseModel):
 class UpdateOrgRequest(BaseModel):
     name:      Optional[str]  = None
     is_active: Optional[bool] = None
+    timezone:  Optional[str]  = None   # IANA name, e.g. "Asia/Kolkata"
+    tier:      Optional[str]  = None   # key of DISPATCH_TIER_WEIGHTS
+
+    @field_validator("timezone")
+    @classmethod
+    def valid_timezone(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone: {v}")
+        return v
+
+    @field_validator("tier")
+    @classmethod
+    def valid_tier(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None and v not in settings.DISPATCH_TIER_WEIGHTS:
+            raise ValueError(f"tier must be one of: {', '.join(settings.DISPATCH_TIER_WEIGHTS)}")
+        return v
 
 
 class CreditWalletRequest(BaseModel):
@@ -79,7 +105,7 @@ class CreditWalletRequest(BaseModel):
 # ── Dashboard ─────────────────────────────────────────────────────────────────
 
 @router.get("/dashboard")
-async def dashboard(db: AsyncSession = Depends(get_db), _: User = Depends(require_super_admin)):
+async def dashboard(db: AsyncSession = Depends(get_read_db), _: User = Depends(require_super_admin)):
     total_orgs         = await db.scalar(select(func.count()).select_from(Organization))
     active_orgs        = await db.scalar(select(func.count()).select_from(Organization).where(Organization.is_active == True))
     total_admins       = await db.scalar(select(func.count()).select_from(User).where(User.role == UserRole.ADMIN))
@@ -199,7 +225,7 @@ async def register_org_and_admin(
 # ── Organizations ─────────────────────────────────────────────────────────────
 
 @router.get("/organizations")
-async def list_organizations(db: AsyncSession = Depends(get_db), _: User = Depends(require_super_admin)):
+async def list_organizations(db: AsyncSession = Depends(get_read_db), _: User = Depends(require_super_admin)):
     orgs = (await db.execute(select(Organization).order_by(Organization.created_at.desc()))).scalars().all()
 
     result = []
@@ -210,7 +236,7 @@ async def list_organizations(db: AsyncSession = Depends(get_db), _: User = Depen
 
         result.append({
             "id": str(org.id), "name": org.name, "slug": org.slug,
-            "is_active": org.is_active, "created_at": org.created_at,
+            "is_active": org.is_active, "timezone": org.timezone, "tier": org.tier, "created_at": org.created_at,
             "stats":  {"total_users": user_count, "total_campaigns": campaign_count},
             "wallet": {
                 "minutes_balance":         wallet.minutes_balance         if wallet else 0,
@@ -224,7 +250,7 @@ async def list_organizations(db: AsyncSession = Depends(get_db), _: User = Depen
 
 
 @router.get("/organizations/{org_id}")
-async def get_organization(org_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_super_admin)):
+async def get_organization(org_id: UUID, db: AsyncSession = Depends(get_read_db), _: User = Depends(require_super_admin)):
     org = await db.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -239,7 +265,7 @@ async def get_organization(org_id: UUID, db: AsyncSession = Depends(get_db), _:
 
     return {
         "id": str(org.id), "name": org.name, "slug": org.slug,
-        "is_active": org.is_active, "created_at": org.created_at,
+        "is_active": org.is_active, "timezone": org.timezone, "tier": org.tier, "created_at": org.created_at,
         "users": [{"id": str(u.id), "email": u.email, "first_name": u.first_name,
                    "last_name": u.last_name, "role": u.role.value, "is_active": u.is_active,
                    "last_login_at": u.last_login_at} for u in users],
@@ -263,9 +289,13 @@ async def update_organization(org_id: UUID, data: UpdateOrgRequest, db: AsyncSes
         org.name = data.name.strip()
     if data.is_active is not None:
         org.is_active = data.is_active
+    if data.timezone is not None:
+        org.timezone = data.timezone
+    if data.tier is not None:
+        org.tier = data.tier
     await db.commit()
     await db.refresh(org)
-    return {"id": str(org.id), "name": org.name, "is_active": org.is_active}
+    return {"id": str(org.id), "name": org.name, "is_active": org.is_active, "timezone": org.timezone, "tier": org.tier}
 
 
 @router.delete("/organizations/{org_id}")
@@ -281,7 +311,7 @@ async def delete_organization(org_id: UUID, db: AsyncSession = Depends(get_db),
 # ── Per-org: Users ────────────────────────────────────────────────────────────
 
 @router.get("/organizations/{org_id}/users")
-async def org_users(org_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_super_admin)):
+async def org_users(org_id: UUID, db: AsyncSession = Depends(get_read_db), _: User = Depends(require_super_admin)):
     org = await db.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -297,7 +327,7 @@ async def org_users(org_id: UUID, db: AsyncSession = Depends(get_db), _: User =
 # ── Per-org: Campaigns ────────────────────────────────────────────────────────
 
 @router.get("/organizations/{org_id}/campaigns")
-async def org_campaigns(org_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_super_admin)):
+async def org_campaigns(org_id: UUID, db: AsyncSession = Depends(get_read_db), _: User = Depends(require_super_admin)):
     org = await db.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -321,7 +351,7 @@ async def org_campaigns(org_id: UUID, db: AsyncSession = Depends(get_db), _: Use
 # ── Per-org: Minutes breakdown ────────────────────────────────────────────────
 
 @router.get("/organizations/{org_id}/minutes")
-async def org_minutes(org_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_super_admin)):
+async def org_minutes(org_id: UUID, db: AsyncSession = Depends(get_read_db), _: User = Depends(require_super_admin)):
     org = await db.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -359,7 +389,7 @@ async def org_minutes(org_id: UUID, db: AsyncSession = Depends(get_db), _: User
 # ── Per-org: Wallet ───────────────────────────────────────────────────────────
 
 @router.get("/organizations/{org_id}/wallet")
-async def org_wallet(org_id: UUID, db: AsyncSession = Depends(get_db), _: User = Depends(require_super_admin)):
+async def org_wallet(org_id: UUID, db: AsyncSession = Depends(get_read_db), _: User = Depends(require_super_admin)):
     org = await db.get(Organization, org_id)
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
@@ -407,7 +437,7 @@ async def credit_wallet(org_id: UUID, data: CreditWalletRequest, db: AsyncSessio
 # ── All users (cross-org) ─────────────────────────────────────────────────────
 
 @router.get("/users")
-async def list_all_users(db: AsyncSession = Depends(get_db), _: User = Depends(require_super_admin)):
+async def list_all_users(db: AsyncSession = Depends(get_read_db), _: User = Depends(require_super_admin)):
     rows = (await db.execute(
         select(User, Organization.name, Organization.slug)
         .join(Organization, User.organization_id == Organization.id)
@@ -432,4 +462,18 @@ async def toggle_user_status(user_id: UUID, db: AsyncSession = Depends(get_db),
     user.is_active = not user.is_active
     await db.commit()
     return {"id": str(user.id), "email": user.email, "is_active": user.is_active,
-            "message": f"User {'activated' if user.is_active else 'deactivated'}."}
\ No newline at end of file
+            "message": f"User {'activated' if user.is_active else 'deactivated'}."}
+
+
+# ── System ────────────────────────────────────────────────────────────────────
+
+@router.get("/system/db-pool")
+async def db_pool(_: User = Depends(require_super_admin)):
+    """Pool usage of this API process (each worker process has its own pool)."""
+    return pool_stats()
+
+
+@router.get("/system/bolna")
+async def bolna_health(redis=Depends(get_redis_client), _: User = Depends(require_super_admin)):
+    """Breaker state and AIMD concurrency limit shared by all dispatch workers."""
+    return await bolna_guard.astatus(redis)
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from datetime import datetime, timezone
 
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.services.analytics_service import get_campaign_analytics
-from app.models.call_logs import CallLog
+from app.services.call_log_service import list_call_logs, parse_fields
+from app.services.transcript_store import load_transcript, search_transcripts
+from app.schemas.call_logs import CallLogPage
 from app.models.campaigns import Campaign
 from app.models.user import User
 from app.core.deps import get_current_user
@@ -14,10 +17,17 @@ from fastapi import HTTPException
 router = APIRouter()
 
 
+def _naive_utc(value: datetime | None) -> datetime | None:
+    # call_logs.created_at is naive UTC
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 @router.get("/campaigns/{campaign_id}/analytics")
 async def campaign_analytics(
     campaign_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     # Verify campaign belongs to user's org
@@ -33,15 +43,29 @@ async def campaign_analytics(
     return await get_campaign_analytics(db, campaign_id)
 
 
-@router.get("/campaigns/{campaign_id}/logs")
+@router.get(
+    "/campaigns/{campaign_id}/logs",
+    response_model=CallLogPage,
+    response_model_exclude_unset=True,
+)
 async def campaign_logs(
     campaign_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    fields: str | None = Query(None, description="Comma-separated columns, e.g. id,status,duration (default: all)"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    status: str | None = Query(None),
+    customer_sentiment: str | None = Query(None),
+    interest_level: str | None = Query(None),
+    appointment_booked: bool | None = Query(None),
+    created_from: datetime | None = Query(None, description="created_at >= (UTC)"),
+    created_to: datetime | None = Query(None, description="created_at < (UTC)"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
+    """Call logs of a campaign, newest first, one page at a time. Transcripts: .../logs/{id}/transcript."""
     # Verify campaign belongs to user's org
     campaign_result = await db.execute(
-        select(Campaign).where(
+        select(Campaign.id).where(
             Campaign.id == campaign_id,
             Campaign.organization_id == current_user.organization_id,
         )
@@ -49,9 +73,75 @@ async def campaign_logs(
     if not campaign_result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    result = await db.execute(
-        select(CallLog).where(CallLog.campaign_id == campaign_id)
+    return await list_call_logs(
+        db, campaign_id,
+        fields=parse_fields(fields),
+        cursor=cursor,
+        limit=limit,
+        status=status,
+        customer_sentiment=customer_sentiment,
+        interest_level=interest_level,
+        appointment_booked=appointment_booked,
+        created_from=_naive_utc(created_from),
+        created_to=_naive_utc(created_to),
+    )
+
+
+@router.get("/campaigns/{campaign_id}/logs/{call_log_id}/transcript")
+async def call_transcript(
+    campaign_id: UUID,
+    call_log_id: UUID,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Transcript and summary of one call — stored compressed, off the call_logs listing."""
+    campaign_result = await db.execute(
+        select(Campaign.id).where(
+            Campaign.id == campaign_id,
+            Campaign.organization_id == current_user.organization_id,
+        )
     )
-    logs = result.scalars().all()
+    if not campaign_result.scalar_one_or_none():
+        raise HTTPException(status_code=404, detail="Campaign not found")
 
-    return logs
\ No newline at end of file
+    transcript = await load_transcript(db, call_log_id, campaign_id)
+    if transcript is None:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+
+    return transcript
+
+
+@router.get("/campaigns/{campaign_id}/transcripts/search")
+async def search_campaign_transcripts(
+    campaign_id: UUID,
+    q: str = Query(..., min_length=1, max_length=200, description='Words, "exact phrase", OR, -exclude'),
+    customer_sentiment: str | None = Query(None),
+    interest_level: str | None = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Full-text search over the campaign's transcripts and summaries, best match first."""
+    campaign_result = await db.execute(
+        select(Campaign.id).where(
+            Campaign.id == campaign_id,
+            Campaign.organization_id == current_user.organization_id,
+        )
+    )
+    if not campaign_result.scalar_one_or_none():
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    results, has_more = await search_transcripts(
+        db, campaign_id, q,
+        customer_sentiment=customer_sentiment,
+        interest_level=interest_level,
+        offset=(page - 1) * page_size,
+        limit=page_size,
+    )
+    return {
+        "page": page,
+        "page_size": page_size,
+        "has_more": has_more,
+        "results": results,
+    }
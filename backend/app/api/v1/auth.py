@@ -260,6 +260,7 @@ async def forgot_password(
     print(f"[RESET] → Copy token above. Use in POST /reset-password as 'reset_token'")
     print(f"{'='*62}\n")
 
+    # Only queues the message — the email worker does the SMTP work
     try:
         await send_password_reset_email(
             to_email=user.email,
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
 from uuid import UUID
 from app.services.wallet_service import has_sufficient_balance, get_balance
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db, get_redis_client
 from app.models.campaigns import Campaign
-from app.schemas.campaigns import CampaignCreate, CampaignResponse, CampaignStatusUpdate
+from app.schemas.campaigns import CampaignCreate, CampaignResponse, CampaignStatusUpdate, CampaignLeaseResponse
 from app.services.campaign_service import (
     start_campaign,
     pause_campaign,
@@ -14,6 +19,9 @@ from app.services.campaign_service import (
 )
 from app.core.deps import get_current_user
 from app.services.bolna_service import get_agent_details
+from app.services.campaign_lease import get_lease_status
+from app.services.campaign_scheduler import acancel_wakeup
+from app.services.campaign_events import campaign_events
 from app.models.user import User
 from app.models.call_logs import CallLog
 from app.models.lead import Lead
@@ -38,6 +46,16 @@ async def get_authorized_campaign(
 
     return campaign
 
+def _windows_json(campaign_data: CampaignCreate) -> list[dict] | None:
+    if not campaign_data.calling_windows:
+        return None
+    return [w.model_dump() for w in campaign_data.calling_windows]
+
+def _retry_policy_json(campaign_data: CampaignCreate) -> dict | None:
+    if not campaign_data.retry_policy:
+        return None
+    return campaign_data.retry_policy.model_dump(exclude_none=True)
+
 router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
 
 @router.post("/", response_model=CampaignResponse)
@@ -66,7 +84,10 @@ async def create_campaign(
             name=campaign_data.name,
             description=campaign_data.description,
             organization_id=current_user.organization_id,
-            bolna_agent_id=campaign_data.bolna_agent_id
+            bolna_agent_id=campaign_data.bolna_agent_id,
+            scheduled_at=campaign_data.scheduled_at,
+            calling_windows=_windows_json(campaign_data),
+            retry_policy=_retry_policy_json(campaign_data),
         )
 
         db.add(campaign)
@@ -171,6 +192,88 @@ async def start_campaign_endpoint(
     return await start_campaign(db, campaign.id)
 
 
+@router.get("/{campaign_id}/lease", response_model=CampaignLeaseResponse)
+async def get_campaign_lease(
+    campaign: Campaign = Depends(get_authorized_campaign),
+    redis = Depends(get_redis_client),
+):
+    lease = await get_lease_status(redis, campaign.id)
+    return {"campaign_id": campaign.id, "status": campaign.status, **lease}
+
+
+@router.get("/{campaign_id}/events")
+async def campaign_events_stream(
+    campaign: Campaign = Depends(get_authorized_campaign),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Server-Sent Events: coalesced lead status changes, finished calls, wallet
+    balance and campaign status while the campaign runs — replaces polling
+    lead-status and analytics. See app/services/campaign_events.py.
+    """
+    campaign_id = campaign.id
+    # The stream can stay open for hours — don't pin a DB connection to it
+    await db.close()
+
+    async def sse():
+        yield "retry: 3000\n\n"
+        async for batch in campaign_events.stream(campaign_id):
+            if batch is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {json.dumps(batch, default=str)}\n\n"
+
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{campaign_id}/events/ws")
+async def campaign_events_ws(
+    websocket: WebSocket,
+    campaign_id: UUID,
+    token: str = Query(...),   # browsers can't set headers on a WebSocket
+    redis = Depends(get_redis_client),
+):
+    """Same batches as GET /{campaign_id}/events, over a WebSocket; heartbeats are {"heartbeat": true}."""
+    async with AsyncSessionLocal() as db:
+        try:
+            user = await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db, redis)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        owned = await db.scalar(
+            select(Campaign.id).where(
+                Campaign.id == campaign_id,
+                Campaign.organization_id == user.organization_id,
+            )
+        )
+    if not owned:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    async def send():
+        async for batch in campaign_events.stream(campaign_id):
+            await websocket.send_json(batch if batch is not None else {"heartbeat": True}, mode="text")
+
+    async def receive():
+        # Nothing is expected from the client; this only notices the disconnect
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 @router.post("/{campaign_id}/pause", response_model=CampaignResponse)
 async def pause_campaign_endpoint(
     campaign: Campaign = Depends(get_authorized_campaign),
@@ -198,7 +301,8 @@ async def stop_campaign_endpoint(
 async def delete_campaign(
     campaign_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    redis=Depends(get_redis_client),
 ):
     stmt = select(Campaign).where(
         Campaign.id == campaign_id,
@@ -216,6 +320,8 @@ async def delete_campaign(
     await db.delete(campaign)
     await db.commit()
 
+    await acancel_wakeup(redis, campaign_id)
+
     return {"message": "Campaign deleted successfully"}
 
 @router.put("/{campaign_id}/update", response_model=CampaignResponse)
@@ -257,6 +363,9 @@ async def update_campaign(
         campaign.name = campaign_data.name
         campaign.description = campaign_data.description
         campaign.bolna_agent_id = campaign_data.bolna_agent_id
+        campaign.scheduled_at = campaign_data.scheduled_at
+        campaign.calling_windows = _windows_json(campaign_data)
+        campaign.retry_policy = _retry_policy_json(campaign_data)
 
         db.add(campaign)
         await db.commit()
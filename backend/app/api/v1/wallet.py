@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.core.deps import get_current_user
 from app.models.user import User, UserRole
 from app.models.wallet import Wallet, WalletTransaction
@@ -25,7 +25,7 @@ async def get_wallet_balance(
 @router.get("/transactions")
 async def get_wallet_transactions(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Returns full transaction history"""
 
@@ -68,7 +68,7 @@ async def get_wallet_transactions(
 @router.get("/summary")
 async def get_wallet_summary(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Returns wallet summary for dashboard"""
 
@@ -0,0 +1,186 @@
+"""
+app/core/blacklist_cache.py
+
+Per-process Bloom filter of blacklisted JWT JTIs.
+
+Almost no token is ever blacklisted, so asking Redis on every request is a
+wasted round trip. Each API worker keeps a local Bloom filter that is:
+  - rebuilt from the Redis index ZSET on startup, on reconnect and every
+    TOKEN_BLACKLIST_RESYNC_SECONDS (this also ages out expired JTIs)
+  - updated immediately from the Redis pub/sub channel when any worker
+    blacklists a token
+
+A negative answer from the filter is authoritative. A positive answer is only
+"maybe" and is confirmed with the usual Redis EXISTS. Until the first sync
+completes every lookup goes straight to Redis.
+
+Keys blacklisted before the index existed are not in it, so the first sync
+against a Redis without BL_BACKFILLED SCANs every token:blacklist:{jti} key
+into the index (score = its expiry) before building a filter.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+BL_PREFIX  = "token:blacklist:"          # one key per JTI, TTL = token expiry
+BL_INDEX   = "token:blacklist:index"     # ZSET jti → expiry timestamp
+BL_CHANNEL = "token:blacklist:events"    # pub/sub: newly blacklisted JTIs
+BL_BACKFILLED = "token:blacklist:backfilled"   # set once pre-index keys are indexed
+_NOT_JTIS = {BL_INDEX, BL_CHANNEL, BL_BACKFILLED}
+_BACKFILL_BATCH = 1000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class BlacklistCache:
+    """Holds the current filter and the background task that keeps it in sync."""
+
+    def __init__(self):
+        self._filter: BloomFilter | None = None   # None → not synced, ask Redis
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def might_contain(self, jti: str) -> bool:
+        """False means definitely not blacklisted. True means ask Redis."""
+        if self._filter is None:
+            return True
+        return jti in self._filter
+
+    def add(self, jti: str) -> None:
+        if self._filter is not None:
+            self._filter.add(jti)
+
+    async def backfill(self, redis) -> int:
+        """Index blacklist keys that predate BL_INDEX. Runs once per Redis; returns how many."""
+        if await redis.exists(BL_BACKFILLED):
+            return 0
+        indexed, batch = 0, []
+        async for key in redis.scan_iter(match=f"{BL_PREFIX}*", count=_BACKFILL_BATCH):
+            key = key.decode() if isinstance(key, bytes) else key
+            if key not in _NOT_JTIS:
+                batch.append(key)
+            if len(batch) >= _BACKFILL_BATCH:
+                indexed += await self._index_keys(redis, batch)
+                batch = []
+        if batch:
+            indexed += await self._index_keys(redis, batch)
+        await redis.set(BL_BACKFILLED, int(time.time()))
+        log.info(f"Token blacklist: indexed {indexed} pre-existing JTIs")
+        return indexed
+
+    async def _index_keys(self, redis, keys: list[str]) -> int:
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.ttl(key)
+            ttls = await pipe.execute()
+
+        now = time.time()
+        fallback = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400   # no TTL: outlive any token
+        mapping = {
+            key[len(BL_PREFIX):]: now + (ttl if ttl > 0 else fallback)
+            for key, ttl in zip(keys, ttls)
+            if ttl != -2   # expired between SCAN and TTL
+        }
+        if mapping:
+            await redis.zadd(BL_INDEX, mapping, nx=True)
+        return len(mapping)
+
+    async def resync(self, redis) -> None:
+        """Rebuild the filter from the Redis index, dropping expired JTIs.
+
+        Backfills the index first if needed; until that succeeds the filter
+        stays unsynced and every lookup goes to Redis.
+        """
+        await self.backfill(redis)
+        now = time.time()
+        await redis.zremrangebyscore(BL_INDEX, "-inf", now)
+        members = await redis.zrange(BL_INDEX, 0, -1)
+
+        fresh = BloomFilter(
+            max(settings.TOKEN_BLACKLIST_BLOOM_CAPACITY, len(members) * 2),
+            settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE,
+        )
+        for member in members:
+            fresh.add(member.decode() if isinstance(member, bytes) else member)
+        self._filter = fresh
+
+    async def _run(self, redis) -> None:
+        interval = settings.TOKEN_BLACKLIST_RESYNC_SECONDS
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Subscribe before the snapshot so nothing published in between is lost
+                await pubsub.subscribe(BL_CHANNEL)
+                await self.resync(redis)
+                next_resync = time.monotonic() + interval
+
+                while True:
+                    msg = await pubsub.get_message(timeout=1.0)
+                    if msg and msg.get("type") == "message":
+                        data = msg["data"]
+                        self.add(data.decode() if isinstance(data, bytes) else data)
+                    if time.monotonic() >= next_resync:
+                        await self.resync(redis)
+                        next_resync = time.monotonic() + interval
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Fall back to Redis for every lookup until we are back in sync
+                self._filter = None
+                log.warning(f"Token blacklist sync lost ({type(e).__name__}: {e}) — retrying")
+                await asyncio.sleep(min(interval, 5))
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def start(self, redis) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(redis))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._filter = None
+
+
+blacklist_cache = BlacklistCache()
@@ -1,7 +1,11 @@
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_shutdown
 from dotenv import load_dotenv
 import os
 
+from app.core.config import settings
+
 load_dotenv()
 
 CAMPAIGN_BROKER_URL = os.getenv("CAMPAIGN_BROKER_URL")
@@ -11,6 +15,11 @@ celery_app = Celery(
     "campaign_worker",
     broker=CAMPAIGN_BROKER_URL,
     backend=CAMPAIGN_RESULT_BACKEND,
+    include=[
+        "app.tasks.campaign_tasks",
+        "app.tasks.maintenance_tasks",
+        "app.tasks.reaper_tasks",
+    ],
 )
 
 celery_app.autodiscover_tasks(["app.tasks"])
@@ -19,4 +28,35 @@ celery_app.conf.task_routes = {
     "app.tasks.campaign_tasks.process_campaign": {
         "queue": "campaign_queue",
     },
-}
\ No newline at end of file
+    "app.tasks.campaign_tasks.fan_out_campaign_ticks": {
+        "queue": "campaign_queue",
+    },
+    "app.tasks.maintenance_tasks.maintain_call_log_partitions": {
+        "queue": "campaign_queue",
+    },
+    "app.tasks.reaper_tasks.reap_stuck_calls_task": {
+        "queue": "campaign_queue",
+    },
+}
+
+# Run with: celery -A app.core.celery_app.celery_app beat --loglevel=info
+celery_app.conf.beat_schedule = {
+    "fan-out-campaign-ticks": {
+        "task": "app.tasks.campaign_tasks.fan_out_campaign_ticks",
+        "schedule": float(settings.CAMPAIGN_FANOUT_SECONDS),
+    },
+    "reap-stuck-calls": {
+        "task": "app.tasks.reaper_tasks.reap_stuck_calls_task",
+        "schedule": float(settings.CALL_REAPER_INTERVAL_SECONDS),
+    },
+    "maintain-call-log-partitions": {
+        "task": "app.tasks.maintenance_tasks.maintain_call_log_partitions",
+        "schedule": crontab(hour=3, minute=0),
+    },
+}
+
+
+@worker_process_shutdown.connect
+def _drop_process_metrics(pid=None, **kwargs):
+    from app.core.metrics import mark_process_dead
+    mark_process_dead(pid or os.getpid())
@@ -13,6 +13,39 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     SYNC_DATABASE_URL: str
 
+    # Read replica — empty means every read goes to the primary
+    DATABASE_REPLICA_URL:       str   = ""
+    REPLICA_MAX_LAG_SECONDS:    float = 5.0
+    REPLICA_LAG_CHECK_SECONDS:  float = 5.0
+    REPLICA_LAG_TIMEOUT_SECONDS: float = 1.0   # connect + lag query; past this, read from the primary
+
+    # call_logs monthly partitions — see app/tasks/maintenance_tasks.py
+    CALL_LOG_PARTITION_PREMAKE_MONTHS: int = 3
+    CALL_LOG_RETENTION_MONTHS:         int = 12
+    CALL_LOG_ARCHIVE_DIR:              str = "archive/call_logs"
+    TRANSCRIPT_ZSTD_LEVEL:             int = 9   # call_transcripts compression — see app/services/transcript_store.py
+
+    # Connection pool — see app/db/engine.py
+    DB_ROLE:                 str  = "api"      # api | worker | admin
+    DB_ECHO:                 bool = False
+    DB_POOL_SIZE:            int  = 10
+    DB_MAX_OVERFLOW:         int  = 20
+    DB_POOL_RECYCLE:         int  = 1800
+    DB_POOL_TIMEOUT:         int  = 30
+    DB_POOL_PRE_PING:        bool = True
+    DB_STATEMENT_CACHE_SIZE: int  = 100
+    DB_POOL_OVERRIDES:       dict[str, dict] = {}
+
+    # Per-request query counter — see app/core/query_counter.py
+    DB_QUERY_LOG_THRESHOLD: int   = 50
+    DB_QUERY_LOG_MS:        float = 500.0
+
+    # Tracing — see app/core/tracing.py. Empty exporter disables tracing.
+    TRACING_EXPORTER:      str = ""     # "" | json | otlp
+    TRACING_JSON_PATH:     str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SERVICE_NAME:  str = "ai-calling-saas"
+
     # Redis
     REDIS_URL: str
 
@@ -29,6 +62,47 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS:   int = 7
     ALLOWED_ORIGINS:             str = "http://localhost:3000"
 
+    # Token blacklist — per-worker Bloom filter in front of Redis
+    TOKEN_BLACKLIST_RESYNC_SECONDS:   int   = 30
+    TOKEN_BLACKLIST_BLOOM_CAPACITY:   int   = 100_000
+    TOKEN_BLACKLIST_BLOOM_ERROR_RATE: float = 0.001
+
+    # Campaign dispatcher ticks — see app/tasks/campaign_tasks.py
+    CAMPAIGN_TICK_BATCH:        int = 5     # leads per tick when call_delay_seconds is 0
+    CAMPAIGN_LEASE_TTL_SECONDS: int = 15    # lease outlives the next due tick by this long
+    CAMPAIGN_FANOUT_SECONDS:    int = 5     # beat interval of the orphan takeover watchdog
+
+    # Fair-share dispatcher — see app/tasks/dispatcher_worker.py. Off: ticks self-schedule.
+    DISPATCH_FAIR_SHARE:       bool  = False
+    DISPATCH_ROUND_SECONDS:    float = 1.0
+    DISPATCH_SLOTS_PER_ROUND:  int   = 50     # global dials handed out per round
+    DISPATCH_TIER_WEIGHTS:     dict[str, float] = {"free": 1, "standard": 2, "premium": 4, "enterprise": 8}
+
+    # Live campaign events (SSE / WebSocket) — see app/services/campaign_events.py
+    CAMPAIGN_EVENTS_COALESCE_SECONDS:  float = 0.5    # bursts inside this window go out as one batch
+    CAMPAIGN_EVENTS_HEARTBEAT_SECONDS: int   = 15
+    CAMPAIGN_EVENTS_QUEUE_SIZE:        int   = 1000   # per client; overflow → client told to resync
+
+    # Retry backoff when a campaign has no retry_policy — see app/services/retry_policy.py
+    RETRY_DEFAULT_POLICY: dict = {"type": "exponential", "base_seconds": 600, "factor": 2, "max_seconds": 21600}
+
+    # Stuck-call reaper — see app/tasks/reaper_tasks.py
+    CALL_REAPER_TIMEOUT_SECONDS:  int = 900   # in-flight longer than this → ask Bolna
+    CALL_REAPER_MAX_AGE_HOURS:    int = 48    # older calls are left alone
+    CALL_REAPER_BATCH:            int = 500
+    CALL_REAPER_CONCURRENCY:      int = 20
+    CALL_REAPER_INTERVAL_SECONDS: int = 60
+
+    # Bolna circuit breaker + AIMD concurrency limit — see app/services/bolna_guard.py
+    BOLNA_BREAKER_ERROR_RATE:       float = 0.5
+    BOLNA_BREAKER_MIN_REQUESTS:     int   = 20
+    BOLNA_BREAKER_WINDOW_SECONDS:   int   = 30
+    BOLNA_BREAKER_COOLDOWN_SECONDS: int   = 30
+    BOLNA_CONCURRENCY_INITIAL:      int   = 20
+    BOLNA_CONCURRENCY_MIN:          int   = 2
+    BOLNA_CONCURRENCY_MAX:          int   = 200
+    BOLNA_LATENCY_TARGET_SECONDS:   float = 3.0   # slower /call responses shrink the limit
+
     # Bolna
     BOLNA_API_KEY:        str = ""
     BOLNA_BASE_URL:       str = "https://api.bolna.dev"
@@ -44,6 +118,12 @@ class Settings(BaseSettings):
     SMTP_TLS:        bool = False
     SMTP_STARTTLS:   bool = True
 
+    # Email outbox worker
+    EMAIL_SMTP_POOL_SIZE:     int = 3
+    EMAIL_BATCH_SIZE:         int = 20
+    EMAIL_MAX_ATTEMPTS:       int = 5
+    EMAIL_RETRY_BASE_SECONDS: int = 30
+
     PASSWORD_RESET_EXPIRE_HOURS: int = 24
 
 
@@ -1,24 +1,69 @@
 """
 app/core/email.py
 
-Production-ready async email sender with full error visibility.
-Never silently swallows errors — prints exact failure reason to console.
+Async email outbox with full error visibility.
+
+Request handlers never talk to SMTP. send_welcome_email / send_password_reset_email
+render pre-compiled Jinja2 templates and push the message onto a Redis list.
+The email worker (app/tasks/email_worker.py) drains that list in batches over
+a pool of authenticated SMTP connections, retries with exponential backoff and
+records delivery status per message.
+
+Redis keys:
+  email:outbox              LIST    queued messages (JSON)
+  email:processing:{worker} LIST    messages a worker has taken but not finished
+  email:worker:{worker}     STRING  worker heartbeat — without it, its processing list is requeued
+  email:retry               ZSET    messages waiting for backoff → due timestamp
+  email:status:{id}         HASH    status / attempts / last error
+  email:link:{id}           STRING  a message's reset link, expiring with the reset token
+
+Messages carrying a password reset link are queued with LINK_PLACEHOLDER in
+place of the link and a reference to email:link:{id}. The link itself never
+sits in the outbox, retry or processing lists, and is gone once the message is
+sent, has failed or has outlived the token.
 """
 
+import html as html_lib
+
+import asyncio
+import json
 import logging
-import traceback
+import time
+import uuid
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from pathlib import Path
 
 import aiosmtplib
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from app.core.config import settings
 
 log = logging.getLogger(__name__)
 
-
-async def send_email(to_email: str, subject: str, html_body: str, text_body: str | None = None) -> None:
-    password = settings.SMTP_PASSWORD.replace(" ", "").strip()
+OUTBOX_KEY        = "email:outbox"
+RETRY_KEY         = "email:retry"
+STATUS_PREFIX     = "email:status:"
+PROCESSING_PREFIX = "email:processing:"
+WORKER_PREFIX     = "email:worker:"
+LINK_PREFIX       = "email:link:"
+LINK_PLACEHOLDER  = "__EMAIL_LINK__"
+STATUS_TTL        = 7 * 24 * 3600
+BRAND_COLOUR      = "#4f46e5"   # brand colour — change to your brand colour
+
+_templates = Environment(
+    loader=FileSystemLoader(Path(__file__).resolve().parent.parent / "templates" / "email"),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+)
+# Compile once at import — rendering is then just a function call
+_WELCOME_HTML = _templates.get_template("welcome.html")
+_WELCOME_TEXT = _templates.get_template("welcome.txt")
+_RESET_HTML   = _templates.get_template("password_reset.html")
+_RESET_TEXT   = _templates.get_template("password_reset.txt")
+
+
+def _build_message(to_email: str, subject: str, html_body: str, text_body: str | None = None) -> MIMEMultipart:
     msg = MIMEMultipart("alternative")
     msg["Subject"]  = subject
     msg["From"]     = f"{settings.SMTP_FROM_NAME} <{settings.SMTP_FROM_EMAIL}>"
@@ -27,108 +72,198 @@ async def send_email(to_email: str, subject: str, html_body: str, text_body: str
     if text_body:
         msg.attach(MIMEText(text_body, "plain", "utf-8"))
     msg.attach(MIMEText(html_body, "html", "utf-8"))
+    return msg
+
+
+async def send_email(to_email: str, subject: str, html_body: str, text_body: str | None = None) -> None:
+    """Send one message on a fresh connection. Only for scripts — routes use the outbox."""
     await aiosmtplib.send(
-        msg,
+        _build_message(to_email, subject, html_body, text_body),
         hostname  = settings.SMTP_HOST,
         port      = settings.SMTP_PORT,
         username  = settings.SMTP_USER,
-        password  = password,
+        password  = settings.SMTP_PASSWORD.replace(" ", "").strip(),
         use_tls   = settings.SMTP_TLS,
         start_tls = settings.SMTP_STARTTLS,
         timeout   = 30,
     )
 
 
-async def _safe_send(to_email: str, subject: str, html: str, text: str, kind: str) -> bool:
-    """Wraps send_email. Always returns, never raises. Logs exact error."""
+def describe_smtp_error(e: Exception) -> str:
+    """One-line reason plus a hint for the errors people actually hit."""
+    if isinstance(e, aiosmtplib.SMTPAuthenticationError):
+        return f"AUTH ERROR — {e} → You need a Gmail APP PASSWORD (16 chars, no spaces)"
+    if isinstance(e, aiosmtplib.SMTPConnectError):
+        return f"CONNECT ERROR — {e} → Port {settings.SMTP_PORT} is blocked by your network/firewall"
+    return f"{type(e).__name__}: {e}"
+
+
+def is_permanent_smtp_error(e: Exception) -> bool:
+    """Recipient rejected outright — retrying will not help."""
+    return isinstance(e, (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPSenderRefused))
+
+
+# ─── Outbox ───────────────────────────────────────────────────────────────────
+
+async def set_email_status(redis, message_id: str, status: str, attempts: int = 0, error: str = "") -> None:
+    key = f"{STATUS_PREFIX}{message_id}"
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hset(key, mapping={
+            "status":     status,
+            "attempts":   attempts,
+            "error":      error,
+            "updated_at": int(time.time()),
+        })
+        pipe.expire(key, STATUS_TTL)
+        await pipe.execute()
+
+
+async def get_email_status(redis, message_id: str) -> dict:
+    raw = await redis.hgetall(f"{STATUS_PREFIX}{message_id}")
+    return {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in raw.items()
+    }
+
+
+async def enqueue_email(
+    to_email: str, subject: str, html: str, text: str, kind: str, redis=None,
+    link: str | None = None, link_ttl: int = 0,
+) -> str:
+    """Queue a rendered message for the email worker. Returns the message id.
+
+    With `link`, html / text carry LINK_PLACEHOLDER and the link is stored
+    separately for `link_ttl` seconds — see the module docstring.
+    """
+    if redis is None:
+        from app.db.session import get_redis_pool
+        redis = await get_redis_pool()
+
+    message_id = str(uuid.uuid4())
+    job = {
+        "id":       message_id,
+        "to":       to_email,
+        "subject":  subject,
+        "html":     html,
+        "text":     text,
+        "kind":     kind,
+        "attempts": 0,
+    }
+    if link:
+        job["link_ref"] = f"{LINK_PREFIX}{message_id}"
+        await redis.set(job["link_ref"], link, ex=max(link_ttl, 1))
+    await set_email_status(redis, message_id, "queued")
+    await redis.lpush(OUTBOX_KEY, json.dumps(job))
+    print(f"[EMAIL] 📥 {kind} queued → {to_email} (id={message_id})")
+    return message_id
+
+
+async def fill_link(redis, job: dict) -> dict | None:
+    """The job with its referenced link filled in. None if the link has expired."""
+    if not job.get("link_ref"):
+        return job
+    link = await redis.get(job["link_ref"])
+    if link is None:
+        return None
+    link = link.decode() if isinstance(link, bytes) else link
+    return {
+        **job,
+        "html": job["html"].replace(LINK_PLACEHOLDER, html_lib.escape(link)),
+        "text": (job.get("text") or "").replace(LINK_PLACEHOLDER, link),
+    }
+
+
+async def drop_link(redis, job: dict) -> None:
+    if job.get("link_ref"):
+        await redis.delete(job["link_ref"])
+
+
+async def _safe_enqueue(to_email: str, subject: str, html: str, text: str, kind: str, **link) -> bool:
+    """Wraps enqueue_email. Always returns, never raises. Logs exact error."""
     try:
-        await send_email(to_email, subject, html, text)
-        print(f"[EMAIL] ✅ {kind} sent → {to_email}")
+        await enqueue_email(to_email, subject, html, text, kind, **link)
         return True
-    except aiosmtplib.SMTPAuthenticationError as e:
-        print(f"[EMAIL] ❌ AUTH ERROR — {kind} to {to_email}")
-        print(f"[EMAIL]    {e}")
-        print("[EMAIL]    → You need a Gmail APP PASSWORD (16 chars, no spaces)")
-        print("[EMAIL]    → Go to: https://myaccount.google.com/apppasswords")
-    except aiosmtplib.SMTPConnectError as e:
-        print(f"[EMAIL] ❌ CONNECT ERROR — {kind} to {to_email}")
-        print(f"[EMAIL]    {e}")
-        print(f"[EMAIL]    → Port {settings.SMTP_PORT} is blocked by your network/firewall")
     except Exception as e:
-        print(f"[EMAIL] ❌ FAILED — {kind} to {to_email}")
+        print(f"[EMAIL] ❌ QUEUE FAILED — {kind} to {to_email}")
         print(f"[EMAIL]    {type(e).__name__}: {e}")
-        traceback.print_exc()
-    return False
+        return False
+
+
+# ─── SMTP connection pool (used by the email worker) ─────────────────────────
+
+class SMTPPool:
+    """A fixed number of authenticated SMTP connections, reconnected on demand."""
+
+    def __init__(self, size: int):
+        self._idle: asyncio.Queue[aiosmtplib.SMTP] = asyncio.Queue()
+        for _ in range(max(size, 1)):
+            self._idle.put_nowait(self._new_client())
+
+    @staticmethod
+    def _new_client() -> aiosmtplib.SMTP:
+        return aiosmtplib.SMTP(
+            hostname  = settings.SMTP_HOST,
+            port      = settings.SMTP_PORT,
+            use_tls   = settings.SMTP_TLS,
+            start_tls = settings.SMTP_STARTTLS,
+            timeout   = 30,
+        )
+
+    @staticmethod
+    async def _ensure_connected(client: aiosmtplib.SMTP) -> None:
+        if client.is_connected:
+            return
+        try:
+            await client.connect()
+            password = settings.SMTP_PASSWORD.replace(" ", "").strip()
+            if settings.SMTP_USER and password:
+                await client.login(settings.SMTP_USER, password)
+        except BaseException:
+            # Never pool a connected-but-unauthenticated client — the next send would skip login
+            client.close()
+            raise
+
+    async def send(self, msg: MIMEMultipart) -> None:
+        client = await self._idle.get()
+        try:
+            await self._ensure_connected(client)
+            await client.send_message(msg)
+        except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, aiosmtplib.SMTPTimeoutError):
+            # Connection went stale — drop it so the next use reconnects
+            client.close()
+            raise
+        finally:
+            self._idle.put_nowait(client)
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            client = self._idle.get_nowait()
+            if client.is_connected:
+                try:
+                    await client.quit()
+                except Exception:
+                    client.close()
+
+
+async def deliver(pool: SMTPPool, job: dict) -> None:
+    """Send one outbox job over the pool. Raises on failure."""
+    await pool.send(_build_message(job["to"], job["subject"], job["html"], job.get("text")))
 
 
 # ─── Welcome Email ────────────────────────────────────────────────────────────
 
 async def send_welcome_email(to_email: str, first_name: str, org_name: str, login_url: str) -> bool:
     subject = f"Welcome to {settings.APP_NAME}!"
-    c = "#4f46e5"   # brand colour — change to your brand colour
-
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head><meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1"></head>
-<body style="margin:0;padding:0;background:#f4f4f5;font-family:Arial,Helvetica,sans-serif;">
-<table width="100%" cellpadding="0" cellspacing="0" style="background:#f4f4f5;padding:40px 16px;">
-<tr><td align="center">
-<table width="560" cellpadding="0" cellspacing="0"
-       style="background:#fff;border-radius:12px;overflow:hidden;
-              box-shadow:0 2px 12px rgba(0,0,0,.08);max-width:560px;">
-
-  <!-- HEADER -->
-  <tr><td style="background:#1a1a2e;padding:32px 40px;">
-    <h1 style="margin:0;color:#fff;font-size:24px;font-weight:700;">{settings.APP_NAME}</h1>
-  </td></tr>
-
-  <!-- BODY -->
-  <tr><td style="padding:40px 40px 32px;">
-    <h2 style="margin:0 0 16px;font-size:22px;color:#1a1a2e;">Welcome, {first_name}! &#x1F44B;</h2>
-    <p style="margin:0 0 6px;font-size:15px;color:#555;line-height:1.7;">
-      Your account has been created successfully.
-    </p>
-    <p style="margin:0 0 28px;font-size:15px;color:#555;line-height:1.7;">
-      Organization: <strong style="color:#1a1a2e;">{org_name}</strong>
-    </p>
-
-    <!-- CTA -->
-    <table cellpadding="0" cellspacing="0" style="margin:0 0 28px;">
-      <tr><td style="border-radius:8px;background:{c};">
-        <a href="{login_url}"
-           style="display:inline-block;padding:14px 32px;color:#fff;
-                  font-size:15px;font-weight:600;text-decoration:none;border-radius:8px;">
-          Log in to {settings.APP_NAME} &rarr;
-        </a>
-      </td></tr>
-    </table>
-
-    <p style="margin:0;font-size:13px;color:#999;">
-      Or copy: <a href="{login_url}" style="color:{c};word-break:break-all;">{login_url}</a>
-    </p>
-  </td></tr>
-
-  <!-- FOOTER -->
-  <tr><td style="padding:20px 40px;border-top:1px solid #f0f0f0;">
-    <p style="margin:0;font-size:12px;color:#aaa;line-height:1.6;">
-      You received this because you registered at {settings.APP_NAME}.
-      If this wasn't you, ignore this email.
-    </p>
-  </td></tr>
-
-</table>
-</td></tr>
-</table>
-</body>
-</html>"""
-
-    text = (
-        f"Welcome to {settings.APP_NAME}, {first_name}!\n\n"
-        f"Organization: {org_name}\n\n"
-        f"Log in here: {login_url}\n\n"
-        "If you didn't sign up, ignore this email."
-    )
-    return await _safe_send(to_email, subject, html, text, "welcome email")
+    ctx = {
+        "app_name":     settings.APP_NAME,
+        "brand_colour": BRAND_COLOUR,
+        "first_name":   first_name,
+        "org_name":     org_name,
+        "login_url":    login_url,
+    }
+    html = _WELCOME_HTML.render(ctx)
+    text = _WELCOME_TEXT.render(ctx)
+    return await _safe_enqueue(to_email, subject, html, text, "welcome email")
 
 
 # ─── Password Reset Email ─────────────────────────────────────────────────────
@@ -137,86 +272,16 @@ async def send_password_reset_email(
     to_email: str, first_name: str, reset_link: str, expire_hours: int
 ) -> bool:
     subject = f"Reset your {settings.APP_NAME} password"
-    c = "#4f46e5"
-
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head><meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1"></head>
-<body style="margin:0;padding:0;background:#f4f4f5;font-family:Arial,Helvetica,sans-serif;">
-<table width="100%" cellpadding="0" cellspacing="0" style="background:#f4f4f5;padding:40px 16px;">
-<tr><td align="center">
-<table width="560" cellpadding="0" cellspacing="0"
-       style="background:#fff;border-radius:12px;overflow:hidden;
-              box-shadow:0 2px 12px rgba(0,0,0,.08);max-width:560px;">
-
-  <!-- HEADER -->
-  <tr><td style="background:#1a1a2e;padding:32px 40px;">
-    <h1 style="margin:0;color:#fff;font-size:24px;font-weight:700;">{settings.APP_NAME}</h1>
-  </td></tr>
-
-  <!-- BODY -->
-  <tr><td style="padding:40px 40px 32px;">
-    <h2 style="margin:0 0 12px;font-size:20px;color:#1a1a2e;">Password Reset Request</h2>
-    <p style="margin:0 0 20px;font-size:15px;color:#555;line-height:1.7;">
-      Hi <strong>{first_name}</strong>, we received a request to reset your password.
-      This link expires in <strong>{expire_hours} hour{"s" if expire_hours != 1 else ""}</strong>.
-    </p>
-
-    <!-- Warning -->
-    <table width="100%" cellpadding="0" cellspacing="0" style="margin:0 0 24px;">
-      <tr><td style="background:#fffbeb;border:1px solid #fde68a;border-radius:8px;padding:14px 16px;">
-        <p style="margin:0;font-size:13px;color:#92400e;line-height:1.6;">
-          <strong>&#x26A0;&#xFE0F; Didn't request this?</strong><br>
-          Ignore this email. Your password won't change and this link expires automatically.
-        </p>
-      </td></tr>
-    </table>
-
-    <!-- CTA -->
-    <table cellpadding="0" cellspacing="0" style="margin:0 0 24px;">
-      <tr><td style="border-radius:8px;background:{c};">
-        <a href="{reset_link}"
-           style="display:inline-block;padding:14px 32px;color:#fff;
-                  font-size:15px;font-weight:600;text-decoration:none;border-radius:8px;">
-          Reset My Password &rarr;
-        </a>
-      </td></tr>
-    </table>
-
-    <!-- Security note -->
-    <table width="100%" cellpadding="0" cellspacing="0">
-      <tr><td style="background:#f8fafc;border-radius:8px;padding:14px 16px;">
-        <p style="margin:0;font-size:13px;color:#555;line-height:1.6;">
-          &#x1F512; <strong>Security:</strong> This link works only once and
-          expires in {expire_hours}h. We will never ask for your password by email or phone.
-        </p>
-      </td></tr>
-    </table>
-  </td></tr>
-
-  <!-- FOOTER -->
-  <tr><td style="padding:20px 40px;border-top:1px solid #f0f0f0;">
-    <p style="margin:0 0 6px;font-size:12px;color:#aaa;line-height:1.6;">
-      Button not working? Copy this link:<br>
-      <a href="{reset_link}" style="color:{c};word-break:break-all;font-size:12px;">{reset_link}</a>
-    </p>
-    <p style="margin:8px 0 0;font-size:12px;color:#aaa;">
-      Do not share this link with anyone. Sent by {settings.APP_NAME}.
-    </p>
-  </td></tr>
-
-</table>
-</td></tr>
-</table>
-</body>
-</html>"""
-
-    text = (
-        f"Hi {first_name},\n\n"
-        f"Reset your {settings.APP_NAME} password (expires in {expire_hours}h):\n\n"
-        f"{reset_link}\n\n"
-        "If you didn't request this, ignore this email.\n"
-        "Your password will NOT change unless you click the link.\n\n"
-        f"— {settings.APP_NAME} Team"
+    ctx = {
+        "app_name":     settings.APP_NAME,
+        "brand_colour": BRAND_COLOUR,
+        "first_name":   first_name,
+        "reset_link":   LINK_PLACEHOLDER,   # filled in by the worker from email:link:{id}
+        "expire_hours": expire_hours,
+    }
+    html = _RESET_HTML.render(ctx)
+    text = _RESET_TEXT.render(ctx)
+    return await _safe_enqueue(
+        to_email, subject, html, text, "password reset email",
+        link=reset_link, link_ttl=expire_hours * 3600,
     )
-    return await _safe_send(to_email, subject, html, text, "password reset email")
\ No newline at end of file
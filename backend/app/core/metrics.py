@@ -0,0 +1,183 @@
+"""
+app/core/metrics.py
+
+Prometheus metrics for the API and the Celery workers.
+
+Exposed at GET /metrics on the API.
+
+Single process: metrics live in this process's default registry.
+
+Aggregation mode (several uvicorn workers and/or Celery workers): point every
+process at the same empty directory before it starts:
+
+    PROMETHEUS_MULTIPROC_DIR=/tmp/prom   (wipe it on deploy)
+
+Each process then writes its samples there, and /metrics on any API worker
+sums them across all processes — including Celery dispatch and make_call
+metrics recorded in worker processes.
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from starlette.responses import Response
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+_FAST_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+_LAG_BUCKETS  = (.05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+
+
+# ─── Metric definitions ───────────────────────────────────────────────────────
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled DB connection",
+    ["engine"],
+    buckets=_FAST_BUCKETS,
+)
+CAMPAIGN_DIALS = Counter(
+    "campaign_dials_total",
+    "Dial attempts made by the campaign dispatcher",
+    ["campaign_id", "outcome"],
+)
+BOLNA_MAKE_CALL_LATENCY = Histogram(
+    "bolna_make_call_duration_seconds",
+    "Latency of the Bolna /call request",
+    ["outcome"],
+)
+BOLNA_MAKE_CALL_ERRORS = Counter(
+    "bolna_make_call_errors_total",
+    "Failed Bolna /call requests by error class",
+    ["error_class"],
+)
+BOLNA_CALLS_REJECTED = Counter(
+    "bolna_calls_rejected_total",
+    "Bolna requests not sent — circuit breaker or concurrency limit",
+    ["reason"],
+)
+WEBHOOK_PROCESSING_LAG = Histogram(
+    "webhook_processing_lag_seconds",
+    "Bolna event timestamp → webhook transaction committed",
+    buckets=_LAG_BUCKETS,
+)
+WALLET_DEBIT_LATENCY = Histogram(
+    "wallet_debit_duration_seconds",
+    "Time to apply a per-call wallet debit",
+    buckets=_FAST_BUCKETS,
+)
+REDIS_ROUNDTRIP = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command round trip time",
+    ["command"],
+    buckets=_FAST_BUCKETS,
+)
+
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+def observe_event_lag(event_time: str | None) -> float | None:
+    """Record and return now − event_time for an ISO-8601 Bolna timestamp, if we got one."""
+    if not event_time:
+        return None
+    try:
+        ts = datetime.fromisoformat(str(event_time).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    lag = max(0.0, (datetime.now(timezone.utc) - ts).total_seconds())
+    WEBHOOK_PROCESSING_LAG.observe(lag)
+    return lag
+
+
+class _PoolCollector:
+    """Current DB pool usage of this process as gauges, read at scrape time."""
+
+    def collect(self):
+        from app.db.engine import pool_stats
+
+        stats = pool_stats()
+        for field in ("size", "checked_in", "checked_out", "overflow"):
+            gauge = GaugeMetricFamily(f"db_pool_{field}", f"DB pool {field.replace('_', ' ')}", labels=["engine", "pid"])
+            for engine, values in stats.items():
+                if isinstance(values, dict):
+                    gauge.add_metric([engine, str(os.getpid())], values[field])
+            yield gauge
+
+
+def _registry() -> CollectorRegistry:
+    if MULTIPROCESS:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    registry.register(_PoolCollector())
+    return registry
+
+
+_scrape_registry: CollectorRegistry | None = None
+
+
+async def metrics_endpoint():
+    global _scrape_registry
+    if _scrape_registry is None:
+        _scrape_registry = _registry()
+    return Response(generate_latest(_scrape_registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a finished worker's live-only samples (multiprocess mode only)."""
+    if MULTIPROCESS:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
+
+
+# ─── ASGI middleware ──────────────────────────────────────────────────────────
+
+class MetricsMiddleware:
+    """Times every HTTP request and labels it with the matched route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_LATENCY.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,111 @@
+"""
+app/core/query_counter.py
+
+Per-request SQL statement counter — catches N+1 query patterns.
+
+A SQLAlchemy cursor-execute hook counts statements and DB time into a
+ContextVar. QueryCountMiddleware opens a fresh counter per HTTP request and
+reports it on the response:
+
+    X-DB-Queries:  17
+    Server-Timing: db;dur=42.1;desc="17 queries"
+
+Requests above DB_QUERY_LOG_THRESHOLD statements or DB_QUERY_LOG_MS of DB time
+are logged as warnings with their route.
+
+Outside a request (Celery, scripts) nothing is counted unless count_queries()
+is used explicitly. See backend/conftest.py for the N+1 test fixture.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+# ─── SQLAlchemy hook ──────────────────────────────────────────────────────────
+# Registered on the Engine class, so it covers the async engines (via their
+# sync_engine), the replica and the Celery engine alike.
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    stats.count += 1
+    if starts:
+        stats.seconds += time.perf_counter() - starts.pop()
+
+
+@contextmanager
+def count_queries():
+    """Count every statement executed in this context (tests, scripts)."""
+    stats = QueryStats()
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+
+
+# ─── ASGI middleware ──────────────────────────────────────────────────────────
+
+class QueryCountMiddleware:
+    """Adds X-DB-Queries / Server-Timing headers and logs query-heavy requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                db_ms = stats.seconds * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"server-timing", f'db;dur={db_ms:.1f};desc="{stats.count} queries"'.encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _stats.reset(token)
+            db_ms = stats.seconds * 1000
+            if stats.count > settings.DB_QUERY_LOG_THRESHOLD or db_ms > settings.DB_QUERY_LOG_MS:
+                route = getattr(scope.get("route"), "path", scope["path"])
+                logger.warning(
+                    f"[DB] {scope['method']} {route} ran {stats.count} queries "
+                    f"in {db_ms:.1f} ms"
+                )
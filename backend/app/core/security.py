@@ -1,3 +1,4 @@
+import time
 import uuid
 import bcrypt
 from jose import jwt,  JWTError, ExpiredSignatureError
@@ -5,11 +6,12 @@ from datetime import datetime, timedelta,timezone
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.blacklist_cache import blacklist_cache, BL_PREFIX, BL_INDEX, BL_CHANNEL
 
 # bcrypt for password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-_BL_PREFIX = "token:blacklist:"   # Redis namespace
+_BL_PREFIX = BL_PREFIX   # Redis namespace
 
 def hash_password(plain_password: str) -> str:
     return pwd_context.hash(plain_password)
@@ -62,10 +64,26 @@ def decode_token(token: str) -> dict:
 # ─── Redis blacklist helpers ──────────────────────────────────────────────────
 
 async def blacklist_token(redis, jti: str, ttl_seconds: int) -> None:
-    """Add a token JTI to the Redis blacklist with TTL matching token expiry."""
-    await redis.setex(f"{_BL_PREFIX}{jti}", ttl_seconds, "1")
+    """Add a token JTI to the Redis blacklist with TTL matching token expiry.
+
+    Also indexes the JTI (for worker resyncs) and publishes it so every API
+    worker adds it to its local Bloom filter within moments.
+    """
+    expires_at = time.time() + ttl_seconds
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.setex(f"{_BL_PREFIX}{jti}", ttl_seconds, "1")
+        pipe.zadd(BL_INDEX, {jti: expires_at})
+        pipe.publish(BL_CHANNEL, jti)
+        await pipe.execute()
+    blacklist_cache.add(jti)
 
 
 async def is_blacklisted(redis, jti: str) -> bool:
-    """Return True if this JTI has been blacklisted (logged out / rotated)."""
+    """Return True if this JTI has been blacklisted (logged out / rotated).
+
+    The local Bloom filter answers "definitely not" without a network call;
+    only possible hits (or an unsynced filter) go to Redis.
+    """
+    if not blacklist_cache.might_contain(jti):
+        return False
     return await redis.exists(f"{_BL_PREFIX}{jti}") == 1
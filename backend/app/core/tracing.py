@@ -0,0 +1,228 @@
+"""
+app/core/tracing.py
+
+Lightweight OpenTelemetry-style tracing for the call lifecycle.
+
+    dispatch (process_campaign) → bolna.make_call → Bolna → bolna.webhook (× each status)
+
+make_call puts a W3C `traceparent` into the Bolna call metadata, Bolna echoes
+the metadata back on every webhook, and the webhook span continues the same
+trace. Per call you get time-to-dial (campaign.dial), Bolna request latency
+(bolna.make_call), ring time (gap between the "ringing" and "in-progress"
+webhook spans) and post-call processing lag (event_lag_seconds on each
+webhook span).
+
+Export is off unless TRACING_EXPORTER is set:
+  json → one JSON span per line appended to TRACING_JSON_PATH
+  otlp → OTLP/HTTP JSON batches POSTed to TRACING_OTLP_ENDPOINT
+         (any local OpenTelemetry collector / Jaeger / Tempo)
+
+Spans are exported from a background thread so request and task code never
+waits on I/O.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import httpx
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+_current: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attributes: dict | None):
+        self.name       = name
+        self.trace_id   = trace_id
+        self.span_id    = secrets.token_hex(8)
+        self.parent_id  = parent_id
+        self.start_ns   = time.time_ns()
+        self.end_ns     = 0
+        self.attributes = dict(attributes or {})
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id":    self.trace_id,
+            "span_id":     self.span_id,
+            "parent_id":   self.parent_id,
+            "name":        self.name,
+            "start_ns":    self.start_ns,
+            "end_ns":      self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes":  self.attributes,
+            "error":       self.error,
+        }
+
+
+class _NoopSpan:
+    traceparent = None
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str] | None:
+    """'00-<trace>-<span>-<flags>' → (trace_id, parent_span_id), or None if malformed."""
+    if not value or not isinstance(value, str):
+        return None
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+@contextmanager
+def start_span(name: str, attributes: dict | None = None, traceparent: str | None = None):
+    """Open a span as a child of `traceparent`, else of the current span, else a new trace."""
+    if not settings.TRACING_EXPORTER:
+        yield _NOOP
+        return
+
+    remote = parse_traceparent(traceparent)
+    parent = _current.get()
+    if remote:
+        trace_id, parent_id = remote
+    elif parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+
+    span = Span(name, trace_id, parent_id, attributes)
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        span.end_ns = time.time_ns()
+        _exporter().submit(span)
+
+
+def current_traceparent() -> str | None:
+    span = _current.get()
+    return span.traceparent if span is not None else None
+
+
+# ─── Export ───────────────────────────────────────────────────────────────────
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_body(spans: list[Span]) -> dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [
+            {"key": "service.name", "value": {"stringValue": settings.TRACING_SERVICE_NAME}},
+            {"key": "process.role", "value": {"stringValue": settings.DB_ROLE}},
+        ]},
+        "scopeSpans": [{
+            "scope": {"name": "app"},
+            "spans": [{
+                "traceId":           s.trace_id,
+                "spanId":            s.span_id,
+                "parentSpanId":      s.parent_id or "",
+                "name":              s.name,
+                "kind":              1,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano":   str(s.end_ns),
+                "attributes":        [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                "status":            {"code": 2, "message": s.error} if s.error else {"code": 1},
+            } for s in spans],
+        }],
+    }]}
+
+
+class _Exporter:
+    """Batches finished spans on a queue and writes them from a daemon thread."""
+
+    def __init__(self):
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=10_000)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass   # never block the caller on tracing
+
+    def _drain(self, first: Span | None = None) -> list[Span]:
+        batch = [first] if first else []
+        while len(batch) < 512:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list[Span]) -> None:
+        if not batch:
+            return
+        try:
+            if settings.TRACING_EXPORTER == "otlp":
+                httpx.post(settings.TRACING_OTLP_ENDPOINT, json=_otlp_body(batch), timeout=5)
+            else:
+                with open(settings.TRACING_JSON_PATH, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(s.to_dict(), default=str) + "\n" for s in batch))
+        except Exception as e:
+            log.warning(f"Span export failed ({type(e).__name__}: {e}) — dropped {len(batch)} spans")
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=2)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def flush(self) -> None:
+        self._write(self._drain())
+
+
+_exporter_instance: _Exporter | None = None
+_exporter_pid: int | None = None
+_exporter_lock = threading.Lock()
+
+
+def _exporter() -> _Exporter:
+    """One exporter per process — re-created after a fork (Celery prefork)."""
+    global _exporter_instance, _exporter_pid
+    if _exporter_instance is None or _exporter_pid != os.getpid():
+        with _exporter_lock:
+            if _exporter_instance is None or _exporter_pid != os.getpid():
+                _exporter_instance = _Exporter()
+                _exporter_pid = os.getpid()
+    return _exporter_instance
@@ -0,0 +1,136 @@
+"""
+app/db/engine.py
+
+The ONLY place database engines are created.
+
+One async engine (FastAPI / scripts) and one sync engine (Celery) per process,
+both built lazily from Settings so a process never opens a pool it does not use.
+When DATABASE_REPLICA_URL is set, the API also gets a read-replica async engine.
+
+Pool settings come from DB_* in Settings. DB_POOL_OVERRIDES lets each process
+role tune its own pool, e.g. in .env:
+
+    DB_ROLE=worker
+    DB_POOL_OVERRIDES={"worker": {"pool_size": 2, "max_overflow": 2}, "admin": {"pool_size": 2}}
+
+Roles: "api" (default), "worker" (Celery — always used for the sync engine)
+and "admin" (scripts / dedicated admin deployments).
+"""
+
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
+
+_async_engine: AsyncEngine | None = None
+_replica_engine: AsyncEngine | None = None
+_sync_engine:  Engine | None = None
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    metric_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.metric_label).observe(time.perf_counter() - start)
+
+
+class _TimedAsyncQueuePool(_TimedQueuePool, AsyncAdaptedQueuePool):
+    metric_label = "async"
+
+
+_POOL_KEYS = ("pool_size", "max_overflow", "pool_recycle", "pool_timeout", "pool_pre_ping", "statement_cache_size")
+
+
+def pool_options(role: str) -> dict:
+    """Base DB_* settings with the per-role override applied on top."""
+    options = {
+        "pool_size":            settings.DB_POOL_SIZE,
+        "max_overflow":         settings.DB_MAX_OVERFLOW,
+        "pool_recycle":         settings.DB_POOL_RECYCLE,
+        "pool_timeout":         settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping":        settings.DB_POOL_PRE_PING,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    override = settings.DB_POOL_OVERRIDES.get(role, {})
+    unknown = set(override) - set(_POOL_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown DB_POOL_OVERRIDES keys for role '{role}': {sorted(unknown)}")
+    options.update(override)
+    return options
+
+
+def sync_database_url() -> str:
+    """Celery talks to the same database through psycopg2."""
+    return settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+
+
+def _build_async_engine(url: str) -> AsyncEngine:
+    options = pool_options(settings.DB_ROLE)
+    cache_size = options.pop("statement_cache_size")
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        connect_args={"statement_cache_size": cache_size},   # asyncpg prepared statements
+        poolclass=_TimedAsyncQueuePool,
+        **options,
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _build_async_engine(settings.DATABASE_URL)
+    return _async_engine
+
+
+def get_replica_engine() -> AsyncEngine | None:
+    """Async engine for the read replica, or None when no replica is configured."""
+    global _replica_engine
+    if _replica_engine is None and settings.DATABASE_REPLICA_URL:
+        _replica_engine = _build_async_engine(settings.DATABASE_REPLICA_URL)
+    return _replica_engine
+
+
+def get_sync_engine() -> Engine:
+    global _sync_engine
+    if _sync_engine is None:
+        options = pool_options("worker")
+        options.pop("statement_cache_size")   # asyncpg only
+        _sync_engine = create_engine(
+            sync_database_url(),
+            echo=settings.DB_ECHO,
+            poolclass=_TimedQueuePool,
+            **options,
+        )
+    return _sync_engine
+
+
+def _stats(pool) -> dict:
+    return {
+        "size":        pool.size(),
+        "checked_in":  pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow":    pool.overflow(),
+    }
+
+
+def pool_stats() -> dict:
+    """Current pool usage for every engine this process has created."""
+    stats = {"role": settings.DB_ROLE}
+    if _async_engine is not None:
+        stats["async"] = _stats(_async_engine.sync_engine.pool)
+    if _replica_engine is not None:
+        stats["replica"] = _stats(_replica_engine.sync_engine.pool)
+    if _sync_engine is not None:
+        stats["sync"] = _stats(_sync_engine.pool)
+    return stats
@@ -1,33 +1,113 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from app.core.config import settings
 import redis.asyncio as aioredis
+from app.core.metrics import REDIS_ROUNDTRIP
+from app.db.engine import get_async_engine, get_replica_engine
 from app.models.base import Base
 
+log = logging.getLogger(__name__)
+
 _redis_pool: aioredis.Redis | None = None
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+# The process-wide async engine — see app/db/engine.py for pool tuning
+engine = get_async_engine()
 
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
+AsyncSessionLocal = async_sessionmaker(
+    engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+replica_engine = get_replica_engine()
+
+ReplicaSessionLocal = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+) if replica_engine is not None else None
+
+# 0 when fully replayed, otherwise seconds since the last replayed transaction
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+_replica_health = {"checked_at": 0.0, "healthy": False}
+
+
+async def _replica_lag() -> float:
+    async with replica_engine.connect() as conn:
+        return float(await conn.scalar(_REPLICA_LAG_SQL) or 0)
+
+
+async def replica_is_fresh() -> bool:
+    """True when the replica is reachable and within REPLICA_MAX_LAG_SECONDS.
+
+    The answer is cached for REPLICA_LAG_CHECK_SECONDS so the lag query runs
+    once per interval per process, not once per request. Connecting and the
+    query together get REPLICA_LAG_TIMEOUT_SECONDS; a hung replica counts as
+    unavailable so requests never wait on it.
+    """
+    if replica_engine is None:
+        return False
+
+    now = time.monotonic()
+    if now - _replica_health["checked_at"] < settings.REPLICA_LAG_CHECK_SECONDS:
+        return _replica_health["healthy"]
+    _replica_health["checked_at"] = now
+
+    try:
+        lag = await asyncio.wait_for(_replica_lag(), settings.REPLICA_LAG_TIMEOUT_SECONDS)
+        healthy = lag <= settings.REPLICA_MAX_LAG_SECONDS
+        if not healthy:
+            log.warning(f"Read replica lagging {lag:.1f}s — routing reads to primary")
+    except Exception as e:
+        healthy = False
+        log.warning(f"Read replica unavailable ({type(e).__name__}: {e}) — routing reads to primary")
+
+    _replica_health["healthy"] = healthy
+    return healthy
+
+
 async def get_db():
+    """Primary session — use for anything that writes."""
     async with AsyncSessionLocal() as session:
         yield session
 
+
+async def get_read_db():
+    """Read-only session — the replica when it is fresh, otherwise the primary."""
+    factory = ReplicaSessionLocal if await replica_is_fresh() else AsyncSessionLocal
+    async with factory() as session:
+        yield session
+
 async def init_db():
     async with engine.begin() as conn:
         # This creates all tables defined in your models
         await conn.run_sync(Base.metadata.create_all)
 
+class _TimedRedis(aioredis.Redis):
+    """Redis client that records the round trip of every command."""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_ROUNDTRIP.labels(str(args[0]).upper()).observe(time.perf_counter() - start)
+
+
 async def get_redis_pool() -> aioredis.Redis:
     """Call this in your FastAPI lifespan / startup event to pre-warm the pool."""
     global _redis_pool
     if _redis_pool is None:
-        _redis_pool = await aioredis.from_url(
+        _redis_pool = await _TimedRedis.from_url(
             settings.REDIS_URL,
             encoding="utf-8",
             decode_responses=False,   # raw bytes — we decode manually where needed
@@ -1,17 +1,24 @@
-from sqlalchemy import create_engine
+import redis
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.engine import get_sync_engine
 
-# Convert async URL → sync URL for Celery
-DATABASE_URL = settings.DATABASE_URL.replace(
-    "postgresql+asyncpg",
-    "postgresql"
-)
-
-engine = create_engine(DATABASE_URL)
+# Sync engine for Celery — same database, pool tuned by the "worker" role
+engine = get_sync_engine()
 
 SessionLocal = sessionmaker(
     bind=engine,
     autocommit=False,
     autoflush=False,
-)
\ No newline at end of file
+)
+
+
+# Sync Redis client for Celery tasks — one connection pool per worker process
+_redis: redis.Redis | None = None
+
+
+def get_sync_redis() -> redis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
@@ -12,6 +14,11 @@ from app.api.v1.analytics import router as analytics_router
 from app.api.v1.wallet import router as wallet_router
 from app.api.v1.admin import router as admin_router
 from app.core.config import settings
+from app.core.blacklist_cache import blacklist_cache
+from app.services.campaign_events import campaign_events
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
+from app.core.query_counter import QueryCountMiddleware
+from app.db.session import get_redis_pool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,7 +33,19 @@ logging.basicConfig(
     ]
 )
 
-app = FastAPI(title="AI Calling SaaS", docs_url="/docs")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep this worker's token blacklist Bloom filter in sync with Redis
+    blacklist_cache.start(await get_redis_pool())
+    # One pub/sub connection feeding every live campaign stream on this worker
+    campaign_events.start(await get_redis_pool())
+    yield
+    await campaign_events.stop()
+    await blacklist_cache.stop()
+
+
+app = FastAPI(title="AI Calling SaaS", docs_url="/docs", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,6 +55,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryCountMiddleware)
+
 
 # Apply the prefix to EVERYTHING for consistency
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Auth"])
@@ -47,6 +69,9 @@ app.include_router(analytics_router, prefix="/api/v1", tags=["Analytics"])
 app.include_router(wallet_router, prefix="/api/v1", tags=["Wallet"])
 app.include_router(admin_router, prefix="/api/v1/admin", tags=["Super Admin"])
 
+app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
\ No newline at end of file
@@ -3,6 +3,7 @@ from app.models.user import User
 from .organization import Organization
 from .user import User
 from .call_logs import CallLog
+from .call_transcript import CallTranscript
 from app.models.base import Base
 from app.models.user import User
 from app.models.organization import Organization
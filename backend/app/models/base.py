@@ -1,26 +1,10 @@
-from sqlalchemy.ext.asyncio import (create_async_engine,async_sessionmaker,AsyncSession)
-from sqlalchemy.orm import DeclarativeBase
-from app.core.config import settings  
 from sqlalchemy.orm import DeclarativeBase, declared_attr
 
-# This is the async engine — used by FastAPI routes
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,  # checks connection is alive before using it
-    echo=settings.DEBUG, # logs SQL queries when DEBUG=true
-)
+# Engines and session factories live in app/db — this module only defines Base
 
-# Session factory — creates a new session for each request
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
 
 # Base class — all your models will inherit from this
 class Base(DeclarativeBase):
     @declared_attr
     def __tablename__(cls) -> str:
-        return cls.__name__.lower()
\ No newline at end of file
+        return cls.__name__.lower()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -10,6 +10,19 @@ from app.models.base import Base
 class CallLog(Base):
     __tablename__ = "call_logs"
 
+    # Range-partitioned by month on created_at (see app/tasks/maintenance_tasks.py).
+    # Postgres requires the partition key in every PK / unique constraint, so the
+    # PK is (id, created_at) and external_call_id is unique only per created_at —
+    # writers serialize on call_log_lock() (app/services/call_state.py) instead.
+    __table_args__ = (
+        UniqueConstraint("external_call_id", "created_at", name="uq_call_logs_external_call_id_created_at"),
+        # Analytics: WHERE campaign_id = ? → count / sum(duration) / sum(cost) as index-only scans
+        Index("ix_call_logs_campaign_id", "campaign_id", postgresql_include=["duration", "cost"]),
+        # Log listing: campaign_id = ? ORDER BY created_at DESC, id DESC, keyset-paginated
+        Index("ix_call_logs_campaign_created", "campaign_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # allow records without a campaign (webhook payloads may not include one)
@@ -23,7 +36,7 @@ class CallLog(Base):
     status = Column(String, nullable=True)
 
     recording_url = Column(Text, nullable=True)
-    transcript = Column(Text, nullable=True)
+    # transcript / summary: compressed in call_transcripts (app/services/transcript_store.py)
 
     scheduled_at = Column(DateTime, nullable=True)
     executed_at = Column(DateTime, default=datetime.utcnow)
@@ -37,13 +50,10 @@ class CallLog(Base):
 
     customer_sentiment = Column(String, nullable=True)
 
-    final_call_summary = Column(Text, nullable=True)
-    summary = Column(Text, nullable=True)
-
     transfer_call = Column(Boolean, default=False)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
 
     campaign = relationship("Campaign", backref="call_logs")
     lead = relationship("Lead", backref="call_logs")
-    external_call_id = Column(String, unique=True, index=True, nullable=False)
\ No newline at end of file
+    external_call_id = Column(String, index=True, nullable=False)
\ No newline at end of file
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from datetime import datetime
+
+from app.models.base import Base
+
+
+class CallTranscript(Base):
+    """
+    Transcript and summary of a call, zstd-compressed, kept out of call_logs so
+    its heap stays small. Loaded only when a transcript is asked for — see
+    app/services/transcript_store.py.
+    """
+    __tablename__ = "call_transcripts"
+
+    __table_args__ = (
+        # Full-text search: WHERE campaign_id = ? AND search_vector @@ query → BitmapAnd with ix_call_transcripts_campaign_id
+        Index("ix_call_transcripts_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    # call_logs is partitioned (PK id + created_at), so no FK — same as wallet_transactions.call_log_id
+    call_log_id = Column(UUID(as_uuid=True), primary_key=True)
+    call_log_created_at = Column(DateTime, nullable=False, index=True)   # archived with its partition
+    campaign_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+
+    transcript_zst = Column(LargeBinary, nullable=True)
+    transcript_bytes = Column(Integer, nullable=True)   # uncompressed size, needed to decompress
+    summary_zst = Column(LargeBinary, nullable=True)
+    summary_bytes = Column(Integer, nullable=True)
+
+    # Summary lexemes weighted A, transcript lexemes B; filled by the webhook
+    search_vector = Column(TSVECTOR, nullable=True)
+
+    # Copied from the call log so search filters never touch call_logs
+    customer_sentiment = Column(String, nullable=True)
+    interest_level = Column(String, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -3,12 +3,11 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import Column, String, ForeignKey, DateTime, Enum, Integer
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.services.wallet_service import has_sufficient_balance, get_balance
 
 from app.models.base import Base
-from sqlalchemy import Boolean
 
 # ✅ Campaign Status Enum
 class CampaignStatus(str, enum.Enum):
@@ -43,9 +42,13 @@ class Campaign(Base):
         default=CampaignStatus.draft
     )
 
-    is_processing = Column(Boolean, default=False, nullable=False)
     call_delay_seconds = Column(Integer, default=1)
 
+    # Scheduling — see app/services/campaign_scheduler.py
+    scheduled_at = Column(DateTime, nullable=True)        # UTC start time
+    calling_windows = Column(JSONB, nullable=True)        # local-time windows; NULL = any time
+    retry_policy = Column(JSONB, nullable=True)           # see app/services/retry_policy.py; NULL = default
+
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -3,7 +3,7 @@ from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, ForeignKey,
     DateTime, SmallInteger,
-    Enum, UniqueConstraint
+    Enum, UniqueConstraint, Index, text
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -28,6 +28,21 @@ class Lead(Base):
             "phone",
             name="uq_campaign_phone"
         ),
+        # Dispatcher claim: campaign_id = ? AND next_attempt_at <= now() ORDER BY next_attempt_at,
+        # over dialable leads only (status IN (...) AND retry_count < max_retries)
+        Index(
+            "ix_leads_next_attempt",
+            "campaign_id", "next_attempt_at",
+            postgresql_where=text("status IN ('PENDING', 'FAILED') AND retry_count < max_retries"),
+        ),
+        # Lead listing: campaign_id = ? ORDER BY created_at DESC
+        Index("ix_leads_campaign_created", "campaign_id", "created_at"),
+        # Reaper: status = 'QUEUED' AND updated_at < cutoff
+        Index(
+            "ix_leads_queued_updated",
+            "updated_at",
+            postgresql_where=text("status = 'QUEUED'"),
+        ),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -59,9 +74,13 @@ class Lead(Base):
     retry_count = Column(Integer, default=0)
     max_retries = Column(Integer, default=3)
 
+    # Earliest time the dispatcher may dial this lead — see app/services/retry_policy.py
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("now()"))
+
     custom_fields = Column(JSONB, default=dict)
 
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     campaign = relationship("Campaign")
 
@@ -104,6 +104,20 @@ class Organization(Base):
         server_default="true",
         comment="Soft delete flag. Inactive orgs block login for all their users.",
     )
+    timezone: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        default="UTC",
+        server_default="UTC",
+        comment="IANA timezone for campaign calling windows, e.g. 'Asia/Kolkata'",
+    )
+    tier: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        default="standard",
+        server_default="standard",
+        comment="Plan tier; sets the org's share of dial slots (DISPATCH_TIER_WEIGHTS)",
+    )
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Integer, Float, ForeignKey, DateTime, Enum as SAEnum, String, func
+from sqlalchemy import Integer, Float, ForeignKey, DateTime, Enum as SAEnum, String, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
@@ -42,6 +42,16 @@ class Wallet(Base):
 
 class WalletTransaction(Base):
     __tablename__ = "wallet_transactions"
+    __table_args__ = (
+        # History: wallet_id = ? ORDER BY created_at DESC
+        Index("ix_wallet_transactions_wallet_created", "wallet_id", "created_at"),
+        # Webhook dedup: call_log_id = ?
+        Index(
+            "ix_wallet_transactions_call_log_id",
+            "call_log_id",
+            postgresql_where=text("call_log_id IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
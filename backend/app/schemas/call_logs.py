@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+
+
+# ✅ One call log row — only the fields asked for with ?fields= are set (and serialized)
+class CallLogItem(BaseModel):
+    id: UUID | None = None
+    external_call_id: str | None = None
+    campaign_id: UUID | None = None
+    lead_id: UUID | None = None
+    user_number: str | None = None
+    status: str | None = None
+    duration: int | None = None
+    cost: float | None = None
+    recording_url: str | None = None
+    username: str | None = None
+    customer_sentiment: str | None = None
+    interest_level: str | None = None
+    appointment_booked: bool | None = None
+    appointment_date: datetime | None = None
+    appointment_mode: str | None = None
+    transfer_call: bool | None = None
+    scheduled_at: datetime | None = None
+    executed_at: datetime | None = None
+    created_at: datetime | None = None
+
+
+# ✅ A page of call logs, newest first; pass next_cursor back as ?cursor= for the next one
+class CallLogPage(BaseModel):
+    items: list[CallLogItem]
+    next_cursor: str | None = None
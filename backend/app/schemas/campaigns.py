@@ -1,7 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Literal
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+import re
 
 
 # ✅ 1️⃣ Campaign Status Enum
@@ -14,11 +16,70 @@ class CampaignStatus(str, Enum):
     stopped = "stopped"
 
 
+# ✅ Calling-hours window, in the org's (or lead's) local time
+class CallingWindow(BaseModel):
+    days: list[str] = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+    start: str   # "HH:MM"
+    end: str     # "HH:MM", exclusive
+
+    @field_validator("days")
+    @classmethod
+    def valid_days(cls, v: list[str]) -> list[str]:
+        if not v:
+            raise ValueError("days must name at least one day")
+        v = [d.lower()[:3] for d in v]
+        if any(d not in ("mon", "tue", "wed", "thu", "fri", "sat", "sun") for d in v):
+            raise ValueError("days must be mon, tue, wed, thu, fri, sat or sun")
+        return v
+
+    @field_validator("start", "end")
+    @classmethod
+    def valid_time(cls, v: str) -> str:
+        if not re.match(r"^([01]\d|2[0-3]):[0-5]\d$", v):
+            raise ValueError("time must be HH:MM (24h)")
+        return v
+
+    @model_validator(mode="after")
+    def start_before_end(self) -> "CallingWindow":
+        # is_open() checks start <= now < end on one local day
+        if self.start >= self.end:
+            raise ValueError("start must be before end; split an overnight window at midnight")
+        return self
+
+
+# ✅ Retry backoff policy (see app/services/retry_policy.py)
+class RetryPolicy(BaseModel):
+    type: Literal["fixed", "exponential", "time_of_day"] = "exponential"
+    delay_seconds: int | None = Field(default=None, ge=0)        # fixed
+    base_seconds: int | None = Field(default=None, ge=0)         # exponential
+    factor: float | None = Field(default=None, ge=1)
+    max_seconds: int | None = Field(default=None, ge=0)
+    slots: list[str] | None = None                               # time_of_day, local "HH:MM"
+    min_delay_seconds: int | None = Field(default=None, ge=0)
+
+    @field_validator("slots")
+    @classmethod
+    def valid_slots(cls, v: list[str] | None) -> list[str] | None:
+        if v and any(not re.match(r"^([01]\d|2[0-3]):[0-5]\d$", s) for s in v):
+            raise ValueError("slots must be HH:MM (24h)")
+        return v
+
+
 # ✅ 2️⃣ Create Schema
 class CampaignCreate(BaseModel):
     name: str
     description: str | None = None
     bolna_agent_id: str | None = None
+    scheduled_at: datetime | None = None                 # start time; naive values are UTC
+    calling_windows: list[CallingWindow] | None = None
+    retry_policy: RetryPolicy | None = None
+
+    @field_validator("scheduled_at")
+    @classmethod
+    def to_naive_utc(cls, v: datetime | None) -> datetime | None:
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
 
 
 # ✅ 3️⃣ Status Update Schema (NEW for Step 2)
@@ -36,8 +97,23 @@ class CampaignResponse(BaseModel):
     # 🔥 replaced is_active
     status: CampaignStatus
 
+    scheduled_at: datetime | None = None
+    calling_windows: list[CallingWindow] | None = None
+    retry_policy: RetryPolicy | None = None
+
     created_at: datetime
     updated_at: datetime | None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# ✅ 5️⃣ Dispatcher lease (see app/services/campaign_lease.py)
+class CampaignLeaseResponse(BaseModel):
+    campaign_id: UUID
+    status: CampaignStatus
+    held: bool
+    owner: str | None            # "<host>:<pid>" of the worker that last renewed it
+    acquired_at: float | None    # unix seconds
+    heartbeat_at: float | None
+    expires_in: int | None       # seconds until takeover if no heartbeat arrives
@@ -0,0 +1,190 @@
+"""
+app/schemas/webhook.py
+
+Typed Bolna call event, decoded straight from the raw request bytes.
+
+Bolna sends two shapes — a flat execution record, or an envelope
+{"event": "call.…", "data": {…}, "metadata": …, "timestamp": …} — and spreads
+the same value over several keys (phone in user_number / phone_number /
+recipient_phone_number / context_details / telephony_data, duration in
+conversation_duration or telephony_data.duration, …).
+
+BolnaWebhook.decode() parses and validates both shapes in one pydantic-core
+pass (no intermediate dict) and returns a BolnaCallEvent whose properties
+resolve the aliases. Unknown keys are skipped, not materialized.
+"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+class _Lenient(BaseModel):
+    # Numbers where strings are expected (a numeric user_number, call id, …) become strings
+    model_config = ConfigDict(extra="ignore", coerce_numbers_to_str=True)
+
+
+def _to_float(v):
+    """Bolna sends numbers, numeric strings, or junk; junk counts as missing."""
+    if v is None or isinstance(v, (int, float)):
+        return v
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+_TRUE = {"true", "yes", "1"}
+_FALSE = {"false", "no", "0", ""}
+
+
+def _to_bool(v):
+    """Booleans, 0 / 1 and "true" / "no"-style strings; anything else counts as missing."""
+    if v is None or isinstance(v, bool):
+        return v
+    if isinstance(v, (int, float)) and v in (0, 1):
+        return bool(v)
+    if isinstance(v, str) and v.strip().lower() in _TRUE | _FALSE:
+        return v.strip().lower() in _TRUE
+    return None
+
+
+def _object_or_none(v):
+    """A nested object sent as "", a list or a scalar counts as missing."""
+    return v if v is None or isinstance(v, (dict, BaseModel)) else None
+
+
+class TelephonyData(_Lenient):
+    to_number: str | None = None
+    duration: float | None = None
+    recording_url: str | None = None
+
+    @field_validator("duration", mode="before")
+    @classmethod
+    def _number(cls, v):
+        return _to_float(v)
+
+
+class ContextDetails(_Lenient):
+    recipient_phone_number: str | None = None
+
+
+class ExtractedData(_Lenient):
+    customer_sentiment: str | None = None
+    interest_level: str | None = None
+
+
+class BolnaCallEvent(_Lenient):
+    call_id: str | None = None
+    id: str | None = None
+    status: str | None = None
+
+    user_number: str | None = None
+    phone_number: str | None = None
+    recipient_phone_number: str | None = None
+    context_details: ContextDetails | None = None
+    telephony_data: TelephonyData | None = None
+
+    conversation_duration: float | None = None
+    total_cost: float | None = None
+
+    transcript: str | None = None
+    summary: str | None = None
+    transfer_call: bool | None = None
+    extracted_data: ExtractedData | None = None
+
+    appointment_booked: bool | None = None
+    appointment_date: datetime | None = None
+    appointment_mode: str | None = None
+
+    metadata: dict | None = None
+    updated_at: str | float | None = None
+
+    @field_validator("conversation_duration", "total_cost", mode="before")
+    @classmethod
+    def _number(cls, v):
+        return _to_float(v)
+
+    @field_validator("appointment_booked", "transfer_call", mode="before")
+    @classmethod
+    def _flag(cls, v):
+        return _to_bool(v)
+
+    @field_validator("context_details", "telephony_data", "extracted_data", "metadata", mode="before")
+    @classmethod
+    def _object(cls, v):
+        return _object_or_none(v)
+
+    @field_validator("appointment_date", mode="before")
+    @classmethod
+    def _naive_date(cls, v):
+        # Stored in a naive column — same parsing the webhook always used
+        if isinstance(v, str):
+            try:
+                return datetime.fromisoformat(v)
+            except ValueError:
+                return None
+        return v
+
+    # ─── Resolved aliases ─────────────────────────────────────────────────
+
+    @property
+    def external_id(self) -> str | None:
+        return self.call_id or self.id
+
+    @property
+    def phone(self) -> str | None:
+        return (
+            self.user_number
+            or self.phone_number
+            or self.recipient_phone_number
+            or (self.context_details and self.context_details.recipient_phone_number)
+            or (self.telephony_data and self.telephony_data.to_number)
+        )
+
+    @property
+    def duration(self) -> float:
+        if self.conversation_duration is not None:
+            return self.conversation_duration
+        return (self.telephony_data and self.telephony_data.duration) or 0.0
+
+    @property
+    def cost(self) -> float:
+        return self.total_cost or 0.0
+
+    @property
+    def recording_url(self) -> str | None:
+        return self.telephony_data and self.telephony_data.recording_url
+
+    @property
+    def customer_sentiment(self) -> str | None:
+        return self.extracted_data and self.extracted_data.customer_sentiment
+
+    @property
+    def interest_level(self) -> str | None:
+        return self.extracted_data and self.extracted_data.interest_level
+
+
+class BolnaWebhook(BolnaCallEvent):
+    """Either shape of the webhook body; the envelope fields are only set for an envelope."""
+
+    event: str | None = None
+    data: BolnaCallEvent | None = None
+    timestamp: str | float | None = None
+
+    @field_validator("data", mode="before")
+    @classmethod
+    def _data(cls, v):
+        return _object_or_none(v)
+
+    @classmethod
+    def decode(cls, raw: bytes | str | dict) -> tuple[str | None, BolnaCallEvent]:
+        """Returns (envelope event type, call event)."""
+        root = cls.model_validate(raw) if isinstance(raw, dict) else cls.model_validate_json(raw)
+        event = root.data or root
+        if root.data is not None:
+            event.metadata = event.metadata or root.metadata
+            event.updated_at = event.updated_at or root.timestamp
+        elif event.updated_at is None:
+            event.updated_at = root.timestamp
+        return root.event, event
@@ -0,0 +1,318 @@
+"""
+app/services/bolna_guard.py
+
+Adaptive concurrency limit + circuit breaker for Bolna, shared by every worker
+through Redis.
+
+Concurrency (AIMD)
+  bolna:limit     current limit on in-flight /call requests, across all workers
+  bolna:inflight  ZSET of in-flight request ids (scored by start time, so
+                  entries from killed workers age out)
+  A fast success adds 1/limit (≈ +1 per round of requests); an error or a
+  response slower than BOLNA_LATENCY_TARGET_SECONDS halves it, at most once
+  per second.
+
+Circuit breaker
+  Outcomes are counted in 5-second buckets. When the last
+  BOLNA_BREAKER_WINDOW_SECONDS hold ≥ BOLNA_BREAKER_MIN_REQUESTS requests with
+  an error rate ≥ BOLNA_BREAKER_ERROR_RATE, the breaker opens for
+  BOLNA_BREAKER_COOLDOWN_SECONDS. It then half-opens: one probe at a time is
+  let through; a success closes it, a failure re-opens it.
+
+Every Bolna request — /call from the dispatcher, /executions from the reaper,
+/agent from the API — runs inside guarded() / aguarded(), so all of them take
+a slot and feed the breaker. Calls refused by either raise BolnaUnavailable.
+The dispatcher treats that as "not attempted": the lead is put back without
+being charged a retry.
+"""
+
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+
+from app.core.config import settings
+from app.core.metrics import BOLNA_CALLS_REJECTED
+
+LIMIT_KEY    = "bolna:limit"
+INFLIGHT_KEY = "bolna:inflight"
+CUT_KEY      = "bolna:limit:cut"
+OPEN_KEY     = "bolna:breaker:open"      # exists while open (TTL = cooldown)
+TRIPPED_KEY  = "bolna:breaker:tripped"   # exists from opening until a probe succeeds
+PROBE_KEY    = "bolna:breaker:probe"     # half-open: the single in-flight probe
+STATS_KEY    = "bolna:stats:{}"
+
+_BUCKET_SECONDS = 5
+_STALE_INFLIGHT_SECONDS = 60
+
+# Drop stale entries, then admit if under the limit.
+_ACQUIRE_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local limit = tonumber(redis.call('GET', KEYS[2]) or ARGV[3])
+if redis.call('ZCARD', KEYS[1]) >= math.floor(limit) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+return 1
+"""
+
+# AIMD step, atomic so concurrent workers never overwrite each other's change.
+# ARGV[1] = "inc" | "cut". A cut is applied at most once per second (CUT_KEY).
+# Returns the limit as a string (Lua numbers would be truncated to integers).
+_ADJUST_LUA = """
+local limit = tonumber(redis.call('GET', KEYS[1]) or ARGV[2])
+if ARGV[1] == 'inc' then
+    limit = math.min(limit + 1 / math.max(limit, 1), tonumber(ARGV[4]))
+elseif redis.call('SET', KEYS[2], '1', 'NX', 'PX', 1000) then
+    limit = math.max(limit / 2, tonumber(ARGV[3]))
+else
+    return tostring(limit)
+end
+redis.call('SET', KEYS[1], tostring(limit))
+return tostring(limit)
+"""
+
+
+class BolnaUnavailable(Exception):
+    """Bolna was not called — breaker open or concurrency limit reached."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Bolna unavailable ({reason}), retry in {retry_after:.0f}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _bucket(now: float) -> int:
+    return int(now // _BUCKET_SECONDS)
+
+
+def is_healthy_status(status_code: int) -> bool:
+    """5xx / 429 mean Bolna is struggling; other 4xx are about this one request."""
+    return status_code < 500 and status_code != 429
+
+
+class GuardedCall:
+    """One admitted request. Call record() with the response status; a request
+    that ends without one (transport error, cancellation) counts as a failure."""
+
+    def __init__(self):
+        self.ok = False
+        self.start = time.perf_counter()
+
+    def record(self, status_code: int) -> None:
+        self.ok = is_healthy_status(status_code)
+
+    @property
+    def latency(self) -> float:
+        return time.perf_counter() - self.start
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SYNC — used by make_call in Celery tasks
+# ─────────────────────────────────────────────────────────────────────────────
+
+def acquire(redis) -> tuple[str, bool]:
+    """
+    Reserve a slot for one Bolna request. Returns (request id, is_probe).
+    Raises BolnaUnavailable if the breaker is open or the limit is reached.
+    """
+    is_probe = False
+    if redis.exists(OPEN_KEY):
+        BOLNA_CALLS_REJECTED.labels("breaker_open").inc()
+        raise BolnaUnavailable("breaker_open", max(redis.ttl(OPEN_KEY), 1))
+
+    if redis.exists(TRIPPED_KEY):
+        # Half-open: only one probe at a time
+        if not redis.set(PROBE_KEY, "1", nx=True, ex=30):
+            BOLNA_CALLS_REJECTED.labels("breaker_half_open").inc()
+            raise BolnaUnavailable("breaker_half_open", 5)
+        is_probe = True
+
+    request_id = uuid.uuid4().hex
+    now = time.time()
+    admitted = redis.eval(
+        _ACQUIRE_LUA, 2, INFLIGHT_KEY, LIMIT_KEY,
+        now - _STALE_INFLIGHT_SECONDS, now, settings.BOLNA_CONCURRENCY_INITIAL, request_id,
+    )
+    if not admitted:
+        if is_probe:
+            redis.delete(PROBE_KEY)
+        BOLNA_CALLS_REJECTED.labels("concurrency_limit").inc()
+        raise BolnaUnavailable("concurrency_limit", 1)
+    return request_id, is_probe
+
+
+@contextmanager
+def guarded(redis):
+    """Acquire a slot around one Bolna request and release it with the outcome."""
+    request_id, is_probe = acquire(redis)
+    call = GuardedCall()
+    try:
+        yield call
+    finally:
+        release(redis, request_id, is_probe, call.ok, call.latency)
+
+
+def _error_rate(redis, now: float) -> tuple[int, float]:
+    buckets = range(_bucket(now) - settings.BOLNA_BREAKER_WINDOW_SECONDS // _BUCKET_SECONDS, _bucket(now) + 1)
+    pipe = redis.pipeline(transaction=False)
+    for b in buckets:
+        pipe.hmget(STATS_KEY.format(b), "ok", "err")
+    ok = err = 0
+    for bucket_ok, bucket_err in pipe.execute():
+        ok += int(bucket_ok or 0)
+        err += int(bucket_err or 0)
+    total = ok + err
+    return total, (err / total if total else 0.0)
+
+
+def _open(redis) -> None:
+    pipe = redis.pipeline()
+    pipe.set(OPEN_KEY, "1", ex=settings.BOLNA_BREAKER_COOLDOWN_SECONDS)
+    pipe.set(TRIPPED_KEY, "1")
+    pipe.delete(PROBE_KEY)
+    pipe.execute()
+    print(f"[BOLNA] Circuit breaker OPEN for {settings.BOLNA_BREAKER_COOLDOWN_SECONDS}s")
+
+
+def release(redis, request_id: str, is_probe: bool, ok: bool, latency: float) -> None:
+    """Record the outcome, adjust the concurrency limit and the breaker."""
+    now = time.time()
+    stats = STATS_KEY.format(_bucket(now))
+
+    pipe = redis.pipeline()
+    pipe.zrem(INFLIGHT_KEY, request_id)
+    pipe.hincrby(stats, "ok" if ok else "err", 1)
+    pipe.expire(stats, settings.BOLNA_BREAKER_WINDOW_SECONDS + _BUCKET_SECONDS)
+    pipe.execute()
+
+    # AIMD
+    healthy = ok and latency <= settings.BOLNA_LATENCY_TARGET_SECONDS
+    redis.eval(
+        _ADJUST_LUA, 2, LIMIT_KEY, CUT_KEY,
+        "inc" if healthy else "cut",
+        settings.BOLNA_CONCURRENCY_INITIAL, settings.BOLNA_CONCURRENCY_MIN, settings.BOLNA_CONCURRENCY_MAX,
+    )
+
+    # Breaker
+    if is_probe:
+        if ok:
+            redis.delete(TRIPPED_KEY, PROBE_KEY)
+            print("[BOLNA] Circuit breaker CLOSED")
+        else:
+            _open(redis)
+    elif not ok:
+        total, rate = _error_rate(redis, now)
+        if total >= settings.BOLNA_BREAKER_MIN_REQUESTS and rate >= settings.BOLNA_BREAKER_ERROR_RATE:
+            _open(redis)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ASYNC — used by the reaper and FastAPI routes
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def aacquire(redis) -> tuple[str, bool]:
+    """Async acquire() for the reaper and FastAPI routes."""
+    is_probe = False
+    if await redis.exists(OPEN_KEY):
+        BOLNA_CALLS_REJECTED.labels("breaker_open").inc()
+        raise BolnaUnavailable("breaker_open", max(await redis.ttl(OPEN_KEY), 1))
+
+    if await redis.exists(TRIPPED_KEY):
+        if not await redis.set(PROBE_KEY, "1", nx=True, ex=30):
+            BOLNA_CALLS_REJECTED.labels("breaker_half_open").inc()
+            raise BolnaUnavailable("breaker_half_open", 5)
+        is_probe = True
+
+    request_id = uuid.uuid4().hex
+    now = time.time()
+    admitted = await redis.eval(
+        _ACQUIRE_LUA, 2, INFLIGHT_KEY, LIMIT_KEY,
+        now - _STALE_INFLIGHT_SECONDS, now, settings.BOLNA_CONCURRENCY_INITIAL, request_id,
+    )
+    if not admitted:
+        if is_probe:
+            await redis.delete(PROBE_KEY)
+        BOLNA_CALLS_REJECTED.labels("concurrency_limit").inc()
+        raise BolnaUnavailable("concurrency_limit", 1)
+    return request_id, is_probe
+
+
+async def _aerror_rate(redis, now: float) -> tuple[int, float]:
+    buckets = range(_bucket(now) - settings.BOLNA_BREAKER_WINDOW_SECONDS // _BUCKET_SECONDS, _bucket(now) + 1)
+    pipe = redis.pipeline(transaction=False)
+    for b in buckets:
+        pipe.hmget(STATS_KEY.format(b), "ok", "err")
+    ok = err = 0
+    for bucket_ok, bucket_err in await pipe.execute():
+        ok += int(bucket_ok or 0)
+        err += int(bucket_err or 0)
+    total = ok + err
+    return total, (err / total if total else 0.0)
+
+
+async def _aopen(redis) -> None:
+    pipe = redis.pipeline()
+    pipe.set(OPEN_KEY, "1", ex=settings.BOLNA_BREAKER_COOLDOWN_SECONDS)
+    pipe.set(TRIPPED_KEY, "1")
+    pipe.delete(PROBE_KEY)
+    await pipe.execute()
+    print(f"[BOLNA] Circuit breaker OPEN for {settings.BOLNA_BREAKER_COOLDOWN_SECONDS}s")
+
+
+async def arelease(redis, request_id: str, is_probe: bool, ok: bool, latency: float) -> None:
+    """Async release() for the reaper and FastAPI routes."""
+    now = time.time()
+    stats = STATS_KEY.format(_bucket(now))
+
+    pipe = redis.pipeline()
+    pipe.zrem(INFLIGHT_KEY, request_id)
+    pipe.hincrby(stats, "ok" if ok else "err", 1)
+    pipe.expire(stats, settings.BOLNA_BREAKER_WINDOW_SECONDS + _BUCKET_SECONDS)
+    await pipe.execute()
+
+    healthy = ok and latency <= settings.BOLNA_LATENCY_TARGET_SECONDS
+    await redis.eval(
+        _ADJUST_LUA, 2, LIMIT_KEY, CUT_KEY,
+        "inc" if healthy else "cut",
+        settings.BOLNA_CONCURRENCY_INITIAL, settings.BOLNA_CONCURRENCY_MIN, settings.BOLNA_CONCURRENCY_MAX,
+    )
+
+    if is_probe:
+        if ok:
+            await redis.delete(TRIPPED_KEY, PROBE_KEY)
+            print("[BOLNA] Circuit breaker CLOSED")
+        else:
+            await _aopen(redis)
+    elif not ok:
+        total, rate = await _aerror_rate(redis, now)
+        if total >= settings.BOLNA_BREAKER_MIN_REQUESTS and rate >= settings.BOLNA_BREAKER_ERROR_RATE:
+            await _aopen(redis)
+
+
+@asynccontextmanager
+async def aguarded(redis):
+    """Async guarded()."""
+    request_id, is_probe = await aacquire(redis)
+    call = GuardedCall()
+    try:
+        yield call
+    finally:
+        await arelease(redis, request_id, is_probe, call.ok, call.latency)
+
+
+async def abreaker_open(redis) -> bool:
+    return bool(await redis.exists(OPEN_KEY))
+
+
+async def astatus(redis) -> dict:
+    pipe = redis.pipeline(transaction=False)
+    pipe.exists(OPEN_KEY)
+    pipe.exists(TRIPPED_KEY)
+    pipe.get(LIMIT_KEY)
+    pipe.zcard(INFLIGHT_KEY)
+    is_open, tripped, limit, inflight = await pipe.execute()
+    return {
+        "breaker":   "open" if is_open else ("half_open" if tripped else "closed"),
+        "limit":     float(limit or settings.BOLNA_CONCURRENCY_INITIAL),
+        "in_flight": inflight,
+    }
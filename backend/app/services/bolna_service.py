@@ -1,8 +1,16 @@
 import httpx
 import os
+import time
 import requests
 from app.core.config import settings
+from app.core.metrics import BOLNA_MAKE_CALL_LATENCY, BOLNA_MAKE_CALL_ERRORS
+from app.core.tracing import start_span
+from app.db.session import get_redis_pool
+from app.db.sync_session import get_sync_redis
+from app.services import bolna_guard
+from app.services.call_state import call_log_lock
 from datetime import datetime
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.call_logs import CallLog
 from app.models.lead import Lead
@@ -72,10 +80,19 @@ async def get_agent_details(agent_id: str):
 
     headers = {"Authorization": f"Bearer {BOLNA_API_KEY}"}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BOLNA_BASE_URL}/agent/{agent_id}",
-            headers=headers,
+    try:
+        async with bolna_guard.aguarded(await get_redis_pool()) as guard:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(
+                    f"{BOLNA_BASE_URL}/agent/{agent_id}",
+                    headers=headers,
+                )
+            guard.record(response.status_code)
+    except bolna_guard.BolnaUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Bolna is unavailable, try again shortly",
+            headers={"Retry-After": str(int(e.retry_after))},
         )
 
     if response.status_code != 200:
@@ -87,6 +104,38 @@ async def get_agent_details(agent_id: str):
     return response.json()
 
 
+def bolna_async_client(max_connections: int = 20) -> httpx.AsyncClient:
+    """
+    Pooled async client for bulk Bolna reads. Use as `async with` — one client
+    per event loop, with at most `max_connections` requests in flight.
+    """
+    return httpx.AsyncClient(
+        base_url=BOLNA_BASE_URL,
+        headers={"Authorization": f"Bearer {BOLNA_API_KEY}"},
+        timeout=20,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+async def get_execution(client: httpx.AsyncClient, redis, execution_id: str) -> dict | None:
+    """
+    Fetch a call execution record. It has the same shape as a webhook body.
+    Returns None if Bolna does not know the execution. Goes through the
+    Bolna guard, so it may raise BolnaUnavailable.
+    """
+    async with bolna_guard.aguarded(redis) as guard:
+        response = await client.get(f"/executions/{execution_id}")
+        guard.record(response.status_code)
+
+    if response.status_code == 404:
+        return None
+
+    if response.status_code != 200:
+        raise Exception(f"Bolna error {response.status_code}: {response.text}")
+
+    return response.json()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SYNC — used by Celery tasks only
 # Accepts sqlalchemy.orm.Session (sync), NOT AsyncSession
@@ -122,26 +171,48 @@ def make_call(
         },
     }
 
-    # Sync HTTP call — correct inside a Celery worker
-    with Client(timeout=20) as client:
-        response = client.post(
-            f"{BOLNA_MAKE_CALL_URL}/call",
-            headers=headers,
-            json=payload,
-        )
-
-    if response.status_code >= 400:
-        raise Exception(f"Bolna error: {response.text}")
-
-    try:
-        data = response.json()
-    except ValueError:
-        raise Exception(f"Bolna returned non-JSON response: {response.text}")
-
-    call_id = _extract_call_id(data)
-
-    if not call_id:
-        raise Exception(f"Bolna did not return call_id. Response: {response.text}")
+    with start_span("bolna.make_call", {"campaign.id": str(campaign_id), "lead.id": str(lead_id)}) as span:
+        # Bolna echoes metadata on every webhook — carries the trace to bolna_webhook
+        if span.traceparent:
+            payload["metadata"]["traceparent"] = span.traceparent
+
+        # Raises BolnaUnavailable without calling Bolna — the caller must not charge a retry
+        start = time.perf_counter()
+        try:
+            with bolna_guard.guarded(get_sync_redis()) as guard:
+                # Sync HTTP call — correct inside a Celery worker
+                with Client(timeout=20) as client:
+                    response = client.post(
+                        f"{BOLNA_MAKE_CALL_URL}/call",
+                        headers=headers,
+                        json=payload,
+                    )
+                guard.record(response.status_code)
+        except httpx.HTTPError as e:
+            BOLNA_MAKE_CALL_LATENCY.labels("error").observe(time.perf_counter() - start)
+            BOLNA_MAKE_CALL_ERRORS.labels(type(e).__name__).inc()
+            raise
+
+        span.set_attribute("http.status_code", response.status_code)
+
+        if response.status_code >= 400:
+            BOLNA_MAKE_CALL_LATENCY.labels("error").observe(time.perf_counter() - start)
+            BOLNA_MAKE_CALL_ERRORS.labels(f"http_{response.status_code // 100}xx").inc()
+            raise Exception(f"Bolna error: {response.text}")
+
+        BOLNA_MAKE_CALL_LATENCY.labels("ok").observe(time.perf_counter() - start)
+
+        try:
+            data = response.json()
+        except ValueError:
+            raise Exception(f"Bolna returned non-JSON response: {response.text}")
+
+        call_id = _extract_call_id(data)
+
+        if not call_id:
+            raise Exception(f"Bolna did not return call_id. Response: {response.text}")
+
+        span.set_attribute("call.id", str(call_id))
 
     # Update Lead with external_call_id
     # db.get() is correct for sync Session — this was the core bug
@@ -149,19 +220,23 @@ def make_call(
     if lead:
         lead.external_call_id = call_id
 
-    # Create CallLog immediately so webhook can find it by call_id
-    call_log = CallLog(
-        external_call_id=call_id,
-        campaign_id=campaign_id,
-        lead_id=lead_id,
-        user_number=phone,
-        status="initiated",
-        created_at=datetime.utcnow(),
-        executed_at=datetime.utcnow(),
-    )
+    # Create CallLog immediately so webhook can find it by call_id —
+    # unless a fast webhook already created it (both hold call_log_lock)
+    db.execute(call_log_lock(call_id))
+    exists = db.scalar(select(CallLog.id).where(CallLog.external_call_id == call_id).limit(1))
+    if exists is None:
+        call_log = CallLog(
+            external_call_id=call_id,
+            campaign_id=campaign_id,
+            lead_id=lead_id,
+            user_number=phone,
+            status="initiated",
+            created_at=datetime.utcnow(),
+            executed_at=datetime.utcnow(),
+        )
 
-    db.add(call_log)
-    db.flush()   # INSERT immediately, within same transaction
+        db.add(call_log)
+        db.flush()   # INSERT immediately, within same transaction
     db.commit()  # commit so webhook can read this row from its own session
 
     return data
\ No newline at end of file
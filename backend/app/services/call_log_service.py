@@ -0,0 +1,102 @@
+"""
+app/services/call_log_service.py
+
+Call log listing for GET /campaigns/{id}/logs: newest first, keyset
+(cursor) pagination and column projection.
+
+The cursor is the (created_at, id) of the last row of a page, base64url
+encoded. The next page is WHERE (created_at, id) < cursor, which
+ix_call_logs_campaign_created answers with an index range scan per
+partition — no OFFSET, so page 1000 costs the same as page 1.
+
+Only the columns asked for are selected, so a listing of ids and statuses
+never reads recording URLs or other wide columns.
+"""
+
+import base64
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.call_logs import CallLog
+from app.schemas.call_logs import CallLogItem, CallLogPage
+
+FIELDS = tuple(CallLogItem.model_fields)
+
+
+def encode_cursor(created_at: datetime, log_id) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{log_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, log_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(log_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_fields(fields: str | None) -> list[str]:
+    """?fields=id,status,duration → column names; None → every field."""
+    if not fields:
+        return list(FIELDS)
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [n for n in names if n not in FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(FIELDS)}",
+        )
+    return names
+
+
+async def list_call_logs(
+    db: AsyncSession,
+    campaign_id,
+    *,
+    fields: list[str],
+    cursor: str | None = None,
+    limit: int = 100,
+    status: str | None = None,
+    customer_sentiment: str | None = None,
+    interest_level: str | None = None,
+    appointment_booked: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> CallLogPage:
+    # created_at / id always come back for the cursor, even when not projected
+    columns = list(dict.fromkeys(["created_at", "id", *fields]))
+    stmt = select(*(getattr(CallLog, name) for name in columns)).where(CallLog.campaign_id == campaign_id)
+
+    if status:
+        stmt = stmt.where(CallLog.status == status)
+    if customer_sentiment:
+        stmt = stmt.where(CallLog.customer_sentiment == customer_sentiment)
+    if interest_level:
+        stmt = stmt.where(CallLog.interest_level == interest_level)
+    if appointment_booked is not None:
+        stmt = stmt.where(CallLog.appointment_booked.is_(appointment_booked))
+    # created_at bounds also prune call_logs partitions
+    if created_from:
+        stmt = stmt.where(CallLog.created_at >= created_from)
+    if created_to:
+        stmt = stmt.where(CallLog.created_at < created_to)
+    if cursor:
+        stmt = stmt.where(tuple_(CallLog.created_at, CallLog.id) < decode_cursor(cursor))
+
+    stmt = stmt.order_by(CallLog.created_at.desc(), CallLog.id.desc()).limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    # Rows come straight from the database: build without re-validating; the
+    # fields set are exactly the projected ones, so only those are serialized
+    items = [CallLogItem.model_construct(**{name: row._mapping[name] for name in fields}) for row in rows]
+    return CallLogPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,116 @@
+"""
+app/services/call_state.py
+
+Call-state machine for Bolna status events.
+
+Bolna retries deliveries and does not guarantee order, so an event is only
+applied if it moves the call forward:
+
+    queued / initiated → ringing → in-progress → call-disconnected → final
+    final = completed | no-answer | busy | failed | canceled | error | …
+
+A final status is never left once reached (call-disconnected is the one
+exception: "completed", carrying the transcript, follows it).
+
+Before any DB work, claim_event() checks and records the event in Redis with
+one Lua call:
+  webhook:seen:{call_id}:{status}   SET NX — the same (call, status) twice is a duplicate
+  call:state:{call_id}              highest rank applied so far — lower ranks are stale
+If applying the event then fails, release_event() undoes both so Bolna's
+retry is not mistaken for a duplicate. The CallLog row keeps the same rule
+(is_forward) in case the Redis keys were lost.
+
+call_logs is partitioned, so Postgres cannot keep external_call_id unique on
+its own. Every path that looks a CallLog up by call id and may insert one
+(make_call, the webhook) first takes call_log_lock() — a transaction-scoped
+advisory lock on the call id — so the second writer sees the first's row.
+"""
+from sqlalchemy import func, select
+
+SEEN_KEY  = "webhook:seen:{}:{}"
+STATE_KEY = "call:state:{}"
+TTL_SECONDS = 2 * 24 * 3600
+
+# Higher rank = further along. Statuses not listed rank 0 and are only
+# applied to a call nothing is known about yet.
+RANK = {
+    "queued": 1,
+    "initiated": 1,
+    "ringing": 2,
+    "in-progress": 3,
+    "call-disconnected": 4,
+    "completed": 5,
+    "no-answer": 5,
+    "busy": 5,
+    "failed": 5,
+    "canceled": 5,
+    "error": 5,
+    "stopped": 5,
+    "balance-low": 5,
+}
+FINAL_RANK = 5
+
+# Returns {verdict, previous rank}; verdict is apply | duplicate | stale
+_CLAIM_LUA = """
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if redis.call('SET', KEYS[1], '1', 'NX', 'EX', ARGV[2]) == false then
+    return {'duplicate', previous}
+end
+local rank = tonumber(ARGV[1])
+if (rank == 0 and previous > 0) or (rank > 0 and rank <= previous) then
+    return {'stale', previous}
+end
+if rank > previous then
+    redis.call('SET', KEYS[2], rank, 'EX', ARGV[2])
+end
+return {'apply', previous}
+"""
+
+# Only roll the state back if no later event has moved it since
+_RELEASE_LUA = """
+redis.call('DEL', KEYS[1])
+if tonumber(redis.call('GET', KEYS[2]) or '0') == tonumber(ARGV[1]) then
+    if tonumber(ARGV[2]) > 0 then
+        redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+    else
+        redis.call('DEL', KEYS[2])
+    end
+end
+return 1
+"""
+
+
+def call_log_lock(call_id: str):
+    """SELECT taking a transaction-scoped advisory lock on one call id — execute it before the lookup."""
+    return select(func.pg_advisory_xact_lock(func.hashtext(str(call_id))))
+
+
+def rank(status: str | None) -> int:
+    return RANK.get((status or "").lower(), 0)
+
+
+def is_forward(current: str | None, new: str | None) -> bool:
+    """Whether `new` may replace `current` on a call."""
+    if not current:
+        return True
+    if rank(new) == 0:
+        return False
+    return rank(new) > rank(current)
+
+
+async def claim_event(redis, call_id: str, status: str | None) -> tuple[str, int]:
+    """Returns (verdict, previous rank); verdict is "apply", "duplicate" or "stale"."""
+    verdict, previous = await redis.eval(
+        _CLAIM_LUA, 2,
+        SEEN_KEY.format(call_id, (status or "").lower()), STATE_KEY.format(call_id),
+        rank(status), TTL_SECONDS,
+    )
+    return (verdict.decode() if isinstance(verdict, bytes) else verdict), int(previous)
+
+
+async def release_event(redis, call_id: str, status: str | None, previous: int) -> None:
+    await redis.eval(
+        _RELEASE_LUA, 2,
+        SEEN_KEY.format(call_id, (status or "").lower()), STATE_KEY.format(call_id),
+        rank(status), previous, TTL_SECONDS,
+    )
@@ -0,0 +1,203 @@
+"""
+app/services/campaign_events.py
+
+Live campaign progress for GET /campaigns/{id}/events (SSE) and the
+/campaigns/{id}/events/ws WebSocket, so the frontend stops polling lead
+status and analytics.
+
+Publishers — best effort, a failed publish never fails a dial or a webhook:
+  dispatcher (app/tasks/campaign_tasks.py)   lead status changes, campaign completed
+  webhook    (app/services/webhook_service.py) lead status, finished calls, wallet balance
+
+Each event is one JSON message on campaign:events:{campaign_id}:
+  {"type": "leads",    "leads": {lead_id: status, …}}
+  {"type": "call",     "call_log_id": …, "lead_id": …, "status": …, "duration": …, "cost": …}
+  {"type": "wallet",   "minutes_balance": …}
+  {"type": "campaign", "status": …}
+
+Each API worker holds ONE pub/sub connection (CampaignEventHub, started in the
+lifespan, pattern-subscribed to every campaign) and fans messages out to its
+local clients, so open tabs cost no Redis connections. Per client, bursts are
+coalesced: after the first event the stream waits
+CAMPAIGN_EVENTS_COALESCE_SECONDS, then sends one batch —
+  {"leads": {id: latest status}, "calls": […], "wallet": {…}, "campaign": {…}}
+A client that falls CAMPAIGN_EVENTS_QUEUE_SIZE events behind gets
+"resync": true and should refetch over REST.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "campaign:events:{}"
+PATTERN = "campaign:events:*"
+_MAX_CALLS_PER_BATCH = 200
+
+
+def _message(campaign_id, event_type: str, data: dict) -> tuple[str, str]:
+    return CHANNEL.format(campaign_id), json.dumps({"type": event_type, **data}, default=str)
+
+
+# ─── Publish ──────────────────────────────────────────────────────────────
+
+def publish(redis, campaign_id, event_type: str, **data) -> None:
+    """Sync (Celery workers)."""
+    try:
+        redis.publish(*_message(campaign_id, event_type, data))
+    except Exception as e:
+        log.warning(f"Campaign event not published ({type(e).__name__}: {e})")
+
+
+async def apublish(redis, campaign_id, event_type: str, **data) -> None:
+    try:
+        await redis.publish(*_message(campaign_id, event_type, data))
+    except Exception as e:
+        log.warning(f"Campaign event not published ({type(e).__name__}: {e})")
+
+
+# ─── Coalescing ───────────────────────────────────────────────────────────
+
+class EventBatch:
+    """Merges a burst of events: latest status per lead, latest wallet / campaign, calls in order."""
+
+    def __init__(self):
+        self.leads: dict[str, str] = {}
+        self.calls: list[dict] = []
+        self.wallet: dict | None = None
+        self.campaign: dict | None = None
+        self.resync = False
+
+    def add(self, event: dict) -> None:
+        event_type = event.pop("type", None)
+        if event_type == "leads":
+            self.leads.update(event.get("leads") or {})
+        elif event_type == "call":
+            if len(self.calls) < _MAX_CALLS_PER_BATCH:
+                self.calls.append(event)
+            else:
+                self.resync = True
+        elif event_type == "wallet":
+            self.wallet = event
+        elif event_type == "campaign":
+            self.campaign = event
+
+    def to_dict(self) -> dict:
+        batch = {"leads": self.leads, "calls": self.calls, "wallet": self.wallet, "campaign": self.campaign}
+        batch = {key: value for key, value in batch.items() if value}
+        if self.resync:
+            batch["resync"] = True
+        return batch
+
+
+class _Subscriber:
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CAMPAIGN_EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+# ─── Hub ──────────────────────────────────────────────────────────────────
+
+class CampaignEventHub:
+    """One pub/sub connection per process, fanned out to local subscribers by campaign."""
+
+    def __init__(self):
+        self._subscribers: dict[str, set[_Subscriber]] = {}
+        self._task: asyncio.Task | None = None
+
+    def dispatch(self, channel: str, data: str | bytes) -> None:
+        campaign_id = channel.rsplit(":", 1)[-1]
+        subscribers = self._subscribers.get(campaign_id)
+        if not subscribers:
+            return
+        event = json.loads(data)
+        for subscriber in subscribers:
+            subscriber.put(dict(event))
+
+    async def _run(self, redis) -> None:
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(PATTERN)
+                while True:
+                    msg = await pubsub.get_message(timeout=1.0)
+                    if msg and msg.get("type") == "pmessage":
+                        channel = msg["channel"]
+                        self.dispatch(channel.decode() if isinstance(channel, bytes) else channel, msg["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Events published while disconnected are lost — tell every client to resync
+                log.warning(f"Campaign event stream lost ({type(e).__name__}: {e}) — retrying")
+                for subscribers in self._subscribers.values():
+                    for subscriber in subscribers:
+                        subscriber.overflowed = True
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def start(self, redis) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(redis))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def stream(self, campaign_id) -> AsyncIterator[dict | None]:
+        """Coalesced batches for one client; None when idle for a heartbeat interval."""
+        key = str(campaign_id)
+        subscriber = _Subscriber()
+        self._subscribers.setdefault(key, set()).add(subscriber)
+        try:
+            while True:
+                try:
+                    first = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=settings.CAMPAIGN_EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if subscriber.overflowed:
+                        subscriber.overflowed = False
+                        yield {"resync": True}
+                    else:
+                        yield None
+                    continue
+
+                # Let the rest of the burst arrive, then send it as one batch
+                await asyncio.sleep(settings.CAMPAIGN_EVENTS_COALESCE_SECONDS)
+                batch = EventBatch()
+                batch.add(first)
+                while not subscriber.queue.empty():
+                    batch.add(subscriber.queue.get_nowait())
+                if subscriber.overflowed:
+                    subscriber.overflowed = False
+                    batch.resync = True
+                yield batch.to_dict()
+        finally:
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[key]
+
+
+campaign_events = CampaignEventHub()
@@ -0,0 +1,95 @@
+"""
+app/services/campaign_lease.py
+
+Redis lease that says which dispatcher tick chain owns a running campaign.
+
+    campaign:lease:{id}  →  hash {token, owner, acquired_at, heartbeat_at}, with TTL
+
+The token is per tick, not per chain: it names the one tick allowed to run
+next. A tick claims with its own token and atomically swaps in a fresh one
+(claim_lease(..., next_token=)) — once when it starts, and again when it hands
+off to the next tick, whose message carries the new token. A redelivered or
+duplicated tick message still carries a token the lease has moved past, so it
+can never start a second chain.
+
+Every tick — and every dial within a tick — renews the lease for (time until
+the next tick + CAMPAIGN_LEASE_TTL_SECONDS). If the worker is SIGKILLed or
+OOM-killed the lease simply expires, and the beat fan-out
+(fan_out_campaign_ticks) seeds a new chain that claims it — no flag left stuck
+in the database.
+"""
+
+import os
+import socket
+import time
+
+from app.core.config import settings
+
+LEASE_KEY = "campaign:lease:{}"
+
+# Claim if free or held by ARGV[1], move the token to ARGV[5], then refresh
+# owner / heartbeat / TTL — compare, advance and renew in one step.
+_CLAIM_LUA = """
+local cur = redis.call('HGET', KEYS[1], 'token')
+if cur and cur ~= ARGV[1] then
+    return 0
+end
+if not cur then
+    redis.call('HSET', KEYS[1], 'acquired_at', ARGV[4])
+end
+redis.call('HSET', KEYS[1], 'token', ARGV[5], 'owner', ARGV[3], 'heartbeat_at', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+_RELEASE_LUA = """
+if redis.call('HGET', KEYS[1], 'token') == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SYNC — used by Celery tasks only
+# ─────────────────────────────────────────────────────────────────────────────
+
+def claim_lease(redis, campaign_id, token: str, hold_seconds: float = 0, next_token: str | None = None) -> bool:
+    """Acquire or renew, moving the token to `next_token` if given.
+
+    False means the lease is held under another token — another chain owns the
+    campaign, or this tick's token was already used.
+    """
+    ttl = int(hold_seconds) + settings.CAMPAIGN_LEASE_TTL_SECONDS
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    return bool(redis.eval(
+        _CLAIM_LUA, 1, LEASE_KEY.format(campaign_id),
+        token, ttl, owner, f"{time.time():.3f}", next_token or token,
+    ))
+
+
+def release_lease(redis, campaign_id, token: str) -> None:
+    redis.eval(_RELEASE_LUA, 1, LEASE_KEY.format(campaign_id), token)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ASYNC — used by FastAPI routes
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def get_lease_status(redis, campaign_id) -> dict:
+    key = LEASE_KEY.format(campaign_id)
+    pipe = redis.pipeline(transaction=False)
+    pipe.hgetall(key)
+    pipe.ttl(key)
+    fields, ttl = await pipe.execute()
+
+    if not fields:
+        return {"held": False, "owner": None, "acquired_at": None, "heartbeat_at": None, "expires_in": None}
+
+    fields = {k.decode(): v.decode() for k, v in fields.items()}
+    return {
+        "held":         True,
+        "owner":        fields.get("owner"),
+        "acquired_at":  float(fields["acquired_at"]) if "acquired_at" in fields else None,
+        "heartbeat_at": float(fields["heartbeat_at"]) if "heartbeat_at" in fields else None,
+        "expires_in":   ttl if ttl >= 0 else None,
+    }
@@ -0,0 +1,132 @@
+"""
+app/services/campaign_scheduler.py
+
+Campaign start times and calling-hours windows.
+
+A campaign may have:
+  scheduled_at     — UTC start time; start_campaign parks it as "scheduled"
+  calling_windows  — [{"days": ["mon", …, "fri"], "start": "09:00", "end": "18:00"}, …]
+                     local wall-clock windows; empty / NULL means any time
+
+Windows are evaluated in the organization's timezone, unless a lead carries
+its own in custom_fields["timezone"] (an IANA name such as "Asia/Kolkata").
+
+Wake-ups live in one Redis ZSET, campaign:wakeups (member = campaign id,
+score = unix time the campaign next becomes dialable). The scheduler worker
+(app/tasks/scheduler_worker.py) sleeps until the earliest score and enqueues a
+dispatcher tick then — nothing polls the database while a campaign waits.
+Pausing, stopping or deleting a campaign cancels its wake-up (acancel_wakeup).
+"""
+
+from datetime import datetime, time as dtime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.services.campaign_lease import LEASE_KEY
+
+WAKEUP_KEY     = "campaign:wakeups"
+WAKEUP_CHANNEL = "campaign:wakeups:changed"   # published when a new wake-up is added
+
+# A parked chain holds the lease until its wake-up; with the wake-up gone no
+# tick will ever release it, so drop it too — but only if the wake-up was
+# still pending, i.e. the chain is parked and not mid-tick.
+_CANCEL_LUA = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 1 then
+    redis.call('DEL', KEYS[2])
+    return 1
+end
+return 0
+"""
+
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+_zones: dict[str, ZoneInfo] = {}
+
+
+def get_zone(name: str | None, fallback: str = "UTC") -> ZoneInfo:
+    """ZoneInfo for an IANA name, falling back to `fallback` for unknown names."""
+    for candidate in (name, fallback, "UTC"):
+        if not candidate:
+            continue
+        if candidate not in _zones:
+            try:
+                _zones[candidate] = ZoneInfo(candidate)
+            except (ZoneInfoNotFoundError, ValueError):
+                continue
+        return _zones[candidate]
+    return ZoneInfo("UTC")
+
+
+def _parse_hhmm(value: str) -> dtime:
+    hours, minutes = value.split(":")
+    return dtime(int(hours), int(minutes))
+
+
+def _windows_for(windows: list[dict], weekday: int) -> list[tuple[dtime, dtime]]:
+    day = DAYS[weekday]
+    return [
+        (_parse_hhmm(w["start"]), _parse_hhmm(w["end"]))
+        for w in windows
+        if day in (w.get("days") or DAYS)
+    ]
+
+
+def _to_local(at_utc: datetime, zone: ZoneInfo) -> datetime:
+    return at_utc.replace(tzinfo=timezone.utc).astimezone(zone)
+
+
+def is_open(windows: list[dict] | None, zone: ZoneInfo, at_utc: datetime) -> bool:
+    """True if naive-UTC `at_utc` falls inside any window in `zone`."""
+    if not windows:
+        return True
+    local = _to_local(at_utc, zone)
+    now = local.time()
+    return any(start <= now < end for start, end in _windows_for(windows, local.weekday()))
+
+
+def next_open(windows: list[dict] | None, zone: ZoneInfo, after_utc: datetime) -> datetime | None:
+    """Earliest naive-UTC instant ≥ after_utc inside a window, or None if there are none."""
+    if is_open(windows, zone, after_utc):
+        return after_utc
+
+    local = _to_local(after_utc, zone)
+    for offset in range(8):
+        day = (local + timedelta(days=offset)).date()
+        starts = sorted(start for start, _ in _windows_for(windows, day.weekday()))
+        for start in starts:
+            candidate = datetime.combine(day, start, tzinfo=zone)
+            if candidate > local:
+                return candidate.astimezone(timezone.utc).replace(tzinfo=None)
+    return None
+
+
+def _score(when_utc: datetime) -> float:
+    return when_utc.replace(tzinfo=timezone.utc).timestamp()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SYNC — used by Celery tasks
+# ─────────────────────────────────────────────────────────────────────────────
+
+def schedule_wakeup(redis, campaign_id, when_utc: datetime) -> None:
+    pipe = redis.pipeline()
+    pipe.zadd(WAKEUP_KEY, {str(campaign_id): _score(when_utc)})
+    pipe.publish(WAKEUP_CHANNEL, str(campaign_id))
+    pipe.execute()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ASYNC — used by FastAPI routes
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def aschedule_wakeup(redis, campaign_id, when_utc: datetime) -> None:
+    pipe = redis.pipeline()
+    pipe.zadd(WAKEUP_KEY, {str(campaign_id): _score(when_utc)})
+    pipe.publish(WAKEUP_CHANNEL, str(campaign_id))
+    await pipe.execute()
+
+
+async def acancel_wakeup(redis, campaign_id) -> bool:
+    """Drop a parked campaign's wake-up and lease. False if it had no wake-up pending."""
+    return bool(await redis.eval(
+        _CANCEL_LUA, 2, WAKEUP_KEY, LEASE_KEY.format(campaign_id), str(campaign_id),
+    ))
@@ -4,7 +4,9 @@ from sqlalchemy import select
 from datetime import datetime
 from uuid import UUID
 
+from app.db.session import get_redis_pool
 from app.models.campaigns import Campaign, CampaignStatus
+from app.services.campaign_scheduler import acancel_wakeup, aschedule_wakeup
 from app.tasks.campaign_tasks import process_campaign
 
 
@@ -27,12 +29,20 @@ async def start_campaign(db: AsyncSession, campaign_id: UUID):
     if campaign.status not in [CampaignStatus.draft, CampaignStatus.paused, CampaignStatus.completed]:
         raise HTTPException(400, "Cannot start campaign from this state")
 
-    if campaign.is_processing:
-        raise HTTPException(400, "Campaign already processing")
+    now = datetime.utcnow()
+
+    # Future start time → park it; the scheduler worker starts it on time
+    if campaign.scheduled_at and campaign.scheduled_at > now:
+        campaign.status = CampaignStatus.scheduled
+        campaign.updated_at = now
+        await db.commit()
+        await db.refresh(campaign)
+
+        await aschedule_wakeup(await get_redis_pool(), campaign.id, campaign.scheduled_at)
+        return campaign
 
     campaign.status = CampaignStatus.running
-    campaign.is_processing = True
-    campaign.updated_at = datetime.utcnow()
+    campaign.updated_at = now
 
     await db.commit()
     await db.refresh(campaign)
@@ -61,6 +71,9 @@ async def pause_campaign(db: AsyncSession, campaign_id: UUID):
     await db.commit()
     await db.refresh(campaign)
 
+    # A chain parked outside its calling window must not wake up again
+    await acancel_wakeup(await get_redis_pool(), campaign.id)
+
     return campaign
 
 
@@ -80,7 +93,11 @@ async def resume_campaign(db: AsyncSession, campaign_id: UUID):
     await db.commit()
     await db.refresh(campaign)
 
-    process_campaign.delay(str(campaign.id))
+    # If the pre-pause chain still holds the lease it carries on and this one exits
+    process_campaign.apply_async(
+        args=[str(campaign.id)],
+        queue="campaign_queue"
+    )
 
     return campaign
 
@@ -101,4 +118,7 @@ async def stop_campaign(db: AsyncSession, campaign_id: UUID):
     await db.commit()
     await db.refresh(campaign)
 
+    # Scheduled or parked campaigns would otherwise still be woken
+    await acancel_wakeup(await get_redis_pool(), campaign.id)
+
     return campaign
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+app/services/fair_share.py
+
+Weighted fair sharing of dial slots across organizations — deficit round robin.
+
+Every dispatcher round has a global budget of dial slots. Each organization
+with due campaigns earns budget × weight / Σweights credit (its "deficit"),
+and spends one credit per slot, handed round-robin to its due campaigns up to
+each campaign's per-tick cap. Fractional credit carries to the next round, so
+low-weight orgs still get their share over time. An org whose campaigns could
+not use all their credit is reset to zero, as in classic DRR, so idle orgs
+can't bank credit for a later burst. Slots left over after everyone spent
+their credit go, uncharged, to orgs that still have work.
+
+Result: a tenant with one small campaign is served every round no matter how
+many campaigns a large tenant has queued, while the large tenant still
+absorbs every slot nobody else needs.
+
+Weights come from the organization tier (settings.DISPATCH_TIER_WEIGHTS).
+"""
+
+import time
+from collections import deque
+
+from app.core.config import settings
+
+PENDING_KEY = "dispatch:pending"     # ZSET campaign id → unix time it may dial again
+META_KEY    = "dispatch:meta"        # HASH campaign id → "org_id|tier|max_slots"
+
+
+class DeficitRoundRobin:
+
+    def __init__(self):
+        self.deficit: dict[str, float] = {}
+        self._orgs: deque[str] = deque()
+        self._cursor: dict[str, int] = {}
+
+    def allocate(
+        self,
+        ready: dict[str, list[tuple[str, int]]],
+        weights: dict[str, float],
+        budget: int,
+    ) -> dict[str, int]:
+        """
+        ready   — org id → [(campaign id, max slots this round), …]
+        weights — org id → weight (missing → 1)
+        Returns campaign id → slots granted.
+        """
+        # Forget orgs with nothing due; add newcomers at the back
+        for org in list(self.deficit):
+            if org not in ready:
+                del self.deficit[org]
+                self._cursor.pop(org, None)
+        self._orgs = deque(o for o in self._orgs if o in ready)
+        self._orgs.extend(o for o in ready if o not in self._orgs)
+
+        if not ready or budget <= 0:
+            return {}
+
+        total_weight = sum(weights.get(o, 1.0) for o in ready) or 1.0
+        for org in self._orgs:
+            self.deficit[org] = self.deficit.get(org, 0.0) + budget * weights.get(org, 1.0) / total_weight
+
+        grants: dict[str, int] = {}
+        remaining = {org: {cid: cap for cid, cap in campaigns} for org, campaigns in ready.items()}
+
+        def hand_out(charge: bool) -> None:
+            nonlocal budget
+            progress = True
+            while budget > 0 and progress:
+                progress = False
+                for org in self._orgs:
+                    if budget <= 0:
+                        break
+                    open_campaigns = [cid for cid, cap in ready[org] if remaining[org][cid] > 0]
+                    if not open_campaigns or (charge and self.deficit[org] < 1):
+                        continue
+                    cid = open_campaigns[self._cursor.get(org, 0) % len(open_campaigns)]
+                    self._cursor[org] = self._cursor.get(org, 0) + 1
+                    grants[cid] = grants.get(cid, 0) + 1
+                    remaining[org][cid] -= 1
+                    if charge:
+                        self.deficit[org] -= 1
+                    budget -= 1
+                    progress = True
+
+        hand_out(charge=True)
+        # Work-conserving: slots other orgs could not use go to whoever still has work
+        hand_out(charge=False)
+
+        # Classic DRR: an org that ran out of work doesn't keep its credit
+        for org in self._orgs:
+            if not any(remaining[org].values()):
+                self.deficit[org] = 0.0
+
+        self._orgs.rotate(-1)
+        return grants
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SYNC — used by Celery tasks
+# ─────────────────────────────────────────────────────────────────────────────
+
+def request_slots(redis, campaign_id, organization_id, tier: str, max_slots: int, delay_seconds: float = 0) -> None:
+    """Queue a campaign for dial slots once `delay_seconds` have passed."""
+    pipe = redis.pipeline()
+    pipe.hset(META_KEY, str(campaign_id), f"{organization_id}|{tier}|{max_slots}")
+    pipe.zadd(PENDING_KEY, {str(campaign_id): time.time() + max(delay_seconds, 0)})
+    pipe.execute()
+
+
+def tier_weight(tier: str | None) -> float:
+    return float(settings.DISPATCH_TIER_WEIGHTS.get(tier or "", 1.0))
@@ -0,0 +1,64 @@
+"""
+app/services/retry_policy.py
+
+When a failed or unanswered lead may be dialed again.
+
+Campaign.retry_policy (falls back to settings.RETRY_DEFAULT_POLICY):
+
+  {"type": "fixed",       "delay_seconds": 900}
+  {"type": "exponential", "base_seconds": 600, "factor": 2, "max_seconds": 21600}
+  {"type": "time_of_day", "slots": ["10:00", "14:00", "18:30"], "min_delay_seconds": 3600}
+      → the first local slot at least min_delay_seconds away, so repeated
+        attempts land at different times of day
+
+The result is pushed into the campaign's next calling window, if it has
+windows. The dispatcher only claims leads whose next_attempt_at has passed.
+"""
+
+from datetime import datetime, timedelta, time as dtime, timezone
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.services.campaign_scheduler import next_open
+
+POLICY_TYPES = ("fixed", "exponential", "time_of_day")
+
+
+def _next_slot(slots: list[str], zone: ZoneInfo, earliest_utc: datetime) -> datetime:
+    local = earliest_utc.replace(tzinfo=timezone.utc).astimezone(zone)
+    times = sorted(dtime(int(s[:2]), int(s[3:5])) for s in slots)
+    for offset in range(2):
+        day = (local + timedelta(days=offset)).date()
+        for t in times:
+            candidate = datetime.combine(day, t, tzinfo=zone)
+            if candidate >= local:
+                return candidate.astimezone(timezone.utc).replace(tzinfo=None)
+    return earliest_utc
+
+
+def retry_at(
+    policy: dict | None,
+    attempt: int,
+    now: datetime,
+    zone: ZoneInfo | None = None,
+    windows: list[dict] | None = None,
+) -> datetime:
+    """Naive-UTC time of the next attempt after failed attempt number `attempt` (1-based)."""
+    policy = policy or settings.RETRY_DEFAULT_POLICY
+    zone = zone or ZoneInfo("UTC")
+    kind = policy.get("type", "exponential")
+
+    if kind == "fixed":
+        at = now + timedelta(seconds=policy.get("delay_seconds", 900))
+    elif kind == "exponential":
+        delay = policy.get("base_seconds", 600) * policy.get("factor", 2) ** max(attempt - 1, 0)
+        at = now + timedelta(seconds=min(delay, policy.get("max_seconds", 21600)))
+    elif kind == "time_of_day":
+        earliest = now + timedelta(seconds=policy.get("min_delay_seconds", 3600))
+        at = _next_slot(policy.get("slots") or [], zone, earliest) if policy.get("slots") else earliest
+    else:
+        raise ValueError(f"Unknown retry policy type: {kind}")
+
+    if windows:
+        at = next_open(windows, zone, at) or at
+    return at
@@ -0,0 +1,197 @@
+"""
+app/services/transcript_store.py
+
+Transcripts and summaries live in call_transcripts, zstd-compressed, not on
+call_logs. A transcript is several KB and only ever read one call at a time,
+so keeping it inline made every CallLog scan (campaign logs, admin, the
+webhook lookup) pull that text through the buffer cache.
+
+The webhook writes here (save_transcript) when an event carries a transcript
+or summary; readers call load_transcript only when one is asked for.
+
+Search: save_transcript also fills search_vector (summary weighted A,
+transcript B), which search_transcripts matches with websearch_to_tsquery —
+plain words, "quoted phrases", OR and -exclusions. The text search config is
+'simple': no stop words, so "not interested" keeps its "not", and no English
+stemming to mangle Hindi / Hinglish transcripts.
+
+Compression is pyarrow's zstd codec (pyarrow is already a dependency for the
+Parquet archive). Blobs are plain zstd frames; the uncompressed size is
+stored next to each one because the codec needs it to decompress.
+"""
+
+from datetime import datetime
+
+import pyarrow as pa
+from sqlalchemy import Text, bindparam, func, literal, literal_column, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.call_logs import CallLog
+from app.models.call_transcript import CallTranscript
+
+_codec = pa.Codec("zstd", compression_level=settings.TRANSCRIPT_ZSTD_LEVEL)
+
+SEARCH_CONFIG = "simple"
+_CONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+_EMPTY_VECTOR = literal_column("''::tsvector")
+
+
+def compress(text: str | None) -> tuple[bytes | None, int | None]:
+    """text → (zstd blob, uncompressed byte count); None stays None."""
+    if text is None:
+        return None, None
+    raw = text.encode("utf-8")
+    return _codec.compress(raw, asbytes=True), len(raw)
+
+
+def decompress(blob: bytes | None, size: int | None) -> str | None:
+    if blob is None:
+        return None
+    return _codec.decompress(blob, decompressed_size=size, asbytes=True).decode("utf-8")
+
+
+def compressed_columns(transcript: str | None, summary: str | None) -> dict:
+    """Column values for the parts that are present — a missing part is left as stored."""
+    values = {}
+    if transcript is not None:
+        values["transcript_zst"], values["transcript_bytes"] = compress(transcript)
+    if summary is not None:
+        values["summary_zst"], values["summary_bytes"] = compress(summary)
+    return values
+
+
+def _vector(part: str | None, weight: str):
+    return func.setweight(func.to_tsvector(_CONFIG, literal(part or "", Text)), literal_column(f"'{weight}'"))
+
+
+async def save_transcript(
+    db: AsyncSession,
+    call_log: CallLog,
+    transcript: str | None,
+    summary: str | None,
+    customer_sentiment: str | None = None,
+    interest_level: str | None = None,
+) -> None:
+    """Upsert the call's transcript / summary and its search vector. Does not commit."""
+    values = compressed_columns(transcript, summary)
+    if customer_sentiment is not None:
+        values["customer_sentiment"] = customer_sentiment
+    if interest_level is not None:
+        values["interest_level"] = interest_level
+    if not values:
+        return
+    values["updated_at"] = datetime.utcnow()
+
+    stmt = insert(CallTranscript).values(
+        call_log_id=call_log.id,
+        call_log_created_at=call_log.created_at,
+        campaign_id=call_log.campaign_id,
+        search_vector=_vector(summary, "A").op("||")(_vector(transcript, "B")),
+        **values,
+    )
+
+    # On conflict, replace only the lexemes of the part this event carries
+    update = dict(values)
+    stored = func.coalesce(CallTranscript.search_vector, _EMPTY_VECTOR)
+    if transcript is not None and summary is not None:
+        update["search_vector"] = stmt.excluded.search_vector
+    elif transcript is not None:
+        update["search_vector"] = func.ts_filter(stored, literal_column("'{a}'")).op("||")(stmt.excluded.search_vector)
+    elif summary is not None:
+        update["search_vector"] = stmt.excluded.search_vector.op("||")(func.ts_filter(stored, literal_column("'{b}'")))
+
+    await db.execute(stmt.on_conflict_do_update(index_elements=[CallTranscript.call_log_id], set_=update))
+
+
+async def load_transcript(db: AsyncSession, call_log_id, campaign_id=None) -> dict | None:
+    """Decompressed transcript and summary of one call, or None if nothing was stored."""
+    query = select(CallTranscript).where(CallTranscript.call_log_id == call_log_id)
+    if campaign_id is not None:
+        query = query.where(CallTranscript.campaign_id == campaign_id)
+    row = (await db.execute(query)).scalar_one_or_none()
+    if row is None:
+        return None
+
+    summary = decompress(row.summary_zst, row.summary_bytes)
+    return {
+        "call_log_id": row.call_log_id,
+        "transcript": decompress(row.transcript_zst, row.transcript_bytes),
+        "summary": summary,
+        "final_call_summary": summary,   # kept for clients of the old call_logs column
+    }
+
+
+async def search_transcripts(
+    db: AsyncSession,
+    campaign_id,
+    query: str,
+    *,
+    customer_sentiment: str | None = None,
+    interest_level: str | None = None,
+    offset: int = 0,
+    limit: int = 20,
+) -> tuple[list[dict], bool]:
+    """
+    Calls of a campaign whose transcript or summary matches `query`, best
+    match first, with highlighted fragments. Returns (results, has_more).
+    """
+    tsquery = func.websearch_to_tsquery(_CONFIG, query)
+    rank = func.ts_rank_cd(CallTranscript.search_vector, tsquery).label("rank")
+
+    stmt = select(
+        CallTranscript.call_log_id,
+        CallTranscript.call_log_created_at,
+        CallTranscript.customer_sentiment,
+        CallTranscript.interest_level,
+        CallTranscript.transcript_zst,
+        CallTranscript.transcript_bytes,
+        CallTranscript.summary_zst,
+        CallTranscript.summary_bytes,
+        rank,
+    ).where(
+        CallTranscript.campaign_id == campaign_id,
+        CallTranscript.search_vector.op("@@")(tsquery),
+    )
+    if customer_sentiment:
+        stmt = stmt.where(CallTranscript.customer_sentiment == customer_sentiment)
+    if interest_level:
+        stmt = stmt.where(CallTranscript.interest_level == interest_level)
+
+    # One extra row tells whether there is a next page, without a COUNT(*)
+    stmt = stmt.order_by(rank.desc(), CallTranscript.call_log_created_at.desc()).offset(offset).limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return [], False
+
+    # Highlight only the page: decompress here, let Postgres mark the matches
+    docs = []
+    for row in rows:
+        docs.append(decompress(row.transcript_zst, row.transcript_bytes) or "")
+        docs.append(decompress(row.summary_zst, row.summary_bytes) or "")
+    headlines = (await db.execute(
+        text(
+            f"SELECT ts_headline('{SEARCH_CONFIG}'::regconfig, d.doc, "
+            f"websearch_to_tsquery('{SEARCH_CONFIG}'::regconfig, :query), :options) "
+            "FROM unnest(:docs) WITH ORDINALITY AS d(doc, n) ORDER BY d.n"
+        ).bindparams(bindparam("docs", type_=ARRAY(Text))),
+        {"query": query, "options": _HEADLINE_OPTIONS, "docs": docs},
+    )).scalars().all()
+
+    results = [
+        {
+            "call_log_id": row.call_log_id,
+            "created_at": row.call_log_created_at,
+            "rank": round(row.rank, 4),
+            "customer_sentiment": row.customer_sentiment,
+            "interest_level": row.interest_level,
+            "transcript_highlight": headlines[2 * i] or None,
+            "summary_highlight": headlines[2 * i + 1] or None,
+        }
+        for i, row in enumerate(rows)
+    ]
+    return results, has_more
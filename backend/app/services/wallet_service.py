@@ -1,7 +1,9 @@
 import math
+import time
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.metrics import WALLET_DEBIT_LATENCY
 from app.models.wallet import Wallet, WalletTransaction, TransactionType
 
 logger = logging.getLogger(__name__)
@@ -88,6 +90,7 @@ async def deduct_minutes_for_call(
     call_log_id: str,
     db: AsyncSession
 ) -> dict:
+    start = time.perf_counter()
     wallet = await get_or_create_wallet(organization_id, db)
 
     if duration_seconds <= 0:
@@ -116,6 +119,9 @@ async def deduct_minutes_for_call(
         )
     )
     db.add(transaction)
+    # Flush so the timing covers the wallet UPDATE and the transaction INSERT
+    await db.flush()
+    WALLET_DEBIT_LATENCY.observe(time.perf_counter() - start)
 
     logger.warning(
         f"Wallet debited | Org: {organization_id} | "
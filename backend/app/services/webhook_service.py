@@ -0,0 +1,370 @@
+"""
+app/services/webhook_service.py
+
+Applies one Bolna call event (webhook body or execution record) to the
+database: CallLog upsert, transcript (app/services/transcript_store.py), lead
+status and the once-per-call wallet debit.
+
+Used by the /bolna/webhook endpoint and by the stuck-call reaper
+(app/tasks/reaper_tasks.py), so both paths behave identically.
+
+After the commit, lead status, finished calls and the wallet balance are
+published for live campaign streams (app/services/campaign_events.py).
+
+Events only move a call forward (app/services/call_state.py): duplicates and
+late lower-rank statuses are dropped, and a CallLog update only writes the
+fields the event actually carries.
+"""
+
+import logging
+from datetime import datetime
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from app.core.metrics import observe_event_lag
+from app.core.tracing import start_span
+from app.models.call_logs import CallLog
+from app.models.lead import Lead, LeadStatus
+from app.models.campaigns import Campaign
+from app.models.organization import Organization
+from app.models.wallet import WalletTransaction
+from app.schemas.webhook import BolnaCallEvent, BolnaWebhook
+from app.services.call_state import FINAL_RANK, call_log_lock, claim_event, is_forward, rank, release_event
+from app.services.campaign_events import apublish
+from app.services.campaign_scheduler import get_zone
+from app.services.retry_policy import retry_at
+from app.services.transcript_store import save_transcript
+from app.services.wallet_service import deduct_minutes_for_call
+
+logger = logging.getLogger(__name__)
+
+
+async def process_bolna_event(db: AsyncSession, payload: bytes | dict, redis=None) -> dict:
+    """
+    Apply one event — the raw webhook body, or an execution record dict.
+    With `redis`, duplicates and stale (out-of-order) events are dropped up
+    front — see app/services/call_state.py.
+    """
+    try:
+        event_type, event = BolnaWebhook.decode(payload)
+    except ValidationError as e:
+        logger.warning(f"Invalid Bolna payload: {e.error_count()} error(s)")
+        raise HTTPException(status_code=400, detail="Invalid payload")
+
+    if event_type and not event_type.startswith("call"):
+        return {"status": "ignored", "reason": f"event {event_type} not processed"}
+
+    # -------------------------
+    # Extract Call ID
+    # -------------------------
+
+    call_id = event.external_id
+    status_value = event.status
+
+    if not call_id:
+        logger.warning("Missing call_id")
+        return {"status": "ignored", "reason": "missing_call_id"}
+
+    # Duplicate deliveries and out-of-order events stop here, before any DB work
+    if redis is not None:
+        verdict, previous_rank = await claim_event(redis, call_id, status_value)
+        if verdict != "apply":
+            logger.info(f"Webhook {verdict}: {call_id} {status_value}")
+            return {"status": "ignored", "reason": verdict}
+
+    try:
+        return await _apply_event(db, event, call_id, status_value, redis)
+    except Exception:
+        if redis is not None:
+            await release_event(redis, call_id, status_value, previous_rank)
+        raise
+
+
+async def _apply_event(db: AsyncSession, event: BolnaCallEvent, call_id: str, status_value, redis=None) -> dict:
+    # -------------------------
+    # Extract Phone
+    # -------------------------
+
+    user_number = event.phone
+
+    metadata = event.metadata or {}
+
+    lead_id = metadata.get("lead_id")
+    campaign_id = metadata.get("campaign_id")
+
+    lead_obj = None
+
+    # -------------------------
+    # Lead Lookup Strategy
+    # -------------------------
+
+    if lead_id:
+        lead_obj = await db.get(Lead, lead_id)
+
+    if not lead_obj:
+        result = await db.execute(
+            select(Lead).where(Lead.external_call_id == call_id)
+        )
+        lead_obj = result.scalar_one_or_none()
+
+    if not lead_obj and user_number:
+
+        clean_phone = user_number.lstrip("+").replace(" ", "").replace("-", "")
+
+        if clean_phone.startswith("91") and len(clean_phone) > 10:
+            local_phone = clean_phone[2:]
+        else:
+            local_phone = clean_phone
+
+        phone_variants = [local_phone, clean_phone, user_number]
+
+        for phone_variant in phone_variants:
+
+            result = await db.execute(
+                select(Lead).where(Lead.phone == phone_variant)
+            )
+
+            lead_obj = result.scalars().first()
+
+            if lead_obj:
+                logger.info(
+                    "Lead resolved via phone",
+                    extra={
+                        "phone_variant": phone_variant,
+                        "lead_id": lead_obj.id,
+                    },
+                )
+                break
+
+    if lead_obj and not lead_id:
+        lead_id = str(lead_obj.id)
+
+    if lead_obj and not campaign_id:
+        campaign_id = str(lead_obj.campaign_id)
+
+    # -------------------------
+    # Duration / cost — normalized by the schema (junk → 0)
+    # -------------------------
+
+    duration = event.duration
+    cost = event.cost
+    appointment_date = event.appointment_date
+
+    # -------------------------
+    # Find CallLog FIRST
+    # -------------------------
+
+    # Held until commit: make_call or a concurrent first event may be inserting this call's row
+    await db.execute(call_log_lock(call_id))
+
+    result = await db.execute(
+        select(CallLog)
+        .where(CallLog.external_call_id == call_id)
+        .order_by(CallLog.created_at)
+        .limit(1)
+    )
+    existing_log = result.scalars().first()
+
+    if existing_log and not is_forward(existing_log.status, status_value):
+        logger.info(f"Webhook stale: {call_id} {status_value} after {existing_log.status}")
+        return {"status": "ignored", "reason": "stale"}
+
+    # Points to whichever log is used for deduction.
+    # Assigned in both update and create paths below.
+    log_for_deduction: CallLog | None = None
+
+    # Published after the commit for /campaigns/{id}/events (app/services/campaign_events.py)
+    live_events: list[tuple[str, dict]] = []
+
+    # Continues the trace started in make_call; one span per status event
+    with start_span(
+        "bolna.webhook",
+        {"call.id": str(call_id), "call.status": str(status_value), "campaign.id": str(campaign_id)},
+        traceparent=metadata.get("traceparent"),
+    ) as span:
+        try:
+
+            # If CallLog exists → trust it as source of truth
+            if existing_log:
+                campaign_id = str(existing_log.campaign_id)
+                lead_id = str(existing_log.lead_id)
+
+            # -------------------------
+            # Update existing CallLog
+            # -------------------------
+
+            if existing_log:
+
+                existing_log.status = status_value
+
+                # Only what this event carries — a bare status event leaves the rest alone
+                updates = {
+                    "duration": duration or None,
+                    "cost": cost or None,
+                    "recording_url": event.recording_url,
+                    "transfer_call": event.transfer_call,
+                    "customer_sentiment": event.customer_sentiment,
+                    "interest_level": event.interest_level,
+                }
+                for column, value in updates.items():
+                    if value is not None:
+                        setattr(existing_log, column, value)
+
+                log_for_deduction = existing_log
+
+            # -------------------------
+            # Create CallLog if missing
+            # -------------------------
+
+            else:
+
+                if not lead_id:
+                    logger.warning(
+                        "CallLog missing and lead not resolved",
+                        extra={"call_id": call_id},
+                    )
+                    return {"status": "ignored"}
+
+                logger.warning("Creating CallLog from webhook")
+
+                new_log = CallLog(
+                    external_call_id=call_id,
+                    campaign_id=campaign_id,
+                    lead_id=lead_id,
+                    user_number=user_number,
+                    duration=duration,
+                    cost=cost,
+                    status=status_value,
+                    recording_url=event.recording_url,
+                    interest_level=event.interest_level,
+                    appointment_booked=bool(event.appointment_booked),
+                    appointment_date=appointment_date,
+                    appointment_mode=event.appointment_mode,
+                    customer_sentiment=event.customer_sentiment,
+                    transfer_call=bool(event.transfer_call),
+                    executed_at=datetime.utcnow(),
+                    created_at=datetime.utcnow(),
+                )
+
+                db.add(new_log)
+
+                # Flush so new_log.id is populated before deduction query
+                await db.flush()
+
+                log_for_deduction = new_log
+
+            # Transcript / summary go to the compressed side table, not call_logs
+            await save_transcript(
+                db, log_for_deduction, event.transcript, event.summary,
+                event.customer_sentiment, event.interest_level,
+            )
+
+            # -------------------------
+            # Update Lead Status
+            # -------------------------
+
+            if lead_id:
+
+                lead = await db.get(Lead, lead_id)
+
+                # A late event from an earlier attempt must not touch the current one
+                if lead and lead.external_call_id not in (None, call_id):
+                    lead = None
+
+                if lead:
+
+                    status_map = {
+                        "initiated": "calling",
+                        "in-progress": "calling",
+                        "ringing": "calling",
+                        "completed": "completed",
+                        "call-disconnected": "completed",
+                        "no-answer": "failed",
+                        "failed": "failed",
+                    }
+
+                    lead_status = status_map.get(status_value, "calling")
+                    lead.status = LeadStatus(lead_status)
+                    live_events.append(("leads", {"leads": {str(lead.id): lead.status.value}}))
+                    lead.external_call_id = call_id
+
+                    # Unanswered / failed: back off before the dispatcher may retry
+                    if lead.status == LeadStatus.FAILED:
+                        lead_campaign = await db.get(Campaign, lead.campaign_id)
+                        org_zone = await db.scalar(
+                            select(Organization.timezone).where(Organization.id == lead.organization_id)
+                        )
+                        lead.next_attempt_at = retry_at(
+                            lead_campaign.retry_policy if lead_campaign else None,
+                            lead.attempts or 1,
+                            datetime.utcnow(),
+                            get_zone((lead.custom_fields or {}).get("timezone"), org_zone or "UTC"),
+                            lead_campaign.calling_windows if lead_campaign else None,
+                        )
+
+            if rank(status_value) == FINAL_RANK and log_for_deduction:
+                live_events.append(("call", {
+                    "call_log_id": str(log_for_deduction.id),
+                    "lead_id": lead_id and str(lead_id),
+                    "status": status_value,
+                    "duration": duration,
+                    "cost": cost,
+                }))
+
+            # -------------------------
+            # Wallet Deduction
+            # Fires for BOTH existing and newly created CallLogs.
+            # Only deducts once per call — guarded by WalletTransaction check.
+            # Only deducts when call has duration (i.e. call actually connected).
+            # -------------------------
+
+            if duration > 0 and campaign_id and log_for_deduction:
+
+                already_deducted = await db.scalar(
+                    select(func.count())
+                    .select_from(WalletTransaction)
+                    .where(WalletTransaction.call_log_id == log_for_deduction.id)
+                )
+
+                if already_deducted == 0:
+
+                    campaign_result = await db.execute(
+                        select(Campaign).where(Campaign.id == campaign_id)
+                    )
+                    campaign_obj = campaign_result.scalar_one_or_none()
+
+                    if campaign_obj:
+
+                        deduction = await deduct_minutes_for_call(
+                            organization_id=str(campaign_obj.organization_id),
+                            duration_seconds=duration,
+                            call_log_id=str(log_for_deduction.id),
+                            db=db,
+                        )
+
+                        live_events.append(("wallet", {"minutes_balance": deduction["new_balance"]}))
+
+                        logger.info(
+                            f"Minutes deducted | Call {call_id} | "
+                            f"Duration {duration}s | "
+                            f"Deducted {deduction['minutes_deducted']} min"
+                        )
+
+            await db.commit()
+            if redis is not None and campaign_id:
+                for event_type, data in live_events:
+                    await apublish(redis, campaign_id, event_type, **data)
+            lag = observe_event_lag(event.updated_at)
+            if lag is not None:
+                span.set_attribute("event_lag_seconds", lag)
+
+        except Exception:
+
+            await db.rollback()
+            logger.exception("Webhook processing failed")
+            raise HTTPException(status_code=500, detail="Webhook processing failed")
+
+    return {"status": "success"}
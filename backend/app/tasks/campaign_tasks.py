@@ -1,15 +1,220 @@
+"""
+app/tasks/campaign_tasks.py
+
+Campaign dispatch as short, idempotent ticks.
+
+Each process_campaign run is one tick: it claims one batch of leads, dials
+them and re-enqueues itself with countdown=call_delay_seconds. No tick sleeps,
+so a small worker pool serves any number of running campaigns, and a deploy
+only ever interrupts a single batch.
+
+    start / resume ──► tick ──► tick ──► … ──► no leads left → completed
+                        ▲
+    beat fan-out ───────┘  (takes over campaigns whose lease expired)
+
+Ownership is a Redis lease (app/services/campaign_lease.py) renewed by every
+tick and every dial. Its token is per tick: a tick starts by swapping its
+message's token for a fresh one, and hands the next tick yet another. A tick
+that cannot claim the lease — another chain owns the campaign, or this
+message was already run (a redelivery after the worker died between enqueuing
+the next tick and acking) — exits without dialing, so duplicate deliveries
+never double the dial rate. When a worker dies mid-tick the lease expires and
+the fan-out watchdog seeds a chain that takes the campaign over.
+Leads are claimed with FOR UPDATE SKIP LOCKED and marked QUEUED before
+dialing, so two overlapping ticks never dial the same lead.
+
+With DISPATCH_FAIR_SHARE on, ticks don't re-enqueue themselves: a ready
+campaign joins dispatch:pending and the global dispatcher
+(app/tasks/dispatcher_worker.py) grants it dial slots by weighted deficit
+round robin across organizations. An ungranted tick (slots=None) only queues.
+
+Scheduled campaigns and campaigns outside their calling windows are parked:
+the chain keeps its lease until the wake-up time and registers a wake-up in
+the scheduler ZSET (app/services/campaign_scheduler.py) instead of ticking.
+
+Bolna calls go through a shared circuit breaker and AIMD concurrency limit
+(app/services/bolna_guard.py). A dial it refuses is not an attempt: the lead
+and the rest of the batch go back to PENDING uncharged and the next tick is
+pushed back by the guard's retry-after, so dispatch slows while Bolna errors.
+"""
+
 import time
+import uuid
+from datetime import datetime, timedelta
 from uuid import UUID
+
+from sqlalchemy import func, or_, and_
+
 from app.core.celery_app import celery_app
-from app.db.sync_session import SessionLocal
+from app.core.config import settings
+from app.core.metrics import CAMPAIGN_DIALS
+from app.core.tracing import start_span
+from app.db.sync_session import SessionLocal, get_sync_redis
 from app.models.campaigns import Campaign, CampaignStatus
 from app.models.lead import Lead, LeadStatus
+from app.models.organization import Organization
 from app.models.wallet import Wallet
+from app.services.bolna_guard import BolnaUnavailable
 from app.services.bolna_service import make_call
+from app.services.campaign_events import publish
+from app.services.campaign_lease import LEASE_KEY, claim_lease, release_lease
+from app.services.campaign_scheduler import get_zone, is_open, next_open, schedule_wakeup
+from app.services.fair_share import PENDING_KEY, request_slots
+from app.services.retry_policy import retry_at
+
+# Distinct lead timezones per campaign, cached so ticks don't rescan the leads
+_ZONE_CACHE_SECONDS = 300
+_zone_cache: dict[str, tuple[float, list[str]]] = {}
+
+
+def _hand_off(redis, campaign_id: str, token: str, hold_seconds: float = 0) -> str | None:
+    """Move the lease to a new token for the next tick. None if this tick no longer owns it."""
+    next_token = uuid.uuid4().hex
+    if not claim_lease(redis, campaign_id, token, hold_seconds=hold_seconds, next_token=next_token):
+        print(f"Campaign {campaign_id} lease lost — not handing off")
+        return None
+    return next_token
+
+
+def _schedule_tick(campaign_id: str, token: str, countdown: float) -> None:
+    """Hold the lease until the next tick is due, then enqueue it."""
+    next_token = _hand_off(get_sync_redis(), campaign_id, token, countdown)
+    if next_token:
+        process_campaign.apply_async(args=[campaign_id, next_token], countdown=countdown, queue="campaign_queue")
+
+
+def _park(redis, campaign_id: str, token: str, until: datetime, now: datetime) -> None:
+    """Keep the lease and let the scheduler wake this chain at `until`."""
+    # The scheduler reads the new token back from the lease
+    if _hand_off(redis, campaign_id, token, max((until - now).total_seconds(), 0)):
+        schedule_wakeup(redis, campaign_id, until)
+        print(f"Campaign {campaign_id} parked until {until.isoformat()}Z")
+
+
+def _dialable(campaign: Campaign) -> list:
+    return [
+        Lead.campaign_id == campaign.id,
+        Lead.status.in_([LeadStatus.PENDING, LeadStatus.FAILED]),
+        Lead.retry_count < Lead.max_retries,
+    ]
+
+
+def _open_zones(db, campaign: Campaign, lead_zone, org_zone: str, now: datetime) -> tuple[list[str], datetime | None]:
+    """Lead timezones inside a calling window now, and when the next closed one opens."""
+    key = str(campaign.id)
+    cached = _zone_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        zones = cached[1]
+    else:
+        zones = [z for (z,) in db.query(lead_zone).filter(*_dialable(campaign)).distinct().all()]
+        _zone_cache[key] = (time.monotonic() + _ZONE_CACHE_SECONDS, zones)
+
+    open_now, wake_at = [], None
+    for name in zones:
+        zone = get_zone(name, org_zone)
+        if is_open(campaign.calling_windows, zone, now):
+            open_now.append(name)
+            continue
+        opens = next_open(campaign.calling_windows, zone, now)
+        if opens and (wake_at is None or opens < wake_at):
+            wake_at = opens
+    return open_now, wake_at
+
+
+def _end_chain(db, campaign: Campaign, token: str) -> None:
+    db.commit()
+    release_lease(get_sync_redis(), campaign.id, token)
+
+
+def _publish_leads(campaign_id: str, lead_ids: list[str], status: LeadStatus) -> None:
+    """Live progress for /campaigns/{id}/events — one message per batch of status changes."""
+    if lead_ids:
+        publish(get_sync_redis(), campaign_id, "leads", leads=dict.fromkeys(lead_ids, status.value))
+
+
+def _dial(db, campaign: Campaign, lead: Lead, org_zone: str) -> float | None:
+    """Dial one lead. Returns seconds to back off if Bolna refused the call, else None."""
+    campaign_id = str(campaign.id)
+    lead_id = str(lead.id)   # read before any commit expires the lead
+
+    # Span covers QUEUED → CALLING, i.e. time-to-dial
+    with start_span("campaign.dial", {"campaign.id": campaign_id, "lead.id": lead_id}) as span:
+        try:
+            formatted_phone = f"+91{lead.phone}"
+
+            # make_call() handles its own flush+commit internally
+            # so the CallLog exists before the webhook fires
+            make_call(
+                db=db,
+                phone=formatted_phone,
+                agent_id=campaign.bolna_agent_id,
+                campaign_id=campaign.id,
+                lead_id=lead.id,
+            )
 
+            # Call was accepted by Bolna — mark as CALLING, not COMPLETED.
+            # The webhook will update status to completed/failed
+            # when the call actually finishes.
+            lead.status = LeadStatus.CALLING
+            lead.attempts += 1
+            lead.retry_count = 0
+            db.commit()
+            _publish_leads(campaign_id, [lead_id], LeadStatus.CALLING)
+            CAMPAIGN_DIALS.labels(campaign_id, "dialed").inc()
+            span.set_attribute("outcome", "dialed")
 
-@celery_app.task(bind=True, max_retries=3)
-def process_campaign(self, campaign_id: str):
+        except BolnaUnavailable as e:
+            # Never reached Bolna — not an attempt, no retry charged
+            db.rollback()
+            print(f"Dial deferred for {lead.phone}: {e}")
+            CAMPAIGN_DIALS.labels(campaign_id, "deferred").inc()
+            span.set_attribute("outcome", "deferred")
+            lead.status = LeadStatus.PENDING
+            db.commit()
+            _publish_leads(campaign_id, [lead_id], LeadStatus.PENDING)
+            return e.retry_after
+
+        except Exception as e:
+            db.rollback()
+            print(f"Call failed for {lead.phone}: {str(e)}")
+            CAMPAIGN_DIALS.labels(campaign_id, "failed").inc()
+            span.set_attribute("outcome", "failed")
+
+            lead.attempts += 1
+            lead.retry_count += 1
+
+            if lead.retry_count >= lead.max_retries:
+                lead.status = LeadStatus.FAILED
+            else:
+                lead.status = LeadStatus.PENDING
+                lead.next_attempt_at = retry_at(
+                    campaign.retry_policy,
+                    lead.retry_count,
+                    datetime.utcnow(),
+                    get_zone((lead.custom_fields or {}).get("timezone"), org_zone),
+                    campaign.calling_windows,
+                )
+
+            new_status = lead.status
+            db.commit()
+            _publish_leads(campaign_id, [lead_id], new_status)
+
+
+@celery_app.task(bind=True, max_retries=3, acks_late=True)
+def process_campaign(self, campaign_id: str, tick_token: str | None = None, slots: int | None = None):
+    """
+    One dispatch tick. Called without a token it starts a new chain.
+    `slots` is the dispatcher's grant; None under fair share means "queue for slots".
+    """
+
+    redis = get_sync_redis()
+    run_token = uuid.uuid4().hex
+
+    # Spend this message's token: a redelivered copy of it can no longer claim
+    if not claim_lease(redis, campaign_id, tick_token or run_token, next_token=run_token):
+        print(f"Campaign {campaign_id} is owned by another dispatcher or tick already ran — skipped")
+        return
+    tick_token = run_token
 
     db = SessionLocal()
 
@@ -20,112 +225,154 @@ def process_campaign(self, campaign_id: str):
 
         if not campaign:
             print("Campaign not found")
+            release_lease(redis, campaign_id, tick_token)
             return
 
-        print(f"Processing campaign {campaign.id}")
-
-        while True:
-
-            db.refresh(campaign)
-
-            # STOP / PAUSE CHECK
-            if campaign.status != CampaignStatus.running:
-                print("Campaign paused or stopped")
-                break
-
-            leads = db.query(Lead).filter(
-                Lead.campaign_id == campaign.id,
-                Lead.status.in_([LeadStatus.PENDING, LeadStatus.FAILED]),
-                Lead.retry_count < Lead.max_retries,
-            ).limit(5).all()
-
-            if not leads:
-                campaign.status = CampaignStatus.completed
-                campaign.is_processing = False
-                db.commit()
-                print("Campaign completed")
-                break
+        now = datetime.utcnow()
 
-            for lead in leads:
+        # SCHEDULED: wait for the start time, then run
+        if campaign.status == CampaignStatus.scheduled:
+            if campaign.scheduled_at and campaign.scheduled_at > now:
+                _park(redis, campaign_id, tick_token, campaign.scheduled_at, now)
+                return
+            campaign.status = CampaignStatus.running
+            db.commit()
 
-                db.refresh(campaign)
+        # STOP / PAUSE CHECK
+        if campaign.status != CampaignStatus.running:
+            print("Campaign paused or stopped")
+            _end_chain(db, campaign, tick_token)
+            return
 
-                if campaign.status != CampaignStatus.running:
-                    print("Campaign paused during execution")
-                    break
+        wallet = db.query(Wallet).filter(
+            Wallet.organization_id == campaign.organization_id
+        ).first()
 
-                wallet = db.query(Wallet).filter(
-                    Wallet.organization_id == campaign.organization_id
-                ).first()
+        if not wallet or wallet.minutes_balance <= 0:
+            print(
+                f"Campaign {campaign_id} stopped — "
+                f"insufficient balance"
+            )
+            campaign.status = CampaignStatus.paused
+            _end_chain(db, campaign, tick_token)
+            return
 
-                if not wallet or wallet.minutes_balance <= 0:
-                    print(
-                        f"Campaign {campaign_id} stopped — "
-                        f"insufficient balance"
-                    )
-                    campaign.status = CampaignStatus.paused
-                    campaign.is_processing = False
-                    db.commit()
-                    return
+        # With a call delay, one call per tick keeps the original pacing
+        batch_size = settings.CAMPAIGN_TICK_BATCH if campaign.call_delay_seconds <= 0 else 1
 
-                try:
-                    # Mark as queued before attempting the call
-                    lead.status = LeadStatus.QUEUED
-                    db.commit()
+        org_zone, tier = db.query(Organization.timezone, Organization.tier).filter(
+            Organization.id == campaign.organization_id
+        ).one()
+        org_zone = org_zone or "UTC"
 
-                    formatted_phone = f"+91{lead.phone}"
+        # FAIR SHARE: wait for the dispatcher to grant dial slots
+        if settings.DISPATCH_FAIR_SHARE:
+            if slots is None:
+                db.rollback()
+                # The dispatcher reads the new token back from the lease
+                if _hand_off(redis, campaign_id, tick_token):
+                    request_slots(redis, campaign_id, campaign.organization_id, tier, batch_size)
+                return
+            batch_size = min(batch_size, slots)
 
-                    # make_call() handles its own flush+commit internally
-                    # so the CallLog exists before the webhook fires
-                    response = make_call(
-                        db=db,
-                        phone=formatted_phone,
-                        agent_id=campaign.bolna_agent_id,
-                        campaign_id=campaign.id,
-                        lead_id=lead.id,
-                    )
+        # Range scan on ix_leads_next_attempt: only leads whose retry backoff has passed
+        query = db.query(Lead).filter(
+            *_dialable(campaign),
+            Lead.next_attempt_at <= now,
+        ).order_by(Lead.next_attempt_at)
 
-                    # Call was accepted by Bolna — mark as CALLING, not COMPLETED.
-                    # The webhook will update status to completed/failed
-                    # when the call actually finishes.
-                    lead.status = LeadStatus.CALLING
-                    lead.attempts += 1
-                    lead.retry_count = 0
-                    db.commit()
+        # CALLING WINDOWS: only leads whose local time is inside a window
+        wake_at = None
+        if campaign.calling_windows:
+            lead_zone = func.coalesce(Lead.custom_fields["timezone"].astext, org_zone)
+            open_zones, wake_at = _open_zones(db, campaign, lead_zone, org_zone, now)
+            query = query.filter(lead_zone.in_(open_zones))
 
-                except Exception as e:
-                    print(f"Call failed for {lead.phone}: {str(e)}")
+        leads = query.limit(batch_size).with_for_update(skip_locked=True).all()
 
-                    lead.attempts += 1
-                    lead.retry_count += 1
+        if not leads:
+            _zone_cache.pop(str(campaign.id), None)
+            next_due = db.query(func.min(Lead.next_attempt_at)).filter(*_dialable(campaign)).scalar()
+            if next_due is not None:
+                # Leads remain — waiting on retry backoff or outside a calling window
+                db.rollback()
+                if next_due > now:
+                    until = next_due
+                elif campaign.calling_windows:
+                    until = wake_at or now + timedelta(hours=1)
+                else:
+                    until = now + timedelta(seconds=5)   # due leads are locked by another claim
+                _park(redis, campaign_id, tick_token, until, now)
+                return
 
-                    if lead.retry_count >= lead.max_retries:
-                        lead.status = LeadStatus.FAILED
-                    else:
-                        lead.status = LeadStatus.PENDING
+        if not leads:
+            campaign.status = CampaignStatus.completed
+            _end_chain(db, campaign, tick_token)
+            publish(redis, campaign_id, "campaign", status=CampaignStatus.completed.value)
+            print("Campaign completed")
+            return
 
-                    db.commit()
+        # Claim: QUEUED leads are invisible to any overlapping tick
+        lead_ids = [str(lead.id) for lead in leads]
+        for lead in leads:
+            lead.status = LeadStatus.QUEUED
+        db.commit()
+        _publish_leads(campaign_id, lead_ids, LeadStatus.QUEUED)
 
-                # Rate limiting between calls
-                time.sleep(campaign.call_delay_seconds)
+        delay = max(campaign.call_delay_seconds or 0, 0)
+        for i, lead in enumerate(leads):
+            claim_lease(redis, campaign_id, tick_token)   # heartbeat
+            backoff = _dial(db, campaign, lead, org_zone)
+            if backoff is not None:
+                # Bolna is refusing calls — hand the rest of the batch back and slow down
+                for rest in leads[i + 1:]:
+                    rest.status = LeadStatus.PENDING
+                db.commit()
+                _publish_leads(campaign_id, lead_ids[i + 1:], LeadStatus.PENDING)
+                delay = max(delay, backoff)
+                break
 
-        print("Campaign execution stopped safely")
+        if settings.DISPATCH_FAIR_SHARE:
+            if _hand_off(redis, campaign_id, tick_token, delay):
+                request_slots(redis, campaign_id, campaign.organization_id, tier, batch_size, delay)
+        else:
+            _schedule_tick(campaign_id, tick_token, delay)
 
     except Exception as exc:
+        db.rollback()
         print("Critical task error:", str(exc))
-        self.retry(exc=exc, countdown=5)
+        raise self.retry(exc=exc, countdown=5, args=[campaign_id, tick_token, slots])
 
     finally:
-        # Always release is_processing lock, even on crash
-        try:
-            campaign = db.query(Campaign).filter(
-                Campaign.id == UUID(campaign_id)
-            ).first()
+        db.close()
 
-            if campaign:
-                campaign.is_processing = False
-                db.commit()
-        except Exception:
-            pass  # don't mask the original exception
 
-        db.close()
\ No newline at end of file
+@celery_app.task
+def fan_out_campaign_ticks():
+    """Beat watchdog: take over running campaigns whose lease has expired."""
+    db = SessionLocal()
+    try:
+        running = db.query(Campaign.id).filter(or_(
+            Campaign.status == CampaignStatus.running,
+            # Due scheduled campaigns whose wake-up was lost
+            and_(Campaign.status == CampaignStatus.scheduled, Campaign.scheduled_at <= datetime.utcnow()),
+        )).all()
+    finally:
+        db.close()
+
+    redis = get_sync_redis()
+    pipe = redis.pipeline(transaction=False)
+    for (campaign_id,) in running:
+        pipe.exists(LEASE_KEY.format(campaign_id))
+        pipe.zscore(PENDING_KEY, str(campaign_id))   # waiting for fair-share slots
+    results = pipe.execute() if running else []
+
+    seeded = 0
+    for (campaign_id,), has_lease, pending in zip(running, results[0::2], results[1::2]):
+        if not has_lease and pending is None:
+            process_campaign.apply_async(args=[str(campaign_id)], queue="campaign_queue")
+            seeded += 1
+
+    if seeded:
+        print(f"Took over {seeded} orphaned campaign(s)")
+    return seeded
@@ -0,0 +1,99 @@
+"""
+app/tasks/dispatcher_worker.py
+
+Global fair-share dispatcher — decides which campaign dials next.
+
+Run next to the Celery workers (several may run; one is leader at a time):
+    python -m app.tasks.dispatcher_worker
+
+With DISPATCH_FAIR_SHARE on, campaign ticks no longer re-enqueue themselves.
+A tick that is ready to dial puts its campaign in dispatch:pending (see
+app/services/fair_share.py). Every DISPATCH_ROUND_SECONDS this loop:
+  1. takes the campaigns whose pending time has passed
+  2. splits DISPATCH_SLOTS_PER_ROUND across their organizations by deficit
+     round robin, weighted by organization tier
+  3. enqueues one tick per granted campaign, carrying its slot count and the
+     current lease token so the tick resumes the owning chain
+
+Campaigns not granted this round stay pending and earn credit for the next.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from app.core.config import settings
+from app.db.session import get_redis_pool
+from app.services.campaign_lease import LEASE_KEY
+from app.services.fair_share import META_KEY, PENDING_KEY, DeficitRoundRobin, tier_weight
+from app.tasks.campaign_tasks import process_campaign
+
+log = logging.getLogger(__name__)
+
+LEADER_KEY = "dispatch:leader"
+_ME = f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def _is_leader(redis) -> bool:
+    ttl = max(int(settings.DISPATCH_ROUND_SECONDS * 5), 5)
+    if await redis.set(LEADER_KEY, _ME, nx=True, ex=ttl):
+        return True
+    if (await redis.get(LEADER_KEY) or b"").decode() == _ME:
+        await redis.expire(LEADER_KEY, ttl)
+        return True
+    return False
+
+
+async def _due_campaigns(redis) -> tuple[dict[str, list[tuple[str, int]]], dict[str, float]]:
+    due = [m.decode() for m in await redis.zrangebyscore(PENDING_KEY, "-inf", time.time())]
+    if not due:
+        return {}, {}
+
+    ready: dict[str, list[tuple[str, int]]] = {}
+    weights: dict[str, float] = {}
+    for campaign_id, meta in zip(due, await redis.hmget(META_KEY, due)):
+        if not meta:
+            continue
+        org_id, tier, max_slots = meta.decode().split("|")
+        ready.setdefault(org_id, []).append((campaign_id, int(max_slots)))
+        weights[org_id] = tier_weight(tier)
+    return ready, weights
+
+
+async def _grant(redis, campaign_id: str, slots: int) -> None:
+    # ZREM decides the grant — a campaign is never handed out twice
+    if not await redis.zrem(PENDING_KEY, campaign_id):
+        return
+    token = await redis.hget(LEASE_KEY.format(campaign_id), "token")
+    process_campaign.apply_async(
+        args=[campaign_id, token.decode() if token else None, slots],
+        queue="campaign_queue",
+    )
+
+
+async def run() -> None:
+    redis = await get_redis_pool()
+    drr = DeficitRoundRobin()
+    log.info("[DISPATCH] Started")
+
+    while True:
+        started = time.monotonic()
+        try:
+            if await _is_leader(redis):
+                ready, weights = await _due_campaigns(redis)
+                grants = drr.allocate(ready, weights, settings.DISPATCH_SLOTS_PER_ROUND)
+                for campaign_id, slots in grants.items():
+                    await _grant(redis, campaign_id, slots)
+                if grants:
+                    log.debug(f"[DISPATCH] Granted {sum(grants.values())} slots to {len(grants)} campaigns")
+        except Exception as e:
+            log.warning(f"[DISPATCH] Round failed: {e}")
+
+        await asyncio.sleep(max(0.0, settings.DISPATCH_ROUND_SECONDS - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(run())
@@ -0,0 +1,174 @@
+"""
+app/tasks/email_worker.py
+
+Drains the Redis email outbox (see app/core/email.py).
+
+Run one or more of these next to the API:
+    python -m app.tasks.email_worker
+
+Each loop:
+  1. moves retries whose backoff has elapsed back onto the outbox
+  2. blocks for the next message, then grabs up to EMAIL_BATCH_SIZE more
+  3. sends the batch concurrently over the SMTP connection pool
+  4. records sent / retrying / failed per message
+
+Messages are taken with BLMOVE / LMOVE into this worker's own
+email:processing:{worker} list and removed from it only once sent, failed or
+scheduled for retry, so a crash or redeploy mid-batch loses nothing. Each
+worker keeps a heartbeat key alive; at startup and every
+_ORPHAN_CHECK_SECONDS, processing lists whose worker has no heartbeat go back
+onto the outbox.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+
+from app.core.config import settings
+from app.core.email import (
+    OUTBOX_KEY,
+    PROCESSING_PREFIX,
+    RETRY_KEY,
+    WORKER_PREFIX,
+    SMTPPool,
+    deliver,
+    describe_smtp_error,
+    drop_link,
+    fill_link,
+    is_permanent_smtp_error,
+    set_email_status,
+)
+from app.db.session import get_redis_pool
+
+log = logging.getLogger(__name__)
+
+_ME = f"{socket.gethostname()}:{os.getpid()}"
+PROCESSING_KEY = f"{PROCESSING_PREFIX}{_ME}"
+
+_HEARTBEAT_SECONDS = 10
+_ORPHAN_CHECK_SECONDS = 60
+
+# ZREM decides which worker promotes a retry; the LPUSH happens in the same step
+_PROMOTE_LUA = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 1 then
+    redis.call('LPUSH', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+def _retry_delay(attempts: int) -> float:
+    """Exponential backoff: base, 2×base, 4×base … capped at one hour."""
+    return min(settings.EMAIL_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), 3600)
+
+
+async def _heartbeat(redis) -> None:
+    while True:
+        await redis.set(f"{WORKER_PREFIX}{_ME}", int(time.time()), ex=_HEARTBEAT_SECONDS * 3)
+        await asyncio.sleep(_HEARTBEAT_SECONDS)
+
+
+async def _requeue_orphans(redis, include_own: bool = False) -> int:
+    """Put messages taken by workers that are gone back on the outbox."""
+    moved = 0
+    async for key in redis.scan_iter(match=f"{PROCESSING_PREFIX}*"):
+        key = key.decode() if isinstance(key, bytes) else key
+        worker = key[len(PROCESSING_PREFIX):]
+        if worker == _ME:
+            if not include_own:
+                continue
+        elif await redis.exists(f"{WORKER_PREFIX}{worker}"):
+            continue
+        # One message per LMOVE — each is always in exactly one list
+        while await redis.lmove(key, OUTBOX_KEY, "RIGHT", "RIGHT") is not None:
+            moved += 1
+    if moved:
+        print(f"[EMAIL] ♻️  Requeued {moved} message(s) left by stopped workers")
+    return moved
+
+
+async def _promote_due_retries(redis) -> None:
+    due = await redis.zrangebyscore(RETRY_KEY, "-inf", time.time())
+    for raw in due:
+        await redis.eval(_PROMOTE_LUA, 2, RETRY_KEY, OUTBOX_KEY, raw)
+
+
+async def _next_batch(redis) -> list[tuple[bytes, dict]]:
+    """(raw, job) pairs, each already moved onto this worker's processing list."""
+    first = await redis.blmove(OUTBOX_KEY, PROCESSING_KEY, 1, "RIGHT", "LEFT")
+    if first is None:
+        return []
+    raws = [first]
+    async with redis.pipeline(transaction=False) as pipe:
+        for _ in range(settings.EMAIL_BATCH_SIZE - 1):
+            pipe.lmove(OUTBOX_KEY, PROCESSING_KEY, "RIGHT", "LEFT")
+        raws.extend(raw for raw in await pipe.execute() if raw is not None)
+    return [(raw, json.loads(raw)) for raw in raws]
+
+
+async def _send_one(redis, pool: SMTPPool, raw: bytes, job: dict) -> None:
+    job["attempts"] = job.get("attempts", 0) + 1
+    try:
+        filled = await fill_link(redis, job)
+        if filled is None:
+            print(f"[EMAIL] ❌ FAILED — {job['kind']} to {job['to']}: link expired before sending")
+            await set_email_status(redis, job["id"], "failed", job["attempts"], "link expired")
+            await redis.lrem(PROCESSING_KEY, 1, raw)
+            return
+        await deliver(pool, filled)
+    except Exception as e:
+        reason = describe_smtp_error(e)
+        if is_permanent_smtp_error(e) or job["attempts"] >= settings.EMAIL_MAX_ATTEMPTS:
+            print(f"[EMAIL] ❌ FAILED — {job['kind']} to {job['to']} after {job['attempts']} attempt(s)")
+            print(f"[EMAIL]    {reason}")
+            await set_email_status(redis, job["id"], "failed", job["attempts"], reason)
+            await drop_link(redis, job)
+            await redis.lrem(PROCESSING_KEY, 1, raw)
+            return
+
+        delay = _retry_delay(job["attempts"])
+        print(f"[EMAIL] ⚠️  {job['kind']} to {job['to']} — retry in {delay:.0f}s ({reason})")
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(RETRY_KEY, {json.dumps(job): time.time() + delay})
+            pipe.lrem(PROCESSING_KEY, 1, raw)
+            await pipe.execute()
+        await set_email_status(redis, job["id"], "retrying", job["attempts"], reason)
+        return
+
+    print(f"[EMAIL] ✅ {job['kind']} sent → {job['to']}")
+    await set_email_status(redis, job["id"], "sent", job["attempts"])
+    await drop_link(redis, job)
+    await redis.lrem(PROCESSING_KEY, 1, raw)
+
+
+async def run() -> None:
+    redis = await get_redis_pool()
+    pool = SMTPPool(settings.EMAIL_SMTP_POOL_SIZE)
+    heartbeat = asyncio.create_task(_heartbeat(redis))
+    print(f"[EMAIL] Worker started — pool={settings.EMAIL_SMTP_POOL_SIZE} batch={settings.EMAIL_BATCH_SIZE}")
+
+    try:
+        # A previous run under this name may have died mid-batch
+        await _requeue_orphans(redis, include_own=True)
+        next_orphan_check = time.monotonic() + _ORPHAN_CHECK_SECONDS
+
+        while True:
+            if time.monotonic() >= next_orphan_check:
+                await _requeue_orphans(redis)
+                next_orphan_check = time.monotonic() + _ORPHAN_CHECK_SECONDS
+            await _promote_due_retries(redis)
+            batch = await _next_batch(redis)
+            if batch:
+                await asyncio.gather(*(_send_one(redis, pool, raw, job) for raw, job in batch))
+    finally:
+        heartbeat.cancel()
+        await pool.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
@@ -0,0 +1,185 @@
+"""
+app/tasks/maintenance_tasks.py
+
+Monthly partition management for call_logs.
+
+call_logs is range-partitioned on created_at, one partition per month,
+named call_logs_yYYYYmMM, plus call_logs_default catching rows outside them.
+Once a day (Celery beat) this job:
+  1. creates partitions for this month and CALL_LOG_PARTITION_PREMAKE_MONTHS ahead
+  2. detaches partitions older than CALL_LOG_RETENTION_MONTHS
+  3. exports each detached partition to zstd-compressed Parquet under
+     CALL_LOG_ARCHIVE_DIR — with its calls' transcripts and summaries from
+     call_transcripts — then drops it and those call_transcripts rows
+
+Steps 2-3 are separate so a failed export leaves the detached table in place
+and the next run retries it.
+"""
+
+import os
+import re
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, DateTime, Float, Integer, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.engine import get_sync_engine
+from app.models.call_logs import CallLog
+from app.services.transcript_store import decompress
+
+PARENT = "call_logs"
+DEFAULT = "call_logs_default"   # rows with no monthly partition yet — see ensure_partition
+_NAME_RE = re.compile(r"^call_logs_y(\d{4})m(\d{2})$")
+_EXPORT_BATCH = 5000
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year}m{month.month:02d}"
+
+
+def _parse_month(name: str) -> date | None:
+    m = _NAME_RE.match(name)
+    return date(int(m.group(1)), int(m.group(2)), 1) if m else None
+
+
+def ensure_partition(conn, month: date) -> bool:
+    """Create the partition for `month` if missing. Returns True if created.
+
+    Rows for that month already in the DEFAULT partition are moved into it
+    first — Postgres refuses to attach a range the default still holds rows for.
+    """
+    name = partition_name(month)
+    exists = conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+    if exists:
+        return False
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    conn.execute(text(f'CREATE TABLE "{name}" (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    conn.execute(text(
+        f'WITH moved AS (DELETE FROM "{DEFAULT}" WHERE created_at >= :start AND created_at < :end RETURNING *) '
+        f'INSERT INTO "{name}" SELECT * FROM moved'
+    ), {"start": start, "end": end})
+    conn.execute(text(
+        f'ALTER TABLE {PARENT} ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    ))
+    return True
+
+
+def list_partition_tables(conn) -> dict[str, bool]:
+    """Every call_logs_yYYYYmMM table → whether it is currently attached."""
+    rows = conn.execute(text(
+        "SELECT relname, relispartition FROM pg_class "
+        "WHERE relkind IN ('r', 'p') AND relname LIKE 'call\\_logs\\_y%'"
+    )).all()
+    return {name: attached for name, attached in rows if _NAME_RE.match(name)}
+
+
+def _arrow_schema() -> pa.Schema:
+    fields = []
+    for col in CallLog.__table__.columns:
+        if isinstance(col.type, DateTime):
+            typ = pa.timestamp("us")
+        elif isinstance(col.type, Boolean):
+            typ = pa.bool_()
+        elif isinstance(col.type, Integer):
+            typ = pa.int64()
+        elif isinstance(col.type, Float):
+            typ = pa.float64()
+        else:
+            typ = pa.string()   # UUID, String, Text
+        fields.append(pa.field(col.name, typ))
+    # Decompressed from call_transcripts, so the archive stays self-contained
+    fields += [pa.field("transcript", pa.string()), pa.field("summary", pa.string())]
+    return pa.schema(fields)
+
+
+def archive_partition(conn, name: str, archive_dir: str) -> tuple[str, int]:
+    """Stream a detached partition into <archive_dir>/<name>.parquet (zstd)."""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.parquet")
+    tmp_path = f"{path}.tmp"
+
+    schema = _arrow_schema()
+    log_columns = [c.name for c in CallLog.__table__.columns]
+    uuid_cols = {c.name for c in CallLog.__table__.columns if isinstance(c.type, UUID)}
+    columns = ", ".join(f'p."{c}"' for c in log_columns)
+
+    rows_written = 0
+    result = conn.execution_options(stream_results=True).execute(text(
+        f"SELECT {columns}, t.transcript_zst, t.transcript_bytes, t.summary_zst, t.summary_bytes "
+        f'FROM "{name}" p LEFT JOIN call_transcripts t ON t.call_log_id = p.id '
+        f"ORDER BY p.created_at"
+    ))
+    with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+        for chunk in result.partitions(_EXPORT_BATCH):
+            data = {f.name: [] for f in schema}
+            for row in chunk:
+                for field, value in zip(log_columns, row):
+                    data[field].append(str(value) if field in uuid_cols and value is not None else value)
+                transcript_zst, transcript_bytes, summary_zst, summary_bytes = row[len(log_columns):]
+                data["transcript"].append(decompress(transcript_zst, transcript_bytes))
+                data["summary"].append(decompress(summary_zst, summary_bytes))
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            rows_written += len(chunk)
+
+    os.replace(tmp_path, path)   # only a complete file ever carries the final name
+    return path, rows_written
+
+
+def maintain_partitions(today: date | None = None) -> dict:
+    today = today or datetime.utcnow().date()
+    current = month_start(today)
+    oldest_kept = add_months(current, -settings.CALL_LOG_RETENTION_MONTHS)
+
+    created, detached, archived = [], [], []
+    engine = get_sync_engine()
+
+    with engine.begin() as conn:
+        for offset in range(settings.CALL_LOG_PARTITION_PREMAKE_MONTHS + 1):
+            month = add_months(current, offset)
+            if ensure_partition(conn, month):
+                created.append(partition_name(month))
+
+        for name, attached in list_partition_tables(conn).items():
+            if attached and _parse_month(name) < oldest_kept:
+                conn.execute(text(f'ALTER TABLE {PARENT} DETACH PARTITION "{name}"'))
+                detached.append(name)
+
+    # Archive every detached partition — including ones a previous run failed on
+    with engine.connect() as conn:
+        pending = [name for name, attached in list_partition_tables(conn).items() if not attached]
+
+    for name in sorted(pending):
+        with engine.begin() as conn:
+            path, rows = archive_partition(conn, name, settings.CALL_LOG_ARCHIVE_DIR)
+            conn.execute(text(
+                f'DELETE FROM call_transcripts t USING "{name}" p WHERE t.call_log_id = p.id'
+            ))
+            conn.execute(text(f'DROP TABLE "{name}"'))
+        archived.append({"partition": name, "path": path, "rows": rows})
+
+    return {"created": created, "detached": detached, "archived": archived}
+
+
+@celery_app.task
+def maintain_call_log_partitions():
+    summary = maintain_partitions()
+    print(
+        f"[PARTITIONS] created={summary['created']} "
+        f"detached={summary['detached']} "
+        f"archived={[a['partition'] for a in summary['archived']]}"
+    )
+    return summary
@@ -0,0 +1,149 @@
+"""
+app/tasks/reaper_tasks.py
+
+Stuck-call reaper — recovers calls whose webhook never arrived.
+
+Every CALL_REAPER_INTERVAL_SECONDS (Celery beat):
+  1. CallLogs still in flight (initiated / queued / ringing / in-progress)
+     after CALL_REAPER_TIMEOUT_SECONDS are looked up on Bolna, at most
+     CALL_REAPER_CONCURRENCY requests at a time over one pooled client.
+     Each execution record goes through process_bolna_event — the same code
+     the webhook runs — so lead status, CallLog and wallet debit end up exactly
+     as if the webhook had been delivered. Executions Bolna does not know are
+     applied as "failed", which makes the lead retryable. Lookups go through
+     the Bolna guard (app/services/bolna_guard.py) like dials do: they share
+     its concurrency limit and feed its breaker. Lookups it refuses, and every
+     lookup while the breaker is open, wait for the next run.
+  2. Leads stuck in QUEUED (claimed by a tick that died before dialing) go back
+     to PENDING so the dispatcher picks them up again.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+import redis.asyncio as aioredis
+from sqlalchemy import or_, select, update
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.models.call_logs import CallLog
+from app.models.lead import Lead, LeadStatus
+from app.services.bolna_guard import BolnaUnavailable, abreaker_open
+from app.services.bolna_service import bolna_async_client, get_execution
+from app.services.webhook_service import process_bolna_event
+
+log = logging.getLogger(__name__)
+
+IN_FLIGHT_STATUSES = ("initiated", "queued", "ringing", "in-progress")
+
+
+async def _stuck_calls(now: datetime) -> list[str]:
+    cutoff = now - timedelta(seconds=settings.CALL_REAPER_TIMEOUT_SECONDS)
+    oldest = now - timedelta(hours=settings.CALL_REAPER_MAX_AGE_HOURS)   # bounds partition scan
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CallLog.external_call_id)
+            .where(
+                or_(CallLog.status.in_(IN_FLIGHT_STATUSES), CallLog.status.is_(None)),
+                CallLog.created_at < cutoff,
+                CallLog.created_at >= oldest,
+            )
+            .order_by(CallLog.created_at)
+            .limit(settings.CALL_REAPER_BATCH)
+        )
+        return list(result.scalars())
+
+
+async def _fetch_all(redis, call_ids: list[str]) -> list[tuple[str, dict | None | Exception]]:
+    semaphore = asyncio.Semaphore(settings.CALL_REAPER_CONCURRENCY)
+
+    async with bolna_async_client(settings.CALL_REAPER_CONCURRENCY) as client:
+
+        async def fetch(call_id: str):
+            async with semaphore:
+                try:
+                    return call_id, await get_execution(client, redis, call_id)
+                except Exception as e:
+                    return call_id, e
+
+        return await asyncio.gather(*(fetch(call_id) for call_id in call_ids))
+
+
+def _stuck_lead_criteria(now: datetime) -> tuple:
+    # A lead is only QUEUED between its claim and its dial, so an old QUEUED lead
+    # was never dialed — even if external_call_id still holds an earlier attempt's call
+    cutoff = now - timedelta(seconds=settings.CALL_REAPER_TIMEOUT_SECONDS)
+    return (Lead.status == LeadStatus.QUEUED, Lead.updated_at < cutoff)
+
+
+async def _requeue_stuck_leads(now: datetime) -> int:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(Lead)
+            .where(*_stuck_lead_criteria(now))
+            .values(status=LeadStatus.PENDING)
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def reap_stuck_calls(redis, now: datetime | None = None) -> dict:
+    now = now or datetime.utcnow()
+    stats = {"checked": 0, "reconciled": 0, "unknown": 0, "deferred": 0, "errors": 0, "leads_requeued": 0}
+
+    if await abreaker_open(redis):
+        log.warning("[REAPER] Bolna circuit breaker open — skipping lookups")
+        call_ids = []
+    else:
+        call_ids = await _stuck_calls(now)
+    stats["checked"] = len(call_ids)
+
+    for call_id, execution in await _fetch_all(redis, call_ids):
+        if isinstance(execution, BolnaUnavailable):
+            stats["deferred"] += 1
+            continue
+
+        if isinstance(execution, Exception):
+            log.warning(f"[REAPER] Bolna lookup failed for {call_id}: {execution}")
+            stats["errors"] += 1
+            continue
+
+        if execution is None:
+            execution = {"id": call_id, "status": "failed"}
+            stats["unknown"] += 1
+        else:
+            execution.setdefault("id", call_id)
+
+        # Sessions are not concurrency-safe — apply results one at a time
+        async with AsyncSessionLocal() as db:
+            try:
+                await process_bolna_event(db, execution, redis)
+                stats["reconciled"] += 1
+            except Exception as e:
+                log.warning(f"[REAPER] Could not apply status for {call_id}: {e}")
+                stats["errors"] += 1
+
+    stats["leads_requeued"] = await _requeue_stuck_leads(now)
+    return stats
+
+
+async def _run() -> dict:
+    # Short-lived client — the shared async pool is bound to the API's event loop
+    redis = aioredis.from_url(settings.REDIS_URL)
+    try:
+        return await reap_stuck_calls(redis)
+    finally:
+        # Pool connections belong to this event loop — drop them before it closes
+        await engine.dispose()
+        await redis.aclose()
+
+
+@celery_app.task
+def reap_stuck_calls_task():
+    stats = asyncio.run(_run())
+    if stats["checked"] or stats["leads_requeued"]:
+        print(f"[REAPER] {stats}")
+    return stats
@@ -0,0 +1,81 @@
+"""
+app/tasks/scheduler_worker.py
+
+Wakes campaigns when their start time or next calling window arrives.
+
+Run one (or more, for redundancy) next to the Celery workers:
+    python -m app.tasks.scheduler_worker
+
+The loop sleeps until the earliest score in campaign:wakeups — or until a new
+wake-up is published, which may be earlier — then pops every due entry and
+enqueues a dispatcher tick for it. ZREM decides which scheduler wins a given
+entry, so running several never double-enqueues.
+
+The tick is handed the token of the lease the parked chain still holds, so it
+resumes that chain instead of being rejected as a competitor.
+"""
+
+import asyncio
+import logging
+import time
+
+from app.db.session import get_redis_pool
+from app.services.campaign_lease import LEASE_KEY
+from app.services.campaign_scheduler import WAKEUP_CHANNEL, WAKEUP_KEY
+from app.tasks.campaign_tasks import process_campaign
+
+log = logging.getLogger(__name__)
+
+MAX_SLEEP_SECONDS = 30.0
+
+
+async def _wake(redis, campaign_id: str) -> None:
+    token = await redis.hget(LEASE_KEY.format(campaign_id), "token")
+    process_campaign.apply_async(
+        args=[campaign_id, token.decode() if token else None],
+        queue="campaign_queue",
+    )
+    log.info(f"[SCHEDULER] Woke campaign {campaign_id}")
+
+
+async def _pop_due(redis) -> int:
+    due = await redis.zrangebyscore(WAKEUP_KEY, "-inf", time.time())
+    woken = 0
+    for member in due:
+        if await redis.zrem(WAKEUP_KEY, member):
+            await _wake(redis, member.decode())
+            woken += 1
+    return woken
+
+
+async def _seconds_until_next(redis) -> float:
+    head = await redis.zrange(WAKEUP_KEY, 0, 0, withscores=True)
+    if not head:
+        return MAX_SLEEP_SECONDS
+    return max(0.0, min(head[0][1] - time.time(), MAX_SLEEP_SECONDS))
+
+
+async def run() -> None:
+    redis = await get_redis_pool()
+    pubsub = redis.pubsub()
+    await pubsub.subscribe(WAKEUP_CHANNEL)
+    log.info("[SCHEDULER] Started")
+
+    try:
+        while True:
+            try:
+                await _pop_due(redis)
+                delay = await _seconds_until_next(redis)
+                # Returns early when a wake-up is added, so an earlier one is never missed
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=delay)
+            except Exception as e:
+                log.warning(f"[SCHEDULER] Loop error: {e}")
+                await asyncio.sleep(1)
+    finally:
+        await pubsub.unsubscribe(WAKEUP_CHANNEL)
+        await pubsub.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(run())
@@ -0,0 +1,258 @@
+"""
+bench/bolna_sim.py
+
+Fake Bolna for offline load tests of the dial → webhook loop.
+
+Run from backend/ and point the app at it:
+    python -m bench.bolna_sim --port 9000 --speedup 20
+    BOLNA_API_URL=http://localhost:9000 BOLNAMAKE_CALL_URL=http://localhost:9000 BOLNA_API_KEY=sim
+
+Endpoints
+  POST /call              accept a call, return its execution id, schedule its webhooks
+  GET  /agent/{id}        canned agent details
+  GET  /executions/{id}   latest state of a call (what the stuck-call reaper reads)
+  GET  /stats             counters, for the benchmark runners
+
+Every accepted call gets a simulated timeline, posted to the call's
+webhook_url (or --webhook-url):
+    initiated → ringing → in-progress → completed     (answered)
+    initiated → ringing → no-answer                   (--no-answer-rate)
+    initiated → failed                                (--failure-rate)
+Bodies have the same shape as Bolna execution records: durations, cost,
+transcript, summary, extracted_data and the call's metadata echoed back.
+
+All delays are divided by --speedup; the durations reported in the payloads
+are not. Pending events sit in one heap driven by a single timer task, and a
+fixed pool of sender tasks posts them over one pooled client, so tens of
+thousands of concurrent calls cost a heap entry each, not a task each.
+/call itself can be made slow or flaky (--call-latency, --call-error-rate)
+to exercise the circuit breaker.
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import random
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+MAX_EXECUTIONS = 500_000   # oldest execution records are forgotten past this
+
+_LINES = [
+    ("agent", "Hello, this is Riya calling from {company}. Is this a good time to talk?"),
+    ("user", "Yes, go ahead."),
+    ("agent", "We're offering a free consultation this week. Would you be interested?"),
+    ("user", "{answer}"),
+    ("agent", "Thank you for your time. Have a great day!"),
+]
+_ANSWERS = {
+    "high":   "Sure, that sounds useful. Can you book me for Thursday?",
+    "medium": "Maybe, send me the details on WhatsApp.",
+    "low":    "Not really interested, thanks.",
+}
+SENTIMENT = {"high": "positive", "medium": "neutral", "low": "negative"}
+
+
+def transcript_for(interest: str) -> str:
+    """A short agent/user transcript ending with a `interest`-level answer."""
+    return "\n".join(
+        f"{who}: {text.format(company='Acme', answer=_ANSWERS[interest])}" for who, text in _LINES
+    )
+
+
+class Simulator:
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.heap: list[tuple[float, int, str, dict]] = []
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=args.webhook_concurrency * 100)
+        self.executions: OrderedDict[str, dict] = OrderedDict()
+        self.stats: Counter = Counter()
+        self.client: httpx.AsyncClient | None = None
+
+    # ─── Timeline ─────────────────────────────────────────────────────────
+
+    def _at(self, offset_seconds: float) -> float:
+        return time.monotonic() + offset_seconds / self.args.speedup
+
+    def _push(self, offset_seconds: float, url: str, body: dict) -> None:
+        heapq.heappush(self.heap, (self._at(offset_seconds), next(self._seq), url, body))
+        self._wake.set()
+
+    def schedule_call(self, call_id: str, request: dict) -> None:
+        args, rng = self.args, self.rng
+        url = args.webhook_url or request.get("webhook_url")
+        if not url:
+            return
+        if args.webhook_token:
+            url += ("&" if "?" in url else "?") + f"token={args.webhook_token}"
+
+        base = {
+            "id": call_id,
+            "agent_id": request.get("agent_id"),
+            "metadata": request.get("metadata") or {},
+            "telephony_data": {"to_number": request.get("recipient_phone_number")},
+        }
+
+        def event(status: str, **fields) -> dict:
+            return {**base, "status": status, **fields}
+
+        self._push(0.2, url, event("initiated"))
+
+        roll = rng.random()
+        if roll < args.failure_rate:
+            self._push(1.0, url, event("failed", error_message="Carrier rejected the call"))
+            return
+
+        ring = rng.uniform(2, args.max_ring_seconds)
+        self._push(1.0, url, event("ringing"))
+
+        if roll < args.failure_rate + args.no_answer_rate:
+            self._push(ring, url, event("no-answer"))
+            return
+
+        talk = max(5.0, rng.gauss(args.talk_seconds, args.talk_seconds / 3))
+        interest = rng.choice(("high", "medium", "low"))
+        self._push(ring, url, event("in-progress"))
+        self._push(ring + talk, url, event(
+            "completed",
+            conversation_duration=round(talk, 1),
+            total_cost=round(talk / 60 * 0.05, 4),
+            transcript=transcript_for(interest),
+            summary=f"Customer showed {interest} interest in the consultation offer.",
+            extracted_data={"customer_sentiment": SENTIMENT[interest], "interest_level": interest},
+            telephony_data={
+                **base["telephony_data"],
+                "duration": round(talk, 1),
+                "recording_url": f"https://recordings.invalid/{call_id}.mp3",
+            },
+        ))
+
+    # ─── Event loop side ──────────────────────────────────────────────────
+
+    async def timer(self) -> None:
+        """Move due events from the heap to the send queue."""
+        while True:
+            now = time.monotonic()
+            while self.heap and self.heap[0][0] <= now:
+                _, _, url, body = heapq.heappop(self.heap)
+                await self.queue.put((url, body))
+            self._wake.clear()
+            timeout = self.heap[0][0] - time.monotonic() if self.heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def sender(self) -> None:
+        while True:
+            url, body = await self.queue.get()
+            body["updated_at"] = datetime.now(timezone.utc).isoformat()
+            self._record(body)
+            started = time.perf_counter()
+            try:
+                response = await self.client.post(url, json=body)
+                self.stats[f"webhook_{response.status_code // 100}xx"] += 1
+            except httpx.HTTPError:
+                self.stats["webhook_errors"] += 1
+            self.stats["webhook_seconds_total"] += time.perf_counter() - started
+            self.queue.task_done()
+
+    def _record(self, body: dict) -> None:
+        self.executions[body["id"]] = body
+        self.executions.move_to_end(body["id"])
+        if len(self.executions) > MAX_EXECUTIONS:
+            self.executions.popitem(last=False)
+        self.stats[f"status_{body['status']}"] += 1
+
+
+def build_app(args: argparse.Namespace) -> FastAPI:
+    sim = Simulator(args)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        sim.client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=args.webhook_concurrency),
+        )
+        tasks = [asyncio.create_task(sim.timer())]
+        tasks.extend(asyncio.create_task(sim.sender()) for _ in range(args.webhook_concurrency))
+        yield
+        for task in tasks:
+            task.cancel()
+        await sim.client.aclose()
+
+    app = FastAPI(title="Bolna simulator", lifespan=lifespan)
+
+    @app.post("/call")
+    async def call(request: Request):
+        body = await request.json()
+        if args.call_latency:
+            await asyncio.sleep(sim.rng.expovariate(1 / args.call_latency))
+        if sim.rng.random() < args.call_error_rate:
+            sim.stats["call_rejected"] += 1
+            raise HTTPException(status_code=503, detail="Simulated Bolna outage")
+        if not body.get("recipient_phone_number"):
+            raise HTTPException(status_code=400, detail="recipient_phone_number is required")
+
+        call_id = str(uuid.uuid4())
+        sim.stats["calls"] += 1
+        sim.executions[call_id] = {"id": call_id, "status": "queued", "metadata": body.get("metadata") or {}}
+        sim.schedule_call(call_id, body)
+        return {"message": "done", "status": "queued", "execution_id": call_id}
+
+    @app.get("/agent/{agent_id}")
+    async def agent(agent_id: str):
+        return {
+            "id": agent_id,
+            "agent_name": f"Simulated agent {agent_id[:8]}",
+            "agent_status": "processed",
+            "agent_welcome_message": "Hello, this is Riya calling from Acme.",
+        }
+
+    @app.get("/executions/{execution_id}")
+    async def execution(execution_id: str):
+        record = sim.executions.get(execution_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Execution not found")
+        return record
+
+    @app.get("/stats")
+    async def stats():
+        return {**sim.stats, "pending_events": len(sim.heap), "send_queue": sim.queue.qsize()}
+
+    return app
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Fake Bolna API for load tests")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=9000)
+    p.add_argument("--webhook-url", help="override the webhook_url sent with each call")
+    p.add_argument("--webhook-token", help="appended as ?token= (BOLNA_WEBHOOK_SECRET)")
+    p.add_argument("--webhook-concurrency", type=int, default=200, help="parallel webhook POSTs")
+    p.add_argument("--speedup", type=float, default=1.0, help="divide every simulated delay by this")
+    p.add_argument("--failure-rate", type=float, default=0.05)
+    p.add_argument("--no-answer-rate", type=float, default=0.25)
+    p.add_argument("--max-ring-seconds", type=float, default=20.0)
+    p.add_argument("--talk-seconds", type=float, default=90.0, help="mean answered-call duration")
+    p.add_argument("--call-latency", type=float, default=0.0, help="mean /call response delay, seconds")
+    p.add_argument("--call-error-rate", type=float, default=0.0, help="share of /call requests answered 503")
+    p.add_argument("--seed", type=int)
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    uvicorn.run(build_app(args), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,53 @@
+"""
+bench/compare.py
+
+Side-by-side diff of two bench.run result files.
+
+    python -m bench.compare bench/results/<old>.json bench/results/<new>.json
+
+Prints every numeric metric with its relative change. Latencies (…_ms) going
+up and throughputs (…_per_second) going down by more than --threshold percent
+are flagged as regressions, and the exit status is 1 if any were found.
+"""
+
+import argparse
+import json
+
+
+def _flatten(tree: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in tree.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    before, after = _flatten(old["scenarios"]), _flatten(new["scenarios"])
+    regressions = []
+    print(f"{'metric':<48} {old.get('commit') or '?':>12} {new.get('commit') or '?':>12}   change")
+    for metric in sorted(before.keys() & after.keys()):
+        a, b = before[metric], after[metric]
+        change = (b - a) / a * 100 if a else 0.0
+        worse = (metric.endswith("_ms") and change > threshold) or (
+            metric.endswith("_per_second") and change < -threshold
+        )
+        if worse:
+            regressions.append(metric)
+        print(f"{metric:<48} {a:>12.2f} {b:>12.2f}   {change:+7.1f}%{'  ← regression' if worse else ''}")
+    return regressions
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Compare two benchmark result files")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=10.0, help="percent change flagged as a regression")
+    args = p.parse_args()
+
+    with open(args.old) as f_old, open(args.new) as f_new:
+        regressions = compare(json.load(f_old), json.load(f_new), args.threshold)
+    raise SystemExit(1 if regressions else 0)
@@ -0,0 +1,250 @@
+"""
+bench/generate.py
+
+Synthetic tenants for benchmarks — seeds the configured Postgres with
+organizations, admins, wallets, campaigns, leads and call logs (with
+compressed transcripts for the answered calls).
+
+Run from backend/ against a throwaway database (after `alembic upgrade head`):
+    python -m bench.generate --orgs 20 --campaigns 5 --leads 10000 --call-logs 5000
+
+That is 20 orgs × 5 campaigns × 10 000 leads = 1M leads and 500k call logs.
+Tenant sizes are skewed (--skew): the first org gets the most leads, as in
+production where a few large customers dominate.
+
+Rows are inserted with Core executemany in chunks, one transaction per chunk.
+Ids and the admin password go to a manifest (bench/tenants.json by
+default) that the scenario runners read.
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, text
+
+from app.core.security import hash_password
+from app.db.engine import get_sync_engine
+from app.models.call_logs import CallLog
+from app.models.call_transcript import CallTranscript
+from app.models.campaigns import Campaign, CampaignStatus
+from app.models.lead import Lead, LeadStatus
+from app.models.organization import Organization
+from app.models.user import User, UserRole
+from app.models.wallet import Wallet
+from app.services.transcript_store import SEARCH_CONFIG, compressed_columns
+from app.tasks.maintenance_tasks import add_months, ensure_partition, month_start
+from bench.bolna_sim import SENTIMENT, transcript_for
+
+CHUNK = 10_000
+TIERS = ("free", "standard", "premium", "enterprise")
+
+
+def _chunks(rows, size: int = CHUNK):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _insert(engine, table, rows) -> int:
+    total = 0
+    for chunk in _chunks(rows):
+        with engine.begin() as conn:
+            conn.execute(insert(table), chunk)
+        total += len(chunk)
+    return total
+
+
+def _lead_rows(rng, org_id, campaign_id, count: int):
+    now = datetime.utcnow()
+    for i in range(count):
+        yield {
+            "id": uuid.uuid4(),
+            "organization_id": org_id,
+            "campaign_id": campaign_id,
+            "phone": f"9{i:09d}",
+            "status": LeadStatus.PENDING,
+            "attempts": 0,
+            "retry_count": 0,
+            "max_retries": 3,
+            "next_attempt_at": now,
+            "custom_fields": {"name": f"Lead {i}", "city": rng.choice(("Pune", "Delhi", "Mumbai"))},
+            "created_at": now - timedelta(seconds=rng.randint(0, 30 * 86400)),
+        }
+
+
+def _call_log_rows(rng, campaign_id, lead_ids: list, count: int, days: int):
+    now = datetime.utcnow()
+    for _ in range(count):
+        created = now - timedelta(seconds=rng.randint(0, days * 86400))
+        status = rng.choices(("completed", "no-answer", "failed"), (70, 25, 5))[0]
+        answered = status == "completed"
+        interest = rng.choice(("high", "medium", "low"))
+        duration = rng.randint(20, 300) if answered else 0
+        yield {
+            "id": uuid.uuid4(),
+            "external_call_id": str(uuid.uuid4()),
+            "campaign_id": campaign_id,
+            "lead_id": rng.choice(lead_ids),
+            "user_number": f"+91{rng.randint(7_000_000_000, 9_999_999_999)}",
+            "duration": duration,
+            "cost": round(duration / 60 * 0.05, 4),
+            "status": status,
+            "interest_level": interest if answered else None,
+            "customer_sentiment": SENTIMENT[interest] if answered else None,
+            "executed_at": created,
+            "created_at": created,
+        }
+
+
+def _transcript_rows(logs: list):
+    """call_transcripts rows for the answered calls in `logs`."""
+    for log in logs:
+        interest = log["interest_level"]
+        if interest is None:
+            continue
+        transcript, summary = transcript_for(interest), f"Customer showed {interest} interest."
+        yield {
+            "call_log_id": log["id"],
+            "call_log_created_at": log["created_at"],
+            "campaign_id": log["campaign_id"],
+            "customer_sentiment": log["customer_sentiment"],
+            "interest_level": interest,
+            "transcript_text": transcript,
+            "summary_text": summary,
+            **compressed_columns(transcript, summary),
+        }
+
+
+def _insert_transcripts(engine, rows) -> int:
+    """Like _insert, with search_vector built by Postgres from the plain-text params."""
+    stmt = insert(CallTranscript.__table__).values(search_vector=text(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, :summary_text), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, :transcript_text), 'B')"
+    ))
+    total = 0
+    for chunk in _chunks(rows):
+        with engine.begin() as conn:
+            conn.execute(stmt, chunk)
+        total += len(chunk)
+    return total
+
+
+def generate(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    engine = get_sync_engine()
+    run = f"{rng.randint(0, 99999):05d}"
+    password_hash = hash_password(args.password)   # bcrypt once, reused for every admin
+    started = time.perf_counter()
+    manifest = {"run": run, "password": args.password, "orgs": [], "super_admin": None}
+    counts = {"orgs": 0, "campaigns": 0, "leads": 0, "call_logs": 0}
+
+    # Call log partitions for every month the generated timestamps can fall in
+    with engine.begin() as conn:
+        month = month_start(date.today() - timedelta(days=args.days))
+        while month <= month_start(date.today()):
+            ensure_partition(conn, month)
+            month = add_months(month, 1)
+
+    for o in range(args.orgs):
+        org_id = uuid.uuid4()
+        admin_id = uuid.uuid4()
+        # Zipf-like: org o gets 1 / (o + 1)^skew of the first org's leads
+        scale = 1 / (o + 1) ** args.skew
+        with engine.begin() as conn:
+            conn.execute(insert(Organization.__table__), [{
+                "id": org_id,
+                "name": f"Bench Org {o}",
+                "slug": f"bench-{run}-{o}",
+                "is_active": True,
+                "timezone": "Asia/Kolkata",
+                "tier": TIERS[o % len(TIERS)],
+            }])
+            users = [{
+                "id": admin_id,
+                "organization_id": org_id,
+                "email": f"admin-{o}@bench-{run}.test",
+                "password_hash": password_hash,
+                "role": UserRole.ADMIN,
+                "is_active": True,
+            }]
+            if o == 0:
+                manifest["super_admin"] = {"id": str(uuid.uuid4()), "email": f"root@bench-{run}.test"}
+                users.append({
+                    "id": uuid.UUID(manifest["super_admin"]["id"]),
+                    "organization_id": org_id,
+                    "email": manifest["super_admin"]["email"],
+                    "password_hash": password_hash,
+                    "role": UserRole.SUPER_ADMIN,
+                    "is_active": True,
+                })
+            conn.execute(insert(User.__table__), users)
+            conn.execute(insert(Wallet.__table__), [{
+                "organization_id": org_id,
+                "minutes_balance": 10_000_000,
+                "rate_per_minute": 1.0,
+            }])
+
+        org = {"id": str(org_id), "admin_id": str(admin_id), "email": users[0]["email"], "campaigns": []}
+        for c in range(args.campaigns):
+            campaign_id = uuid.uuid4()
+            with engine.begin() as conn:
+                conn.execute(insert(Campaign.__table__), [{
+                    "id": campaign_id,
+                    "name": f"Bench campaign {o}.{c}",
+                    "organization_id": org_id,
+                    "bolna_agent_id": f"bench-agent-{o}",
+                    "status": CampaignStatus.draft,
+                    "call_delay_seconds": 0,
+                }])
+
+            leads = list(_lead_rows(rng, org_id, campaign_id, max(1, int(args.leads * scale))))
+            counts["leads"] += _insert(engine, Lead.__table__, leads)
+            lead_ids = [lead["id"] for lead in leads]
+            del leads
+
+            logs = list(_call_log_rows(rng, campaign_id, lead_ids, max(1, int(args.call_logs * scale)), args.days))
+            counts["call_logs"] += _insert(engine, CallLog.__table__, logs)
+            _insert_transcripts(engine, _transcript_rows(logs))
+            del logs
+
+            org["campaigns"].append(str(campaign_id))
+            counts["campaigns"] += 1
+
+        manifest["orgs"].append(org)
+        counts["orgs"] += 1
+        print(f"[BENCH] org {o + 1}/{args.orgs} — {counts['leads']} leads, {counts['call_logs']} call logs so far")
+
+    manifest["counts"] = counts
+    manifest["seconds"] = round(time.perf_counter() - started, 1)
+    return manifest
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Seed synthetic tenants for benchmarks")
+    p.add_argument("--orgs", type=int, default=10)
+    p.add_argument("--campaigns", type=int, default=5, help="campaigns per org")
+    p.add_argument("--leads", type=int, default=10_000, help="leads per campaign of the largest org")
+    p.add_argument("--call-logs", type=int, default=5_000, help="call logs per campaign of the largest org")
+    p.add_argument("--skew", type=float, default=0.5, help="0 = equal tenants; higher = more skewed")
+    p.add_argument("--days", type=int, default=60, help="spread call logs over this many days")
+    p.add_argument("--password", default="bench-password", help="password of every generated admin")
+    p.add_argument("--manifest", default="bench/tenants.json")
+    p.add_argument("--seed", type=int, default=42)
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    manifest = generate(args)
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"[BENCH] Seeded {manifest['counts']} in {manifest['seconds']}s → {args.manifest}")
@@ -0,0 +1,92 @@
+"""
+bench/run.py
+
+Runs benchmark scenarios against a running API and writes the results as JSON.
+
+    python -m bench.run --base-url http://localhost:8000 --scenarios webhook,analytics,admin,auth
+    python -m bench.compare bench/results/<old>.json bench/results/<new>.json
+
+Needs the manifest from bench.generate and the same .env as the API (it
+mints tokens with SECRET_KEY and reads seeded rows from the database).
+Results go to bench/results/<timestamp>-<git sha>.json unless --out is given.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from bench.scenarios import SCENARIOS, Context
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    results = {
+        "commit": _git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "host": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "dataset": manifest.get("counts"),
+        "settings": {"iterations": args.iterations, "concurrency": args.concurrency},
+        "scenarios": {},
+    }
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120, limits=limits) as client:
+        ctx = Context(client, manifest, args.iterations, args.concurrency, args.duration)
+        for name in args.scenarios.split(","):
+            print(f"[BENCH] {name} …")
+            started = time.perf_counter()
+            try:
+                result = await SCENARIOS[name](ctx)
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            result["wall_seconds"] = round(time.perf_counter() - started, 2)
+            results["scenarios"][name] = result
+            print(f"[BENCH] {name}: {json.dumps(result)}")
+
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Run benchmark scenarios")
+    p.add_argument("--base-url", default="http://localhost:8000")
+    p.add_argument("--scenarios", default="csv_upload,webhook,analytics,admin,auth",
+                   help=f"comma-separated, from: {', '.join(SCENARIOS)}")
+    p.add_argument("--iterations", type=int, default=200, help="requests per endpoint")
+    p.add_argument("--concurrency", type=int, default=20)
+    p.add_argument("--duration", type=float, default=30.0, help="dispatch scenario length, seconds")
+    p.add_argument("--manifest", default="bench/tenants.json")
+    p.add_argument("--out")
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(run(args))
+    out = args.out or os.path.join(
+        "bench", "results", f"{datetime.now():%Y%m%d-%H%M%S}-{results['commit'] or 'nogit'}.json"
+    )
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"[BENCH] Results → {out}")
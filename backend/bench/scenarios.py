@@ -0,0 +1,237 @@
+"""
+bench/scenarios.py
+
+Benchmark scenarios. Each takes a Context and returns a dict of numbers;
+bench/run.py runs them and writes the results as JSON.
+
+  csv_upload  POST leads/upload with generated CSVs            → rows/s
+  webhook     POST Bolna status events for seeded call logs    → events/s, p50/p99
+  analytics   campaign analytics, logs, transcript search      → p50/p99 per endpoint
+  admin       super admin dashboard and org endpoints          → p50/p99 per endpoint
+  auth        get_current_user in-process vs. decoding only    → per-request overhead
+  dispatch    start seeded campaigns, count dials              → dials/s
+              (needs Celery workers and bench.bolna_sim running)
+
+Latencies are reported in milliseconds.
+"""
+
+import asyncio
+import io
+import math
+import random
+import time
+from dataclasses import dataclass, field
+
+import httpx
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.security import create_access_token, decode_token
+from app.db.engine import get_sync_engine
+from app.models.call_logs import CallLog
+from app.models.lead import Lead
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    manifest: dict
+    iterations: int = 200
+    concurrency: int = 20
+    duration: float = 30.0
+    _tokens: dict[str, str] = field(default_factory=dict)
+
+    def token(self, user_id: str, org_id: str) -> str:
+        if user_id not in self._tokens:
+            self._tokens[user_id] = create_access_token(user_id, org_id)
+        return self._tokens[user_id]
+
+    def admin_headers(self, org: dict) -> dict:
+        return {"Authorization": f"Bearer {self.token(org['admin_id'], org['id'])}"}
+
+    def super_admin_headers(self) -> dict:
+        root = self.manifest["super_admin"]
+        return {"Authorization": f"Bearer {self.token(root['id'], self.manifest['orgs'][0]['id'])}"}
+
+
+def summarize(samples: list[float]) -> dict:
+    """Seconds → count, mean and percentiles in ms."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return round(ordered[max(0, math.ceil(p * len(ordered)) - 1)] * 1000, 2)   # nearest rank
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p50_ms": pct(0.50),
+        "p90_ms": pct(0.90),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+async def _timed(samples: list[float], coro) -> httpx.Response:
+    start = time.perf_counter()
+    response = await coro
+    samples.append(time.perf_counter() - start)
+    response.raise_for_status()
+    return response
+
+
+async def _hammer(ctx: Context, make_request, total: int) -> tuple[list[float], float]:
+    """Run `total` requests, `ctx.concurrency` at a time. Returns (latencies, wall seconds)."""
+    samples: list[float] = []
+    semaphore = asyncio.Semaphore(ctx.concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await _timed(samples, make_request(i))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return samples, time.perf_counter() - started
+
+
+# ─── Scenarios ────────────────────────────────────────────────────────────────
+
+async def csv_upload(ctx: Context, rows: int = 10_000, uploads: int = 3) -> dict:
+    org = ctx.manifest["orgs"][0]
+    campaign_id = org["campaigns"][0]
+    prefix = random.randint(100, 999)
+    samples: list[float] = []
+
+    for u in range(uploads):
+        body = io.StringIO()
+        body.write("phone,name,city\n")
+        for i in range(rows):
+            body.write(f"8{prefix}{u:02d}{i:07d},Upload {i},Pune\n")
+        await _timed(samples, ctx.client.post(
+            f"/api/v1/campaigns/{campaign_id}/leads/upload",
+            headers=ctx.admin_headers(org),
+            files={"file": ("leads.csv", body.getvalue().encode(), "text/csv")},
+        ))
+
+    return {"rows_per_upload": rows, "rows_per_second": round(rows * uploads / sum(samples), 1), **summarize(samples)}
+
+
+async def webhook(ctx: Context) -> dict:
+    with get_sync_engine().connect() as conn:
+        calls = conn.execute(
+            select(CallLog.external_call_id, CallLog.lead_id, CallLog.campaign_id).limit(ctx.iterations)
+        ).all()
+    if not calls:
+        return {"error": "no call logs — run bench.generate first"}
+
+    url = "/api/v1/bolna/webhook"
+    if settings.BOLNA_WEBHOOK_SECRET:
+        url += f"?token={settings.BOLNA_WEBHOOK_SECRET}"
+    statuses = ("ringing", "in-progress", "completed")
+
+    def event(i: int):
+        call_id, lead_id, campaign_id = calls[i % len(calls)]
+        status = statuses[i // len(calls) % len(statuses)]
+        return ctx.client.post(url, json={
+            "id": call_id,
+            "status": status,
+            "conversation_duration": 60 if status == "completed" else 0,
+            "metadata": {"lead_id": str(lead_id), "campaign_id": str(campaign_id)},
+        })
+
+    samples, wall = await _hammer(ctx, event, ctx.iterations * len(statuses))
+    return {"events_per_second": round(len(samples) / wall, 1), **summarize(samples)}
+
+
+async def analytics(ctx: Context) -> dict:
+    org = ctx.manifest["orgs"][0]
+    campaign_id = org["campaigns"][0]
+    headers = ctx.admin_headers(org)
+    result = {}
+    for name, path in (
+        ("analytics", f"/api/v1/campaigns/{campaign_id}/analytics"),
+        ("logs", f"/api/v1/campaigns/{campaign_id}/logs"),
+        ("logs_projected", f"/api/v1/campaigns/{campaign_id}/logs?fields=id,status,duration&limit=500"),
+        ("transcript_search", f'/api/v1/campaigns/{campaign_id}/transcripts/search?q="not interested"'),
+        ("wallet_summary", "/api/v1/summary"),
+    ):
+        samples, _ = await _hammer(ctx, lambda i: ctx.client.get(path, headers=headers), ctx.iterations)
+        result[name] = summarize(samples)
+    return result
+
+
+async def admin(ctx: Context) -> dict:
+    headers = ctx.super_admin_headers()
+    org_id = ctx.manifest["orgs"][0]["id"]
+    result = {}
+    for name, path in (
+        ("dashboard", "/api/v1/admin/dashboard"),
+        ("organizations", "/api/v1/admin/organizations"),
+        ("organization", f"/api/v1/admin/organizations/{org_id}"),
+    ):
+        samples, _ = await _hammer(ctx, lambda i: ctx.client.get(path, headers=headers), ctx.iterations)
+        result[name] = summarize(samples)
+    return result
+
+
+async def auth(ctx: Context) -> dict:
+    # Imported here: the dependency pulls in the async engine and Redis pool
+    from app.core.deps import get_current_user
+    from app.db.session import AsyncSessionLocal, get_redis_pool
+
+    org = ctx.manifest["orgs"][0]
+    token = ctx.token(org["admin_id"], org["id"])
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    redis = await get_redis_pool()
+
+    decode_only: list[float] = []
+    for _ in range(ctx.iterations):
+        start = time.perf_counter()
+        decode_token(token)
+        decode_only.append(time.perf_counter() - start)
+
+    full: list[float] = []
+    for _ in range(ctx.iterations):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await get_current_user(credentials, db, redis)
+            full.append(time.perf_counter() - start)
+
+    result = {"decode_token": summarize(decode_only), "get_current_user": summarize(full)}
+    result["overhead_p50_ms"] = result["get_current_user"]["p50_ms"]
+    return result
+
+
+async def dispatch(ctx: Context, campaigns: int = 5) -> dict:
+    targets = [(org, cid) for org in ctx.manifest["orgs"] for cid in org["campaigns"]][:campaigns]
+    ids = [cid for _, cid in targets]
+
+    def dialed() -> int:
+        with get_sync_engine().connect() as conn:
+            return conn.scalar(select(func.coalesce(func.sum(Lead.attempts), 0)).where(Lead.campaign_id.in_(ids)))
+
+    before = dialed()
+    for org, cid in targets:
+        await _timed([], ctx.client.post(f"/api/v1/campaigns/{cid}/start", headers=ctx.admin_headers(org)))
+
+    started = time.perf_counter()
+    await asyncio.sleep(ctx.duration)
+    total = dialed() - before
+    elapsed = time.perf_counter() - started
+
+    for org, cid in targets:
+        await ctx.client.post(f"/api/v1/campaigns/{cid}/stop", headers=ctx.admin_headers(org))
+
+    return {"campaigns": len(targets), "dials": total, "dials_per_second": round(total / elapsed, 2)}
+
+
+SCENARIOS = {
+    "csv_upload": csv_upload,
+    "webhook": webhook,
+    "analytics": analytics,
+    "admin": admin,
+    "auth": auth,
+    "dispatch": dispatch,
+}
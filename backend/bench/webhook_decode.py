@@ -0,0 +1,95 @@
+"""
+bench/webhook_decode.py
+
+Micro-benchmark: decode cost per Bolna webhook event.
+
+    python -m bench.webhook_decode --iterations 50000
+
+Compares the typed decoder (app/schemas/webhook.py, pydantic-core straight
+from bytes) with the previous json.loads + dict.get-chain extraction, on a
+small status event and on a completed event with transcript.
+"""
+
+import argparse
+import json
+import timeit
+
+from app.schemas.webhook import BolnaWebhook
+from bench.bolna_sim import transcript_for
+
+STATUS_EVENT = {
+    "id": "0b5c2c5e-6a43-4c8e-9a8d-0f3c1b1f2a11",
+    "status": "ringing",
+    "agent_id": "agent-1",
+    "telephony_data": {"to_number": "+919876543210"},
+    "metadata": {"campaign_id": "c-1", "lead_id": "l-1"},
+    "updated_at": "2026-01-01T10:00:00+00:00",
+}
+COMPLETED_EVENT = {
+    **STATUS_EVENT,
+    "status": "completed",
+    "conversation_duration": 92.4,
+    "total_cost": 0.077,
+    "transcript": transcript_for("high") * 5,
+    "summary": "Customer showed high interest in the consultation offer.",
+    "extracted_data": {"customer_sentiment": "positive", "interest_level": "high"},
+    "telephony_data": {"to_number": "+919876543210", "duration": 92.4, "recording_url": "https://r.invalid/x.mp3"},
+    "context_details": {"recipient_phone_number": "+919876543210", "recipient_data": {"name": "A"}},
+}
+
+
+def _dict_chains(raw: bytes) -> tuple:
+    """The extraction the webhook did before the typed schema."""
+    root = json.loads(raw)
+    payload = root["data"] if isinstance(root.get("data"), dict) else root
+    phone = (
+        payload.get("user_number")
+        or payload.get("phone_number")
+        or payload.get("recipient_phone_number")
+        or payload.get("context_details", {}).get("recipient_phone_number")
+        or payload.get("telephony_data", {}).get("to_number")
+    )
+    duration = payload.get("conversation_duration")
+    if duration is None:
+        duration = payload.get("telephony_data", {}).get("duration", 0)
+    try:
+        duration = float(duration or 0)
+    except Exception:
+        duration = 0.0
+    try:
+        cost = float(payload.get("total_cost", 0) or 0)
+    except Exception:
+        cost = 0.0
+    extracted = payload.get("extracted_data", {}) or {}
+    return (
+        payload.get("call_id") or payload.get("id"), payload.get("status"), phone, duration, cost,
+        extracted.get("customer_sentiment"), extracted.get("interest_level"),
+        payload.get("metadata") or root.get("metadata") or {},
+    )
+
+
+def _typed(raw: bytes) -> tuple:
+    _, e = BolnaWebhook.decode(raw)
+    return (
+        e.external_id, e.status, e.phone, e.duration, e.cost,
+        e.customer_sentiment, e.interest_level, e.metadata or {},
+    )
+
+
+def run(iterations: int) -> dict:
+    results = {}
+    for name, body in (("status_event", STATUS_EVENT), ("completed_event", COMPLETED_EVENT)):
+        raw = json.dumps(body).encode()
+        assert _typed(raw) == _dict_chains(raw), name
+        results[name] = {"bytes": len(raw)}
+        for label, fn in (("typed", _typed), ("dict_chains", _dict_chains)):
+            seconds = min(timeit.repeat(lambda: fn(raw), number=iterations, repeat=3))
+            results[name][f"{label}_us_per_event"] = round(seconds / iterations * 1e6, 2)
+    return results
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Webhook payload decode micro-benchmark")
+    p.add_argument("--iterations", type=int, default=50_000)
+    args = p.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
@@ -1,6 +1,4 @@
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy import select
 
 # Load env
@@ -8,13 +6,10 @@ import sys
 sys.path.insert(0, "/absolute/path/backend")
 
 from app.models.lead import Lead
-from app.core.config import settings
+from app.db.session import AsyncSessionLocal
 
 async def check_leads():
-    engine = create_async_engine(settings.DATABASE_URL)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
-    async with async_session() as session:
+    async with AsyncSessionLocal() as session:
         result = await session.execute(select(Lead))
         leads = result.scalars().all()
         
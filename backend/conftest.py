@@ -0,0 +1,36 @@
+"""
+Shared pytest fixtures.
+"""
+import pytest
+
+
+@pytest.fixture
+def assert_constant_queries():
+    """
+    Fails the test when an endpoint's query count grows with the data size (N+1).
+
+        def test_org_campaigns(client, seed_campaigns, assert_constant_queries):
+            assert_constant_queries(
+                seed=seed_campaigns,                      # seed(n) → create n rows
+                request=lambda: client.get("/api/v1/admin/organizations/x/campaigns"),
+                sizes=(2, 20),
+            )
+
+    `request` returns a response; its X-DB-Queries header (QueryCountMiddleware)
+    is the count compared across sizes.
+    """
+    def check(seed, request, sizes=(2, 20), slack=0):
+        counts = {}
+        for n in sizes:
+            seed(n)
+            response = request()
+            header = response.headers.get("x-db-queries")
+            assert header is not None, "response has no X-DB-Queries header — is QueryCountMiddleware installed?"
+            counts[n] = int(header)
+
+        smallest, largest = counts[min(sizes)], counts[max(sizes)]
+        if largest > smallest + slack:
+            pytest.fail(f"query count grows with data size (N+1?): {counts}")
+        return counts
+
+    return check
@@ -4,14 +4,14 @@ Run this ONCE after migrations to create your Super Admin account.
     cd backend
     python create_super_admin.py
 """
-import asyncio, os
+import asyncio
 from dotenv import load_dotenv
 load_dotenv()
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy import select
 
+from app.db.session import AsyncSessionLocal
+
 from app.models.organization import Organization
 from app.models.user import User, UserRole
 from app.core.security import hash_password
@@ -23,10 +23,7 @@ LAST_NAME  = "Admin"
 ORG_SLUG   = "platform-admin"                # ← used at login, keep secret
 
 async def main():
-    engine = create_async_engine(os.getenv("DATABASE_URL"), echo=False)
-    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-    async with Session() as db:
+    async with AsyncSessionLocal() as db:
         if (await db.execute(select(User).where(User.email == EMAIL))).scalar_one_or_none():
             print(f"Super Admin '{EMAIL}' already exists.")
             return
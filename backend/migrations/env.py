@@ -4,6 +4,8 @@ from app.models.user import User                   # 2. Then User
 from app.models.organization import Organization   # 3. Then Organization
 from app.models.campaigns import Campaign          # 4. Then Campaign
 from app.models.lead import Lead 
+from app.models.call_logs import CallLog
+from app.models.call_transcript import CallTranscript
 
 import os
 from dotenv import load_dotenv
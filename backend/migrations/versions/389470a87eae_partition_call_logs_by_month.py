@@ -0,0 +1,121 @@
+"""partition call_logs by month on created_at
+
+Revision ID: 389470a87eae
+Revises: 1d661350aa28
+Create Date: 2026-10-19 10:12:41.118203
+
+Rebuilds call_logs as a declaratively RANGE-partitioned table:
+  1. rename the existing table out of the way
+  2. create the partitioned parent (PK and external_call_id uniqueness now
+     include created_at — Postgres requires the partition key in both)
+  3. create monthly partitions covering the existing data plus 3 months ahead
+  4. copy rows across and drop the old table
+
+Run during a quiet window: the copy holds a lock on call_logs for its duration.
+After this, app.tasks.maintenance_tasks keeps future partitions created.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '389470a87eae'
+down_revision: Union[str, Sequence[str], None] = '1d661350aa28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_COLUMNS = (
+    "id, campaign_id, lead_id, user_number, duration, cost, status, recording_url, "
+    "transcript, scheduled_at, executed_at, username, interest_level, appointment_booked, "
+    "appointment_date, appointment_mode, customer_sentiment, final_call_summary, summary, "
+    "transfer_call, external_call_id"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE call_logs RENAME TO call_logs_legacy")
+    op.execute("ALTER INDEX call_logs_pkey RENAME TO call_logs_legacy_pkey")
+    op.execute("ALTER INDEX ix_call_logs_external_call_id RENAME TO ix_call_logs_legacy_external_call_id")
+
+    op.create_table('call_logs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('campaign_id', sa.UUID(), nullable=True),
+    sa.Column('lead_id', sa.UUID(), nullable=True),
+    sa.Column('user_number', sa.String(), nullable=True),
+    sa.Column('duration', sa.Integer(), nullable=True),
+    sa.Column('cost', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('recording_url', sa.Text(), nullable=True),
+    sa.Column('transcript', sa.Text(), nullable=True),
+    sa.Column('scheduled_at', sa.DateTime(), nullable=True),
+    sa.Column('executed_at', sa.DateTime(), nullable=True),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.Column('interest_level', sa.String(), nullable=True),
+    sa.Column('appointment_booked', sa.Boolean(), nullable=True),
+    sa.Column('appointment_date', sa.DateTime(), nullable=True),
+    sa.Column('appointment_mode', sa.String(), nullable=True),
+    sa.Column('customer_sentiment', sa.String(), nullable=True),
+    sa.Column('final_call_summary', sa.Text(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('transfer_call', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('external_call_id', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.ForeignKeyConstraint(['lead_id'], ['leads.id'], ),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    sa.UniqueConstraint('external_call_id', 'created_at', name='uq_call_logs_external_call_id_created_at'),
+    postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index(op.f('ix_call_logs_external_call_id'), 'call_logs', ['external_call_id'], unique=False)
+
+    # One partition per month from the oldest existing row to 3 months ahead
+    op.execute("""
+    DO $$
+    DECLARE
+        m    date;
+        last date;
+    BEGIN
+        SELECT date_trunc('month', COALESCE(min(COALESCE(created_at, executed_at)), now()))::date,
+               (date_trunc('month', GREATEST(COALESCE(max(COALESCE(created_at, executed_at)), now()), now()))
+                   + interval '3 months')::date
+          INTO m, last
+          FROM call_logs_legacy;
+
+        WHILE m <= last LOOP
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF call_logs FOR VALUES FROM (%L) TO (%L)',
+                'call_logs_y' || to_char(m, 'YYYY') || 'm' || to_char(m, 'MM'),
+                m, (m + interval '1 month')::date
+            );
+            m := (m + interval '1 month')::date;
+        END LOOP;
+    END $$;
+    """)
+
+    op.execute(f"""
+        INSERT INTO call_logs ({_COLUMNS}, created_at)
+        SELECT {_COLUMNS}, COALESCE(created_at, executed_at, now())
+          FROM call_logs_legacy
+    """)
+    op.drop_table('call_logs_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(f"""
+        CREATE TABLE call_logs_unpartitioned AS
+        SELECT {_COLUMNS}, created_at FROM call_logs
+    """)
+    op.execute("DROP TABLE call_logs CASCADE")   # drops every partition too
+    op.rename_table('call_logs_unpartitioned', 'call_logs')
+
+    op.alter_column('call_logs', 'created_at', nullable=True)
+    op.alter_column('call_logs', 'external_call_id', nullable=False)
+    op.create_primary_key('call_logs_pkey', 'call_logs', ['id'])
+    op.create_foreign_key('call_logs_campaign_id_fkey', 'call_logs', 'campaigns', ['campaign_id'], ['id'])
+    op.create_foreign_key('call_logs_lead_id_fkey', 'call_logs', 'leads', ['lead_id'], ['id'])
+    op.create_index(op.f('ix_call_logs_external_call_id'), 'call_logs', ['external_call_id'], unique=True)
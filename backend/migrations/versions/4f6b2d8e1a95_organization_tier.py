@@ -0,0 +1,31 @@
+"""organizations.tier for weighted fair-share dispatch
+
+Revision ID: 4f6b2d8e1a95
+Revises: e81f5c2a9d63
+Create Date: 2026-10-19 17:12:36.051248
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f6b2d8e1a95'
+down_revision: Union[str, Sequence[str], None] = 'e81f5c2a9d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('organizations', sa.Column(
+        'tier', sa.String(length=32), server_default='standard', nullable=False,
+        comment="Plan tier; sets the org's share of dial slots (DISPATCH_TIER_WEIGHTS)",
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('organizations', 'tier')
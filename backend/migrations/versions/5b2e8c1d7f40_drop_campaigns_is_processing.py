@@ -0,0 +1,30 @@
+"""drop campaigns.is_processing — replaced by the Redis dispatcher lease
+
+Revision ID: 5b2e8c1d7f40
+Revises: 90de1e7caeeb
+Create Date: 2026-10-19 14:22:05.318442
+
+Campaign ownership now lives in campaign:lease:{id} (app/services/campaign_lease.py),
+which expires on its own when a worker dies instead of staying stuck at true.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8c1d7f40'
+down_revision: Union[str, Sequence[str], None] = '90de1e7caeeb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_column('campaigns', 'is_processing')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('campaigns', sa.Column('is_processing', sa.Boolean(), server_default=sa.false(), nullable=False))
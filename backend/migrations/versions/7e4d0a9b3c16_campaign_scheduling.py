@@ -0,0 +1,36 @@
+"""campaign start time, calling windows and organization timezone
+
+Revision ID: 7e4d0a9b3c16
+Revises: c3a91f6e2b58
+Create Date: 2026-10-19 15:48:12.640391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e4d0a9b3c16'
+down_revision: Union[str, Sequence[str], None] = 'c3a91f6e2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('organizations', sa.Column(
+        'timezone', sa.String(length=64), server_default='UTC', nullable=False,
+        comment="IANA timezone for campaign calling windows, e.g. 'Asia/Kolkata'",
+    ))
+    op.add_column('campaigns', sa.Column('scheduled_at', sa.DateTime(), nullable=True))
+    op.add_column('campaigns', sa.Column('calling_windows', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('campaigns', 'calling_windows')
+    op.drop_column('campaigns', 'scheduled_at')
+    op.drop_column('organizations', 'timezone')
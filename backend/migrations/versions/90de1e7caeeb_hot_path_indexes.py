@@ -0,0 +1,90 @@
+"""hot-path indexes for leads, call_logs and wallet_transactions
+
+Revision ID: 90de1e7caeeb
+Revises: 389470a87eae
+Create Date: 2026-10-19 11:03:27.552870
+
+All indexes are built with CREATE INDEX CONCURRENTLY so the tables stay
+writable while they build. That cannot run inside a transaction, hence the
+autocommit block.
+
+call_logs is partitioned and Postgres cannot build a partitioned index
+concurrently, so the parent index is created ON ONLY call_logs and each
+partition's index is built concurrently and attached. Partitions created
+later inherit the index automatically.
+
+If a concurrent build fails it leaves an INVALID index behind — drop it and
+re-run the migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90de1e7caeeb'
+down_revision: Union[str, Sequence[str], None] = '389470a87eae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _call_log_partitions() -> list[str]:
+    rows = op.get_bind().execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'call_logs' ORDER BY c.relname"
+    ))
+    return [r[0] for r in rows]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Dispatcher: campaign_id = ? AND status IN (...) AND retry_count < max_retries
+        op.create_index(
+            'ix_leads_dispatch', 'leads', ['campaign_id', 'status'],
+            postgresql_where=sa.text('retry_count < max_retries'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Lead listing: campaign_id = ? ORDER BY created_at DESC
+        op.create_index(
+            'ix_leads_campaign_created', 'leads', ['campaign_id', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Wallet history: wallet_id = ? ORDER BY created_at DESC
+        op.create_index(
+            'ix_wallet_transactions_wallet_created', 'wallet_transactions', ['wallet_id', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        # Webhook dedup: call_log_id = ?
+        op.create_index(
+            'ix_wallet_transactions_call_log_id', 'wallet_transactions', ['call_log_id'],
+            postgresql_where=sa.text('call_log_id IS NOT NULL'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+        # Analytics: campaign_id = ? with duration/cost covered for index-only scans
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_call_logs_campaign_id "
+            "ON ONLY call_logs (campaign_id) INCLUDE (duration, cost)"
+        )
+        for partition in _call_log_partitions():
+            child = f"{partition}_campaign_id_idx"
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{child}" '
+                f'ON "{partition}" (campaign_id) INCLUDE (duration, cost)'
+            )
+            op.execute(f'ALTER INDEX ix_call_logs_campaign_id ATTACH PARTITION "{child}"')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Dropping the partitioned parent index drops the attached partition indexes
+    op.drop_index('ix_call_logs_campaign_id', table_name='call_logs')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_wallet_transactions_call_log_id', table_name='wallet_transactions', postgresql_concurrently=True)
+        op.drop_index('ix_wallet_transactions_wallet_created', table_name='wallet_transactions', postgresql_concurrently=True)
+        op.drop_index('ix_leads_campaign_created', table_name='leads', postgresql_concurrently=True)
+        op.drop_index('ix_leads_dispatch', table_name='leads', postgresql_concurrently=True)
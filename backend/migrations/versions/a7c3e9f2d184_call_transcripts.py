@@ -0,0 +1,129 @@
+"""call_transcripts: zstd-compressed transcript / summary moved off call_logs
+
+Revision ID: a7c3e9f2d184
+Revises: 4f6b2d8e1a95
+Create Date: 2026-10-19 21:04:12.318840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import pyarrow as pa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f2d184'
+down_revision: Union[str, Sequence[str], None] = '4f6b2d8e1a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 2000
+
+# Same format as app/services/transcript_store.py, inlined so this revision
+# does not change if that module does
+_codec = pa.Codec('zstd', compression_level=9)
+
+
+def compress(text):
+    if text is None:
+        return None, None
+    raw = text.encode('utf-8')
+    return _codec.compress(raw, asbytes=True), len(raw)
+
+
+def decompress(blob, size):
+    if blob is None:
+        return None
+    return _codec.decompress(blob, decompressed_size=size, asbytes=True).decode('utf-8')
+
+transcripts = sa.table(
+    'call_transcripts',
+    sa.column('call_log_id', postgresql.UUID(as_uuid=True)),
+    sa.column('call_log_created_at', sa.DateTime()),
+    sa.column('campaign_id', postgresql.UUID(as_uuid=True)),
+    sa.column('transcript_zst', sa.LargeBinary()),
+    sa.column('transcript_bytes', sa.Integer()),
+    sa.column('summary_zst', sa.LargeBinary()),
+    sa.column('summary_bytes', sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('call_transcripts',
+    sa.Column('call_log_id', sa.UUID(), nullable=False),
+    sa.Column('call_log_created_at', sa.DateTime(), nullable=False),
+    sa.Column('campaign_id', sa.UUID(), nullable=True),
+    sa.Column('transcript_zst', sa.LargeBinary(), nullable=True),
+    sa.Column('transcript_bytes', sa.Integer(), nullable=True),
+    sa.Column('summary_zst', sa.LargeBinary(), nullable=True),
+    sa.Column('summary_bytes', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('call_log_id')
+    )
+    op.create_index(op.f('ix_call_transcripts_call_log_created_at'), 'call_transcripts', ['call_log_created_at'], unique=False)
+    op.create_index(op.f('ix_call_transcripts_campaign_id'), 'call_transcripts', ['campaign_id'], unique=False)
+    # Already compressed — keep Postgres from trying TOAST compression again
+    op.execute("ALTER TABLE call_transcripts ALTER COLUMN transcript_zst SET STORAGE EXTERNAL")
+    op.execute("ALTER TABLE call_transcripts ALTER COLUMN summary_zst SET STORAGE EXTERNAL")
+
+    # Backfill in keyset batches; compression happens here, in Python
+    conn = op.get_bind()
+    last = None
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, created_at, campaign_id, transcript, COALESCE(summary, final_call_summary) "
+            "FROM call_logs "
+            "WHERE (transcript IS NOT NULL OR summary IS NOT NULL OR final_call_summary IS NOT NULL) "
+            + ("AND (created_at, id) > (:created_at, :id) " if last else "")
+            + "ORDER BY created_at, id LIMIT :limit"
+        ), {"limit": BATCH, **(last or {})}).all()
+        if not rows:
+            break
+        values = []
+        for log_id, created_at, campaign_id, transcript, summary in rows:
+            transcript_zst, transcript_bytes = compress(transcript)
+            summary_zst, summary_bytes = compress(summary)
+            values.append({
+                'call_log_id': log_id, 'call_log_created_at': created_at, 'campaign_id': campaign_id,
+                'transcript_zst': transcript_zst, 'transcript_bytes': transcript_bytes,
+                'summary_zst': summary_zst, 'summary_bytes': summary_bytes,
+            })
+        op.bulk_insert(transcripts, values)
+        last = {"created_at": rows[-1][1], "id": rows[-1][0]}
+
+    op.drop_column('call_logs', 'transcript')
+    op.drop_column('call_logs', 'summary')
+    op.drop_column('call_logs', 'final_call_summary')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('call_logs', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('call_logs', sa.Column('final_call_summary', sa.Text(), nullable=True))
+    op.add_column('call_logs', sa.Column('transcript', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execution_options(stream_results=True).execute(sa.text(
+        "SELECT call_log_id, call_log_created_at, transcript_zst, transcript_bytes, summary_zst, summary_bytes "
+        "FROM call_transcripts"
+    ))
+    for chunk in rows.partitions(BATCH):
+        params = []
+        for log_id, created_at, transcript_zst, transcript_bytes, summary_zst, summary_bytes in chunk:
+            summary = decompress(summary_zst, summary_bytes)
+            params.append({
+                "id": log_id, "created_at": created_at,
+                "transcript": decompress(transcript_zst, transcript_bytes),
+                "summary": summary,
+            })
+        conn.execute(sa.text(
+            "UPDATE call_logs SET transcript = :transcript, summary = :summary, final_call_summary = :summary "
+            "WHERE id = :id AND created_at = :created_at"
+        ), params)
+
+    op.drop_index(op.f('ix_call_transcripts_campaign_id'), table_name='call_transcripts')
+    op.drop_index(op.f('ix_call_transcripts_call_log_created_at'), table_name='call_transcripts')
+    op.drop_table('call_transcripts')
@@ -0,0 +1,39 @@
+"""call_logs DEFAULT partition
+
+Revision ID: b6e2d9f4a317
+Revises: d2a7f5c9b481
+Create Date: 2026-10-20 09:41:07.532816
+
+Catches rows whose created_at has no monthly partition yet (clock skew, or
+maintenance_tasks not having run), so the insert lands instead of failing.
+ensure_partition() moves such rows out when it creates their month.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d9f4a317'
+down_revision: Union[str, Sequence[str], None] = 'd2a7f5c9b481'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE TABLE IF NOT EXISTS call_logs_default PARTITION OF call_logs DEFAULT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Refuse rather than drop rows that have no monthly partition to go to
+    op.execute("""
+    DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM call_logs_default) THEN
+            RAISE EXCEPTION 'call_logs_default is not empty; create partitions for its months first';
+        END IF;
+    END $$;
+    """)
+    op.execute("DROP TABLE call_logs_default")
@@ -0,0 +1,38 @@
+"""leads.updated_at for the stuck-call reaper
+
+Revision ID: c3a91f6e2b58
+Revises: 5b2e8c1d7f40
+Create Date: 2026-10-19 15:07:44.902117
+
+Existing rows get now() so nothing is reaped on the first run after deploy.
+The partial index only covers QUEUED leads, so it stays tiny.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a91f6e2b58'
+down_revision: Union[str, Sequence[str], None] = '5b2e8c1d7f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('leads', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_leads_queued_updated', 'leads', ['updated_at'],
+            postgresql_where=sa.text("status = 'QUEUED'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_leads_queued_updated', table_name='leads', postgresql_concurrently=True)
+    op.drop_column('leads', 'updated_at')
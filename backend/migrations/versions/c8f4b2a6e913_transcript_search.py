@@ -0,0 +1,76 @@
+"""call_transcripts.search_vector (GIN) + sentiment / interest for transcript search
+
+Revision ID: c8f4b2a6e913
+Revises: a7c3e9f2d184
+Create Date: 2026-10-19 22:41:05.902713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import pyarrow as pa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f4b2a6e913'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9f2d184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 2000
+
+_codec = pa.Codec('zstd')
+
+
+def decompress(blob, size):
+    if blob is None:
+        return ''
+    return _codec.decompress(blob, decompressed_size=size, asbytes=True).decode('utf-8')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('call_transcripts', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.add_column('call_transcripts', sa.Column('customer_sentiment', sa.String(), nullable=True))
+    op.add_column('call_transcripts', sa.Column('interest_level', sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    conn.execute(sa.text(
+        "UPDATE call_transcripts t "
+        "SET customer_sentiment = l.customer_sentiment, interest_level = l.interest_level "
+        "FROM call_logs l WHERE l.id = t.call_log_id AND l.created_at = t.call_log_created_at"
+    ))
+
+    # The text is compressed, so vectors are built from batches decompressed here
+    last = None
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT call_log_id, transcript_zst, transcript_bytes, summary_zst, summary_bytes "
+            "FROM call_transcripts "
+            + ("WHERE call_log_id > :last " if last else "")
+            + "ORDER BY call_log_id LIMIT :limit"
+        ), {"limit": BATCH, "last": last}).all()
+        if not rows:
+            break
+        conn.execute(sa.text(
+            "UPDATE call_transcripts SET search_vector = "
+            "setweight(to_tsvector('simple'::regconfig, :summary), 'A') || "
+            "setweight(to_tsvector('simple'::regconfig, :transcript), 'B') "
+            "WHERE call_log_id = :id"
+        ), [
+            {"id": log_id, "transcript": decompress(t_zst, t_bytes), "summary": decompress(s_zst, s_bytes)}
+            for log_id, t_zst, t_bytes, s_zst, s_bytes in rows
+        ])
+        last = rows[-1][0]
+
+    op.create_index('ix_call_transcripts_search_vector', 'call_transcripts', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_call_transcripts_search_vector', table_name='call_transcripts', postgresql_using='gin')
+    op.drop_column('call_transcripts', 'interest_level')
+    op.drop_column('call_transcripts', 'customer_sentiment')
+    op.drop_column('call_transcripts', 'search_vector')
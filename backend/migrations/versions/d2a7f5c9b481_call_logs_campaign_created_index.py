@@ -0,0 +1,52 @@
+"""call_logs (campaign_id, created_at, id) index for the paginated log listing
+
+Revision ID: d2a7f5c9b481
+Revises: c8f4b2a6e913
+Create Date: 2026-10-19 23:18:44.127305
+
+Built like 90de1e7caeeb: the parent index ON ONLY call_logs, then each
+partition's index CONCURRENTLY and attached, so call_logs stays writable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f5c9b481'
+down_revision: Union[str, Sequence[str], None] = 'c8f4b2a6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _call_log_partitions() -> list[str]:
+    rows = op.get_bind().execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'call_logs' ORDER BY c.relname"
+    ))
+    return [r[0] for r in rows]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        # Log listing: campaign_id = ? AND (created_at, id) < cursor ORDER BY created_at DESC, id DESC
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_call_logs_campaign_created "
+            "ON ONLY call_logs (campaign_id, created_at, id)"
+        )
+        for partition in _call_log_partitions():
+            child = f"{partition}_campaign_created_idx"
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{child}" '
+                f'ON "{partition}" (campaign_id, created_at, id)'
+            )
+            op.execute(f'ALTER INDEX ix_call_logs_campaign_created ATTACH PARTITION "{child}"')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_call_logs_campaign_created")
@@ -0,0 +1,48 @@
+"""leads.next_attempt_at with a dispatch index, campaigns.retry_policy
+
+Revision ID: e81f5c2a9d63
+Revises: 7e4d0a9b3c16
+Create Date: 2026-10-19 16:31:50.274815
+
+ix_leads_next_attempt replaces ix_leads_dispatch: the dispatcher's claim is
+now a range scan on (campaign_id, next_attempt_at) over dialable leads only.
+Existing leads get next_attempt_at = now(), i.e. due immediately.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81f5c2a9d63'
+down_revision: Union[str, Sequence[str], None] = '7e4d0a9b3c16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('leads', sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('campaigns', sa.Column('retry_policy', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_leads_next_attempt', 'leads', ['campaign_id', 'next_attempt_at'],
+            postgresql_where=sa.text("status IN ('PENDING', 'FAILED') AND retry_count < max_retries"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index('ix_leads_dispatch', table_name='leads', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_leads_dispatch', 'leads', ['campaign_id', 'status'],
+            postgresql_where=sa.text('retry_count < max_retries'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index('ix_leads_next_attempt', table_name='leads', postgresql_concurrently=True)
+    op.drop_column('campaigns', 'retry_policy')
+    op.drop_column('leads', 'next_attempt_at')
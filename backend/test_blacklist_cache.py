@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from app.core.blacklist_cache import BL_BACKFILLED, BL_INDEX, BlacklistCache, BloomFilter, blacklist_cache
+from app.core.security import is_blacklisted
+
+
+class CountingRedis:
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+        self.calls = 0
+
+    async def exists(self, key):
+        self.calls += 1
+        return 1 if key in self.keys else 0
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bf = BloomFilter(capacity=1000, error_rate=0.001)
+    jtis = [f"jti-{i}" for i in range(1000)]
+    for jti in jtis:
+        bf.add(jti)
+
+    assert all(jti in bf for jti in jtis)
+    false_positives = sum(f"other-{i}" in bf for i in range(10000))
+    assert false_positives < 100
+
+
+def test_is_blacklisted_skips_redis_for_unknown_jti():
+    blacklist_cache._filter = BloomFilter(capacity=100, error_rate=0.001)
+    blacklist_cache.add("revoked")
+    redis = CountingRedis(keys={"token:blacklist:revoked"})
+
+    try:
+        assert asyncio.run(is_blacklisted(redis, "fresh")) is False
+        assert redis.calls == 0
+
+        assert asyncio.run(is_blacklisted(redis, "revoked")) is True
+        assert redis.calls == 1
+    finally:
+        blacklist_cache._filter = None
+
+
+def test_is_blacklisted_falls_back_to_redis_until_synced():
+    blacklist_cache._filter = None
+    redis = CountingRedis()
+
+    assert asyncio.run(is_blacklisted(redis, "anything")) is False
+    assert redis.calls == 1
+
+
+class IndexRedis:
+    """Just enough of redis.asyncio for resync(): string keys with TTLs plus the index ZSET."""
+
+    def __init__(self, ttls, fail_scan=False):
+        self.ttls = dict(ttls)          # key → seconds left (-1 = no expiry)
+        self.index: dict[str, float] = {}
+        self.flags: set[str] = set()
+        self.fail_scan = fail_scan
+
+    async def exists(self, key):
+        return int(key in self.ttls or key in self.flags)
+
+    async def set(self, key, value):
+        self.flags.add(key)
+
+    async def scan_iter(self, match, count):
+        if self.fail_scan:
+            raise ConnectionError("lost")
+        for key in list(self.ttls) + [BL_INDEX]:
+            yield key.encode()
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipe:
+            def __init__(self):
+                self.keys = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def ttl(self, key):
+                self.keys.append(key)
+
+            async def execute(self):
+                return [redis.ttls.get(k, -2) for k in self.keys]
+
+        return Pipe()
+
+    async def zadd(self, key, mapping, nx=False):
+        for member, score in mapping.items():
+            if not (nx and member in self.index):
+                self.index[member] = score
+
+    async def zremrangebyscore(self, key, low, high):
+        self.index = {m: s for m, s in self.index.items() if s > high}
+
+    async def zrange(self, key, start, end):
+        return [m.encode() for m in self.index]
+
+
+def test_first_resync_indexes_jtis_blacklisted_before_the_index():
+    cache = BlacklistCache()
+    redis = IndexRedis({"token:blacklist:old": 3600, "token:blacklist:forever": -1})
+
+    asyncio.run(cache.resync(redis))
+
+    assert set(redis.index) == {"old", "forever"}
+    assert BL_BACKFILLED in redis.flags
+    assert cache.might_contain("old") and cache.might_contain("forever")
+
+    # Once backfilled, later resyncs only read the index
+    redis.ttls["token:blacklist:unindexed"] = 3600
+    asyncio.run(cache.resync(redis))
+    assert "unindexed" not in redis.index
+
+
+def test_failed_backfill_keeps_lookups_on_redis():
+    cache = BlacklistCache()
+    redis = IndexRedis({"token:blacklist:old": 3600}, fail_scan=True)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(cache.resync(redis))
+
+    assert not cache.ready
+    assert cache.might_contain("old")
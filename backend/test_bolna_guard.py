@@ -0,0 +1,252 @@
+"""
+Unit tests for the Bolna circuit breaker and AIMD limit in app/services/bolna_guard.py,
+against an in-memory Redis whose eval() implements the module's two Lua scripts.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import bolna_guard
+from app.services.bolna_guard import (
+    CUT_KEY, LIMIT_KEY, BolnaUnavailable, _ACQUIRE_LUA, _ADJUST_LUA, acquire, release,
+)
+
+
+class FakeRedis:
+    def __init__(self, clock):
+        self.clock = clock
+        self.values: dict[str, object] = {}
+        self.expiry: dict[str, float] = {}
+
+    def _live(self, key):
+        if key in self.expiry and self.expiry[key] <= self.clock.now:
+            self.values.pop(key, None)
+            self.expiry.pop(key, None)
+        return key in self.values
+
+    def exists(self, *keys):
+        return sum(self._live(k) for k in keys)
+
+    def ttl(self, key):
+        return int(self.expiry[key] - self.clock.now) if self._live(key) and key in self.expiry else -1
+
+    def get(self, key):
+        return self.values.get(key) if self._live(key) else None
+
+    def set(self, key, value, nx=False, ex=None, px=None):
+        if nx and self._live(key):
+            return None
+        self.values[key] = value
+        self.expiry.pop(key, None)
+        if ex or px:
+            self.expiry[key] = self.clock.now + (ex if ex else px / 1000)
+        return True
+
+    def delete(self, *keys):
+        for k in keys:
+            self.values.pop(k, None)
+            self.expiry.pop(k, None)
+
+    def zrem(self, key, member):
+        self.values.setdefault(key, {}).pop(member, None)
+
+    def hincrby(self, key, field, amount):
+        bucket = self.values.setdefault(key, {})
+        bucket[field] = bucket.get(field, 0) + amount
+
+    def expire(self, key, seconds):
+        self.expiry[key] = self.clock.now + seconds
+
+    def hmget(self, key, *fields):
+        bucket = self.values.get(key, {}) if self._live(key) else {}
+        return [bucket.get(f) for f in fields]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == _ACQUIRE_LUA:
+            inflight = self.values.setdefault(keys[0], {})
+            for member, score in list(inflight.items()):
+                if score <= argv[0]:
+                    del inflight[member]
+            limit = float(self.get(keys[1]) or argv[2])
+            if len(inflight) >= int(limit):
+                return 0
+            inflight[argv[3]] = argv[1]
+            return 1
+        if script == _ADJUST_LUA:
+            mode, initial, low, high = argv
+            limit = float(self.get(keys[0]) or initial)
+            if mode == "inc":
+                limit = min(limit + 1 / max(limit, 1), high)
+            elif self.set(keys[1], "1", nx=True, px=1000):
+                limit = max(limit / 2, low)
+            else:
+                return str(limit)
+            self.set(keys[0], str(limit))
+            return str(limit)
+        raise AssertionError("unknown script")
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis, self.calls = redis, []
+
+    def __getattr__(self, name):
+        return lambda *a, **kw: self.calls.append((name, a, kw))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*a, **kw) for name, a, kw in self.calls]
+
+
+@pytest.fixture
+def guard(monkeypatch):
+    clock = SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(bolna_guard, "time", SimpleNamespace(time=lambda: clock.now, perf_counter=lambda: clock.now))
+    return FakeRedis(clock), clock
+
+
+def _limit(redis) -> float:
+    return float(redis.get(LIMIT_KEY) or settings.BOLNA_CONCURRENCY_INITIAL)
+
+
+def test_fast_success_grows_limit_and_errors_halve_it_once_per_second(guard):
+    redis, clock = guard
+    start = settings.BOLNA_CONCURRENCY_INITIAL
+
+    release(redis, *acquire(redis), ok=True, latency=0.1)
+    assert _limit(redis) == pytest.approx(start + 1 / start)
+
+    release(redis, *acquire(redis), ok=False, latency=0.1)
+    halved = _limit(redis)
+    assert halved == pytest.approx((start + 1 / start) / 2)
+
+    # A second error in the same second is the same congestion event
+    release(redis, *acquire(redis), ok=False, latency=0.1)
+    assert _limit(redis) == pytest.approx(halved)
+
+    # Slow successes count as congestion too
+    clock.now += 1.5
+    release(redis, *acquire(redis), ok=True, latency=settings.BOLNA_LATENCY_TARGET_SECONDS + 1)
+    assert _limit(redis) == pytest.approx(max(halved / 2, settings.BOLNA_CONCURRENCY_MIN))
+
+
+def test_increase_does_not_undo_a_concurrent_cut(guard):
+    # Worker A halves the limit between worker B's admission and B's release
+    redis, _ = guard
+    b = acquire(redis)
+    release(redis, *acquire(redis), ok=False, latency=0.1)
+    cut = _limit(redis)
+    release(redis, *b, ok=True, latency=0.1)
+    assert _limit(redis) == pytest.approx(cut + 1 / cut)
+
+
+def test_limit_caps_admission(guard):
+    redis, _ = guard
+    redis.set(LIMIT_KEY, "2")
+    acquire(redis)
+    acquire(redis)
+    with pytest.raises(BolnaUnavailable) as e:
+        acquire(redis)
+    assert e.value.reason == "concurrency_limit"
+
+
+def test_breaker_cycle_closed_open_half_open_closed(guard):
+    redis, clock = guard
+    for _ in range(settings.BOLNA_BREAKER_MIN_REQUESTS):
+        redis.delete(CUT_KEY)
+        release(redis, *acquire(redis), ok=False, latency=0.1)
+
+    # Open: everything refused until the cooldown ends
+    with pytest.raises(BolnaUnavailable) as e:
+        acquire(redis)
+    assert e.value.reason == "breaker_open"
+
+    # Half-open: one probe, the rest wait for it
+    clock.now += settings.BOLNA_BREAKER_COOLDOWN_SECONDS + 1
+    request_id, is_probe = acquire(redis)
+    assert is_probe
+    with pytest.raises(BolnaUnavailable) as e:
+        acquire(redis)
+    assert e.value.reason == "breaker_half_open"
+
+    # A failed probe re-opens it
+    release(redis, request_id, is_probe, ok=False, latency=0.1)
+    with pytest.raises(BolnaUnavailable) as e:
+        acquire(redis)
+    assert e.value.reason == "breaker_open"
+
+    # A successful probe closes it
+    clock.now += settings.BOLNA_BREAKER_COOLDOWN_SECONDS + 1
+    release(redis, *acquire(redis), ok=True, latency=0.1)
+    assert acquire(redis)[1] is False
+
+
+class AsyncFakeRedis:
+    """redis.asyncio-shaped view of a FakeRedis, for aguarded()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    def pipeline(self, transaction=True):
+        pipe = self.redis.pipeline()
+
+        async def execute():
+            return FakePipeline.execute(pipe)
+        pipe.execute = execute
+        return pipe
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+def _outcomes(redis) -> tuple[int, int]:
+    stats = [v for k, v in redis.values.items() if k.startswith("bolna:stats:")]
+    return sum(s.get("ok", 0) for s in stats), sum(s.get("err", 0) for s in stats)
+
+
+def test_guarded_records_status_and_transport_errors(guard):
+    redis, _ = guard
+    with bolna_guard.guarded(redis) as call:
+        call.record(404)          # about this one request, not Bolna's health
+    with bolna_guard.guarded(redis) as call:
+        call.record(429)
+    with pytest.raises(ConnectionError):
+        with bolna_guard.guarded(redis):
+            raise ConnectionError("reset")
+
+    assert _outcomes(redis) == (1, 2)
+    assert redis.values[bolna_guard.INFLIGHT_KEY] == {}
+
+
+def test_execution_lookups_feed_the_breaker_and_are_refused_when_open(guard):
+    from app.services.bolna_service import get_execution
+
+    redis, _ = guard
+    aredis = AsyncFakeRedis(redis)
+    requests = []
+
+    class Client:
+        async def get(self, url):
+            requests.append(url)
+            return SimpleNamespace(status_code=503, text="overloaded")
+
+    async def lookups():
+        for i in range(settings.BOLNA_BREAKER_MIN_REQUESTS):
+            redis.delete(CUT_KEY)
+            with pytest.raises(Exception, match="Bolna error 503"):
+                await get_execution(Client(), aredis, f"exec-{i}")
+        with pytest.raises(BolnaUnavailable):
+            await get_execution(Client(), aredis, "exec-after")
+
+    asyncio.run(lookups())
+    assert len(requests) == settings.BOLNA_BREAKER_MIN_REQUESTS
+    assert _limit(redis) < settings.BOLNA_CONCURRENCY_INITIAL
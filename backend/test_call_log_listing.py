@@ -0,0 +1,31 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.call_logs import CallLogItem, CallLogPage
+from app.services.call_log_service import FIELDS, decode_cursor, encode_cursor, parse_fields
+
+
+def test_cursor_round_trip():
+    created_at, log_id = datetime(2026, 3, 1, 12, 30, 5, 123456), uuid4()
+    assert decode_cursor(encode_cursor(created_at, log_id)) == (created_at, log_id)
+
+
+def test_bad_cursor_is_400():
+    with pytest.raises(HTTPException) as e:
+        decode_cursor("not-a-cursor")
+    assert e.value.status_code == 400
+
+
+def test_fields():
+    assert parse_fields(None) == list(FIELDS)
+    assert parse_fields("status, id,status") == ["status", "id"]
+    with pytest.raises(HTTPException):
+        parse_fields("id,transcript")
+
+
+def test_only_projected_fields_are_serialized():
+    page = CallLogPage(items=[CallLogItem.model_construct(id=uuid4(), status="completed")], next_cursor=None)
+    assert set(page.model_dump(exclude_unset=True)["items"][0]) == {"id", "status"}
@@ -0,0 +1,24 @@
+"""
+Unit tests for the call-state transitions in app/services/call_state.py.
+"""
+from app.services.call_state import is_forward
+
+
+def test_events_only_move_forward():
+    assert is_forward(None, "initiated")
+    assert is_forward("initiated", "ringing")
+    assert is_forward("ringing", "completed")
+    assert not is_forward("completed", "ringing")
+    assert not is_forward("in-progress", "in-progress")
+
+
+def test_completed_follows_disconnect_but_finals_are_final():
+    assert is_forward("call-disconnected", "completed")
+    assert not is_forward("completed", "failed")
+    assert not is_forward("no-answer", "completed")
+
+
+def test_unknown_status_only_applies_to_an_unknown_call():
+    assert is_forward(None, "some-new-status")
+    assert not is_forward("ringing", "some-new-status")
+    assert is_forward("some-new-status", "ringing")
@@ -0,0 +1,39 @@
+import asyncio
+import json
+
+from app.core.config import settings
+from app.services.campaign_events import CHANNEL, CampaignEventHub, EventBatch
+
+
+def test_batch_keeps_latest_status_per_lead():
+    batch = EventBatch()
+    batch.add({"type": "leads", "leads": {"a": "queued", "b": "queued"}})
+    batch.add({"type": "leads", "leads": {"a": "calling"}})
+    batch.add({"type": "wallet", "minutes_balance": 90})
+    batch.add({"type": "wallet", "minutes_balance": 88})
+    batch.add({"type": "call", "call_log_id": "c1", "status": "completed"})
+
+    assert batch.to_dict() == {
+        "leads": {"a": "calling", "b": "queued"},
+        "calls": [{"call_log_id": "c1", "status": "completed"}],
+        "wallet": {"minutes_balance": 88},
+    }
+
+
+def test_burst_is_delivered_as_one_batch(monkeypatch):
+    monkeypatch.setattr(settings, "CAMPAIGN_EVENTS_COALESCE_SECONDS", 0.05)
+    hub = CampaignEventHub()
+
+    async def scenario():
+        stream = hub.stream("camp-1")
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)   # subscriber registered
+        for status in ("queued", "calling", "completed"):
+            hub.dispatch(CHANNEL.format("camp-1"), json.dumps({"type": "leads", "leads": {"l1": status}}))
+        hub.dispatch(CHANNEL.format("other"), json.dumps({"type": "leads", "leads": {"x": "queued"}}))
+        batch = await first
+        await stream.aclose()
+        return batch
+
+    assert asyncio.run(scenario()) == {"leads": {"l1": "completed"}}
+    assert hub._subscribers == {}
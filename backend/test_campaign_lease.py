@@ -0,0 +1,77 @@
+"""
+Unit tests for the per-tick lease token in app/services/campaign_lease.py,
+against an in-memory Redis whose eval() implements the module's Lua scripts.
+"""
+from app.services.campaign_lease import LEASE_KEY, _CLAIM_LUA, _RELEASE_LUA, claim_lease, release_lease
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes: dict[str, dict] = {}
+        self.ttls: dict[str, int] = {}
+
+    def eval(self, script, numkeys, key, *argv):
+        lease = self.hashes.get(key)
+        if script == _CLAIM_LUA:
+            token, ttl, owner, now, next_token = argv
+            if lease and lease["token"] != token:
+                return 0
+            lease = self.hashes.setdefault(key, {"acquired_at": now})
+            lease.update(token=next_token, owner=owner, heartbeat_at=now)
+            self.ttls[key] = ttl
+            return 1
+        if script == _RELEASE_LUA:
+            if lease and lease["token"] == argv[0]:
+                del self.hashes[key]
+                return 1
+            return 0
+        raise AssertionError("unknown script")
+
+
+def _token(redis, campaign_id="c1"):
+    return redis.hashes[LEASE_KEY.format(campaign_id)]["token"]
+
+
+def test_token_is_spent_when_the_lease_moves_on():
+    redis = FakeRedis()
+    assert claim_lease(redis, "c1", "tick-1", next_token="run-1")
+    assert claim_lease(redis, "c1", "run-1")                  # heartbeat keeps the token
+    assert claim_lease(redis, "c1", "run-1", hold_seconds=30, next_token="tick-2")
+    assert _token(redis) == "tick-2"
+    assert redis.ttls[LEASE_KEY.format("c1")] >= 30
+
+    # A redelivered copy of an earlier tick carries a spent token
+    assert not claim_lease(redis, "c1", "tick-1", next_token="run-x")
+    assert not claim_lease(redis, "c1", "run-1")
+    assert _token(redis) == "tick-2"
+
+
+def test_release_needs_the_current_token():
+    redis = FakeRedis()
+    claim_lease(redis, "c1", "tick-1", next_token="tick-2")
+    release_lease(redis, "c1", "tick-1")
+    assert _token(redis) == "tick-2"
+    release_lease(redis, "c1", "tick-2")
+    assert claim_lease(redis, "c1", "other-chain")
+
+
+def test_redelivered_tick_does_not_start_a_second_chain(monkeypatch):
+    from app.tasks import campaign_tasks
+
+    redis = FakeRedis()
+    enqueued, sessions = [], []
+    monkeypatch.setattr(campaign_tasks, "get_sync_redis", lambda: redis)
+    monkeypatch.setattr(campaign_tasks, "SessionLocal", lambda: sessions.append(1))
+    monkeypatch.setattr(campaign_tasks.process_campaign, "apply_async",
+                        lambda args, **kw: enqueued.append(args))
+
+    # Tick 1 runs and enqueues tick 2 …
+    claim_lease(redis, "c1", "tick-1")
+    assert claim_lease(redis, "c1", "tick-1", next_token="run-1")
+    campaign_tasks._schedule_tick("c1", "run-1", 5)
+    assert enqueued == [["c1", _token(redis)]]
+
+    # … then its worker dies before the ack and tick 1 is delivered again
+    campaign_tasks.process_campaign.run("c1", "tick-1")
+    assert sessions == []
+    assert len(enqueued) == 1
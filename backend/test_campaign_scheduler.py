@@ -0,0 +1,73 @@
+"""
+Unit tests for the calling-window maths and wake-ups in app/services/campaign_scheduler.py.
+"""
+import asyncio
+from datetime import datetime
+
+from app.services.campaign_lease import LEASE_KEY
+from app.services.campaign_scheduler import _CANCEL_LUA, acancel_wakeup, get_zone, is_open, next_open
+
+WEEKDAYS_9_TO_6 = [{"days": ["mon", "tue", "wed", "thu", "fri"], "start": "09:00", "end": "18:00"}]
+KOLKATA = get_zone("Asia/Kolkata")
+
+
+def test_no_windows_means_always_open():
+    assert is_open(None, KOLKATA, datetime(2026, 10, 18, 2, 0))
+
+
+def test_window_is_evaluated_in_local_time():
+    # Monday 04:00 UTC = 09:30 IST → open; 13:00 UTC = 18:30 IST → closed
+    assert is_open(WEEKDAYS_9_TO_6, KOLKATA, datetime(2026, 10, 19, 4, 0))
+    assert not is_open(WEEKDAYS_9_TO_6, KOLKATA, datetime(2026, 10, 19, 13, 0))
+
+
+def test_next_open_skips_the_weekend():
+    # Friday 19:00 IST → Monday 09:00 IST = 03:30 UTC
+    assert next_open(WEEKDAYS_9_TO_6, KOLKATA, datetime(2026, 10, 23, 13, 30)) == datetime(2026, 10, 26, 3, 30)
+
+
+def test_unknown_lead_timezone_falls_back_to_org():
+    assert get_zone("Not/AZone", "Asia/Kolkata") is KOLKATA
+
+
+def test_windows_that_could_never_open_are_rejected():
+    import pytest
+    from pydantic import ValidationError
+
+    from app.schemas.campaigns import CallingWindow
+
+    for bad in (
+        {"start": "22:00", "end": "02:00"},            # crosses midnight
+        {"start": "09:00", "end": "09:00"},            # empty
+        {"days": [], "start": "09:00", "end": "18:00"},
+    ):
+        with pytest.raises(ValidationError):
+            CallingWindow(**bad)
+    assert CallingWindow(start="00:00", end="02:00").end == "02:00"
+
+
+class WakeupRedis:
+    """eval() implements campaign_scheduler._CANCEL_LUA over a ZSET and plain keys."""
+
+    def __init__(self, wakeups=(), keys=()):
+        self.wakeups, self.keys = set(wakeups), set(keys)
+
+    async def eval(self, script, numkeys, zset_key, lease_key, member):
+        assert script == _CANCEL_LUA
+        if member not in self.wakeups:
+            return 0
+        self.wakeups.discard(member)
+        self.keys.discard(lease_key)
+        return 1
+
+
+def test_cancel_wakeup_frees_a_parked_chains_lease():
+    lease = LEASE_KEY.format("c1")
+    redis = WakeupRedis(wakeups={"c1"}, keys={lease})
+    assert asyncio.run(acancel_wakeup(redis, "c1")) is True
+    assert redis.wakeups == set() and redis.keys == set()
+
+    # No wake-up pending → the chain may be mid-tick; its lease is left alone
+    redis = WakeupRedis(keys={lease})
+    assert asyncio.run(acancel_wakeup(redis, "c1")) is False
+    assert redis.keys == {lease}
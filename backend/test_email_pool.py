@@ -0,0 +1,51 @@
+import asyncio
+
+import aiosmtplib
+import pytest
+
+from app.core import email
+from app.core.email import SMTPPool
+
+
+class FakeSMTP:
+    """Connects fine; login fails the first time, as with a bad or rotated password."""
+
+    def __init__(self):
+        self.is_connected = False
+        self.logins = 0
+        self.sent = []
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def login(self, user, password):
+        self.logins += 1
+        if self.logins == 1:
+            raise aiosmtplib.SMTPAuthenticationError(535, "bad credentials")
+
+    def close(self):
+        self.is_connected = False
+
+    async def send_message(self, msg):
+        self.sent.append(msg)
+
+
+def test_failed_login_does_not_leave_a_connected_client_in_the_pool(monkeypatch):
+    monkeypatch.setattr(email.settings, "SMTP_USER", "apikey")
+    monkeypatch.setattr(email.settings, "SMTP_PASSWORD", "secret")
+    monkeypatch.setattr(SMTPPool, "_new_client", staticmethod(FakeSMTP))
+    pool = SMTPPool(size=1)
+
+    async def scenario():
+        with pytest.raises(aiosmtplib.SMTPAuthenticationError):
+            await pool.send("first")
+        client = pool._idle.get_nowait()
+        assert not client.is_connected
+        pool._idle.put_nowait(client)
+
+        await pool.send("second")   # reconnects and logs in again before sending
+        return client
+
+    client = asyncio.run(scenario())
+    assert client.logins == 2
+    assert client.sent == ["second"]
@@ -0,0 +1,148 @@
+"""
+Unit tests for the crash-safe outbox drain in app/tasks/email_worker.py,
+against an in-memory Redis holding lists, strings and the status hashes.
+"""
+import asyncio
+
+import pytest
+
+from app.core import email
+from app.core.email import LINK_PLACEHOLDER, OUTBOX_KEY, PROCESSING_PREFIX, WORKER_PREFIX, enqueue_email
+from app.tasks import email_worker
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists: dict[str, list] = {}
+        self.strings: dict[str, bytes] = {}
+        self.hashes: dict[str, dict] = {}
+
+    # strings / hashes
+    async def set(self, key, value, ex=None):
+        self.strings[key] = str(value).encode()
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def delete(self, key):
+        self.strings.pop(key, None)
+
+    async def exists(self, key):
+        return int(key in self.strings or bool(self.lists.get(key)))
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def expire(self, key, seconds):
+        pass
+
+    # lists — index 0 is LEFT
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value.encode() if isinstance(value, str) else value)
+
+    async def lmove(self, src, dst, wherefrom, whereto):
+        items = self.lists.get(src)
+        if not items:
+            return None
+        value = items.pop(-1 if wherefrom == "RIGHT" else 0)
+        target = self.lists.setdefault(dst, [])
+        target.append(value) if whereto == "RIGHT" else target.insert(0, value)
+        return value
+
+    async def blmove(self, src, dst, timeout, wherefrom, whereto):
+        return await self.lmove(src, dst, wherefrom, whereto)
+
+    async def lrem(self, key, count, value):
+        self.lists.get(key, []).remove(value)
+
+    async def zadd(self, key, mapping):
+        pass
+
+    async def scan_iter(self, match):
+        for key in list(self.lists):
+            if key.startswith(match.rstrip("*")):
+                yield key.encode()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis, self.calls = redis, []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *a, **kw: self.calls.append((name, a, kw))
+
+    async def execute(self):
+        results = []
+        for name, a, kw in self.calls:
+            result = getattr(self.redis, name)(*a, **kw)
+            results.append(await result if asyncio.iscoroutine(result) else result)
+        return results
+
+
+class FakePool:
+    def __init__(self):
+        self.sent = []
+
+
+async def _deliver(pool, job):
+    pool.sent.append(job)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    monkeypatch.setattr(email_worker, "deliver", _deliver)
+    return FakeRedis()
+
+
+def test_messages_taken_by_a_crashed_worker_are_requeued(redis):
+    async def scenario():
+        for to in ("a@x.io", "b@x.io"):
+            await enqueue_email(to, "s", "h", "t", "welcome", redis=redis)
+        assert len(await email_worker._next_batch(redis)) == 2
+        assert redis.lists[OUTBOX_KEY] == []
+
+        # The worker dies here. A live worker's in-flight messages stay put …
+        live = f"{PROCESSING_PREFIX}live-worker"
+        redis.lists[live] = [b"{}"]
+        await redis.set(f"{WORKER_PREFIX}live-worker", 1)
+
+        # … and the restarted worker picks its own orphans back up
+        assert await email_worker._requeue_orphans(redis, include_own=True) == 2
+        assert redis.lists[live] == [b"{}"]
+
+        pool = FakePool()
+        await asyncio.gather(*(email_worker._send_one(redis, pool, raw, job)
+                               for raw, job in await email_worker._next_batch(redis)))
+        assert sorted(job["to"] for job in pool.sent) == ["a@x.io", "b@x.io"]
+        assert redis.lists[email_worker.PROCESSING_KEY] == []
+
+    asyncio.run(scenario())
+
+
+def test_reset_link_stays_out_of_the_queue(redis):
+    async def scenario():
+        link = "https://app.example/reset-password?token=SECRET&org=acme"
+        message_id = await enqueue_email(
+            "a@x.io", "s", f'<a href="{LINK_PLACEHOLDER}">reset</a>', LINK_PLACEHOLDER, "reset",
+            redis=redis, link=link, link_ttl=3600,
+        )
+        assert not any(b"SECRET" in raw for raw in redis.lists[OUTBOX_KEY])
+
+        pool = FakePool()
+        (raw, job), = await email_worker._next_batch(redis)
+        await email_worker._send_one(redis, pool, raw, job)
+
+        assert pool.sent[0]["html"] == f'<a href="{link.replace("&", "&amp;")}">reset</a>'
+        assert pool.sent[0]["text"] == link
+        assert await redis.get(f"{email.LINK_PREFIX}{message_id}") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,23 @@
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.lead import LEAD_STATUS_BATCH_MAX, LeadStatusBatchRequest, _lead_status_stmt
+
+
+def test_batch_is_one_array_parameter():
+    ids = [uuid4() for _ in range(3)]
+    compiled = _lead_status_stmt(uuid4(), uuid4(), ids).compile(dialect=postgresql.dialect())
+
+    assert "leads.id = ANY (%(lead_ids)s::UUID[])" in str(compiled)
+    assert compiled.params["lead_ids"] == ids
+
+
+def test_batch_size_is_bounded():
+    LeadStatusBatchRequest(lead_ids=[uuid4()] * LEAD_STATUS_BATCH_MAX)
+    with pytest.raises(ValidationError):
+        LeadStatusBatchRequest(lead_ids=[])
+    with pytest.raises(ValidationError):
+        LeadStatusBatchRequest(lead_ids=[uuid4()] * (LEAD_STATUS_BATCH_MAX + 1))
@@ -0,0 +1,62 @@
+"""
+Unit tests for app/core/query_counter.py, using an in-memory SQLite app.
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.query_counter import QueryCountMiddleware, count_queries
+
+engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+app = FastAPI()
+app.add_middleware(QueryCountMiddleware)
+
+
+@app.get("/n-plus-one")
+def n_plus_one():
+    with engine.connect() as conn:
+        ids = [r[0] for r in conn.execute(text("SELECT id FROM items"))]
+        return [conn.execute(text("SELECT id FROM items WHERE id = :id"), {"id": i}).scalar() for i in ids]
+
+
+@app.get("/batched")
+def batched():
+    with engine.connect() as conn:
+        return [r[0] for r in conn.execute(text("SELECT id FROM items"))]
+
+
+def _seed(n):
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS items"))
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO items (id) VALUES (:id)"), [{"id": i} for i in range(n)])
+
+
+client = TestClient(app)
+
+
+def test_headers_report_query_count():
+    _seed(3)
+    response = client.get("/n-plus-one")
+    assert response.headers["x-db-queries"] == "4"
+    assert response.headers["server-timing"].startswith("db;dur=")
+
+
+def test_fixture_catches_n_plus_one(assert_constant_queries):
+    assert_constant_queries(seed=_seed, request=lambda: client.get("/batched"))
+
+    try:
+        assert_constant_queries(seed=_seed, request=lambda: client.get("/n-plus-one"))
+    except BaseException as e:   # pytest.fail raises Failed (a BaseException)
+        assert "grows with data size" in str(e)
+    else:
+        raise AssertionError("N+1 endpoint was not detected")
+
+
+def test_count_queries_outside_requests():
+    _seed(1)
+    with count_queries() as stats:
+        batched()
+    assert stats.count == 1
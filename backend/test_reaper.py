@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_
+from sqlalchemy.orm.evaluator import _EvaluatorCompiler
+
+from app.core.config import settings
+from app.models.lead import Lead, LeadStatus
+from app.tasks.reaper_tasks import _stuck_lead_criteria
+
+NOW = datetime(2026, 1, 1, 12, 0)
+STALE = NOW - timedelta(seconds=settings.CALL_REAPER_TIMEOUT_SECONDS + 60)
+
+
+def _requeued(lead: Lead) -> bool:
+    # Evaluate the UPDATE's WHERE against an in-memory lead
+    return bool(_EvaluatorCompiler(Lead).process(and_(*_stuck_lead_criteria(NOW)))(lead))
+
+
+def test_stale_queued_lead_is_requeued():
+    assert _requeued(Lead(status=LeadStatus.QUEUED, updated_at=STALE, external_call_id=None))
+
+
+def test_retry_lead_with_previous_call_id_is_requeued():
+    # Second attempt claimed by a tick that died before dialing: the call id is from attempt one
+    assert _requeued(Lead(status=LeadStatus.QUEUED, updated_at=STALE, external_call_id="exec-attempt-1"))
+
+
+def test_recent_or_dialed_leads_are_left_alone():
+    assert not _requeued(Lead(status=LeadStatus.QUEUED, updated_at=NOW, external_call_id=None))
+    assert not _requeued(Lead(status=LeadStatus.CALLING, updated_at=STALE, external_call_id="exec-1"))
@@ -0,0 +1,60 @@
+"""
+Unit tests for replica_is_fresh() in app/db/session.py: a hung or failing
+replica must route reads to the primary within REPLICA_LAG_TIMEOUT_SECONDS.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.config import settings
+from app.db import session
+
+
+class FakeReplica:
+    def __init__(self, lag=0.0, delay=0.0, error=None):
+        self.lag, self.delay, self.error = lag, delay, error
+
+    @asynccontextmanager
+    async def connect(self):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        yield self
+
+    async def scalar(self, stmt):
+        return self.lag
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    monkeypatch.setattr(session, "_replica_health", {"checked_at": 0.0, "healthy": False})
+    monkeypatch.setattr(settings, "REPLICA_LAG_TIMEOUT_SECONDS", 0.05)
+
+    def use(fake):
+        monkeypatch.setattr(session, "replica_engine", fake)
+        session._replica_health["checked_at"] = 0.0
+    return use
+
+
+def test_fresh_replica_is_used(replica):
+    replica(FakeReplica(lag=0.0))
+    assert asyncio.run(session.replica_is_fresh()) is True
+
+
+def test_lagging_replica_falls_back(replica):
+    replica(FakeReplica(lag=settings.REPLICA_MAX_LAG_SECONDS + 1))
+    assert asyncio.run(session.replica_is_fresh()) is False
+
+
+def test_unreachable_replica_falls_back(replica):
+    replica(FakeReplica(error=ConnectionRefusedError("replica down")))
+    assert asyncio.run(session.replica_is_fresh()) is False
+
+
+def test_hung_replica_falls_back_within_timeout(replica):
+    replica(FakeReplica(delay=30))
+    start = time.perf_counter()
+    assert asyncio.run(session.replica_is_fresh()) is False
+    assert time.perf_counter() - start < 1
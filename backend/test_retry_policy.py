@@ -0,0 +1,29 @@
+"""
+Unit tests for app/services/retry_policy.py.
+"""
+from datetime import datetime, timedelta
+
+from app.services.campaign_scheduler import get_zone
+from app.services.retry_policy import retry_at
+
+NOW = datetime(2026, 10, 19, 6, 0)   # Monday 11:30 IST
+
+
+def test_exponential_backoff_is_capped():
+    policy = {"type": "exponential", "base_seconds": 60, "factor": 2, "max_seconds": 300}
+    assert retry_at(policy, 1, NOW) == NOW + timedelta(seconds=60)
+    assert retry_at(policy, 2, NOW) == NOW + timedelta(seconds=120)
+    assert retry_at(policy, 10, NOW) == NOW + timedelta(seconds=300)
+
+
+def test_time_of_day_picks_next_local_slot_after_min_delay():
+    policy = {"type": "time_of_day", "slots": ["10:00", "14:00", "18:30"], "min_delay_seconds": 3600}
+    # 11:30 IST + 1h → 14:00 IST = 08:30 UTC
+    assert retry_at(policy, 1, NOW, get_zone("Asia/Kolkata")) == datetime(2026, 10, 19, 8, 30)
+
+
+def test_retry_lands_inside_calling_window():
+    windows = [{"days": ["mon", "tue", "wed", "thu", "fri"], "start": "09:00", "end": "12:00"}]
+    policy = {"type": "fixed", "delay_seconds": 3600}
+    # 12:30 IST is after hours → next day 09:00 IST = 03:30 UTC
+    assert retry_at(policy, 1, NOW, get_zone("Asia/Kolkata"), windows) == datetime(2026, 10, 20, 3, 30)
@@ -0,0 +1,43 @@
+"""
+Unit tests for app/core/tracing.py — no server, Redis or Postgres needed.
+"""
+import json
+import time
+
+from app.core import tracing
+from app.core.config import settings
+
+
+def test_disabled_tracing_is_noop(monkeypatch):
+    monkeypatch.setattr(settings, "TRACING_EXPORTER", "")
+    with tracing.start_span("noop") as span:
+        assert span.traceparent is None
+
+
+def test_webhook_span_joins_make_call_trace(monkeypatch, tmp_path):
+    out = tmp_path / "spans.jsonl"
+    monkeypatch.setattr(settings, "TRACING_EXPORTER", "json")
+    monkeypatch.setattr(settings, "TRACING_JSON_PATH", str(out))
+
+    with tracing.start_span("campaign.dial") as dial:
+        with tracing.start_span("bolna.make_call") as call:
+            traceparent = call.traceparent
+
+    # A later request continues the trace from the echoed metadata
+    with tracing.start_span("bolna.webhook", traceparent=traceparent) as hook:
+        pass
+
+    tracing._exporter().flush()
+    deadline = time.time() + 5   # the exporter thread may hold part of the batch
+    while time.time() < deadline and (not out.exists() or len(out.read_text().splitlines()) < 3):
+        time.sleep(0.05)
+    spans = {s["name"]: s for s in map(json.loads, out.read_text().splitlines())}
+
+    assert spans["bolna.make_call"]["parent_id"] == dial.span_id
+    assert spans["bolna.webhook"]["parent_id"] == call.span_id
+    assert {s["trace_id"] for s in spans.values()} == {dial.trace_id}
+
+
+def test_malformed_traceparent_starts_new_trace():
+    assert tracing.parse_traceparent("garbage") is None
+    assert tracing.parse_traceparent("00-" + "a" * 32 + "-" + "b" * 16 + "-01") == ("a" * 32, "b" * 16)
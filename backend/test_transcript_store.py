@@ -0,0 +1,47 @@
+from app.services.transcript_store import compress, compressed_columns, decompress
+
+
+def test_round_trip():
+    text = "Agent: नमस्ते, क्या आप बात कर सकते हैं?\nUser: Yes, go ahead.\n" * 50
+    blob, size = compress(text)
+    assert size == len(text.encode("utf-8"))
+    assert len(blob) < size
+    assert decompress(blob, size) == text
+
+
+def test_missing_parts_are_left_alone():
+    assert compress(None) == (None, None)
+    assert decompress(None, None) is None
+    assert compressed_columns(None, None) == {}
+    assert set(compressed_columns(None, "Interested.")) == {"summary_zst", "summary_bytes"}
+    assert compressed_columns("", None)["transcript_bytes"] == 0
+
+
+def _upsert_sql(transcript, summary) -> str:
+    import asyncio
+    import uuid
+    from datetime import datetime
+    from types import SimpleNamespace
+
+    from sqlalchemy.dialects import postgresql
+
+    from app.services.transcript_store import save_transcript
+
+    statements = []
+
+    class _Session:
+        async def execute(self, stmt):
+            statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+    log = SimpleNamespace(id=uuid.uuid4(), created_at=datetime.utcnow(), campaign_id=uuid.uuid4())
+    asyncio.run(save_transcript(_Session(), log, transcript, summary))
+    return statements[0]
+
+
+def test_search_vector_keeps_the_part_not_in_the_event():
+    # Transcript only → keep the stored summary lexemes (weight A), and vice versa
+    assert "ts_filter(coalesce(call_transcripts.search_vector, ''::tsvector), '{a}') || excluded.search_vector" \
+        in _upsert_sql("Agent: hello", None)
+    assert "excluded.search_vector || ts_filter(coalesce(call_transcripts.search_vector, ''::tsvector), '{b}')" \
+        in _upsert_sql(None, "Interested.")
+    assert "search_vector = excluded.search_vector" in _upsert_sql("Agent: hello", "Interested.")
@@ -0,0 +1,39 @@
+"""
+Unit test for the per-call debit timing in app/services/wallet_service.py.
+"""
+import asyncio
+from types import SimpleNamespace
+
+from app.core.metrics import WALLET_DEBIT_LATENCY
+from app.services import wallet_service
+
+
+class SlowFlushSession:
+    """The debit's UPDATE / INSERT only reach the database on flush."""
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def flush(self):
+        await asyncio.sleep(0.05)
+
+
+def _observed_sum() -> float:
+    return next(s.value for m in WALLET_DEBIT_LATENCY.collect() for s in m.samples if s.name.endswith("_sum"))
+
+
+def test_debit_latency_covers_the_flush(monkeypatch):
+    wallet = SimpleNamespace(id="w1", minutes_balance=10, total_minutes_used=0, rate_per_minute=2.0)
+
+    async def get_wallet(organization_id, db):
+        return wallet
+    monkeypatch.setattr(wallet_service, "get_or_create_wallet", get_wallet)
+
+    before = _observed_sum()
+    result = asyncio.run(wallet_service.deduct_minutes_for_call("org", 61, "log-1", SlowFlushSession()))
+
+    assert result["minutes_deducted"] == 2 and wallet.minutes_balance == 8
+    assert _observed_sum() - before >= 0.05
@@ -0,0 +1,77 @@
+"""
+Unit tests for the typed Bolna payload decoder in app/schemas/webhook.py.
+"""
+import json
+
+from app.schemas.webhook import BolnaWebhook
+
+
+def test_flat_execution_record_resolves_aliases():
+    raw = json.dumps({
+        "id": "call-1",
+        "status": "completed",
+        "telephony_data": {"to_number": "+919876543210", "duration": "42", "recording_url": "https://r/x.mp3"},
+        "total_cost": "not-a-number",
+        "extracted_data": {"interest_level": "high"},
+        "unrelated": {"deeply": ["nested"]},
+    }).encode()
+
+    event_type, event = BolnaWebhook.decode(raw)
+
+    assert event_type is None
+    assert event.external_id == "call-1"
+    assert event.phone == "+919876543210"
+    assert event.duration == 42.0          # falls back to telephony_data.duration
+    assert event.cost == 0.0               # junk counts as missing
+    assert event.interest_level == "high"
+    assert event.customer_sentiment is None
+
+
+def test_envelope_takes_metadata_and_timestamp_from_the_root():
+    event_type, event = BolnaWebhook.decode({
+        "event": "call.completed",
+        "data": {"call_id": "call-2", "status": "completed", "conversation_duration": 10},
+        "metadata": {"lead_id": "lead-1"},
+        "timestamp": "2026-01-01T00:00:00Z",
+    })
+
+    assert event_type == "call.completed"
+    assert event.external_id == "call-2"
+    assert event.metadata == {"lead_id": "lead-1"}
+    assert event.updated_at == "2026-01-01T00:00:00Z"
+
+
+def test_junk_fields_count_as_missing_instead_of_rejecting_the_event():
+    # Each of these used to raise ValidationError → 400 → a lost "completed" event
+    raw = json.dumps({
+        "id": 12345,
+        "status": "completed",
+        "user_number": 919876543210,
+        "appointment_booked": None,
+        "transfer_call": "maybe",
+        "extracted_data": "",
+        "telephony_data": [],
+        "conversation_duration": 30,
+    }).encode()
+
+    _, event = BolnaWebhook.decode(raw)
+
+    assert event.external_id == "12345"
+    assert event.phone == "919876543210"
+    assert event.appointment_booked is None
+    assert event.transfer_call is None
+    assert event.customer_sentiment is None and event.interest_level is None
+    assert event.recording_url is None
+    assert event.duration == 30.0
+
+
+def test_string_flags_are_understood():
+    _, event = BolnaWebhook.decode(json.dumps({"id": "c", "appointment_booked": "true", "transfer_call": 0}))
+    assert event.appointment_booked is True
+    assert event.transfer_call is False
+
+
+def test_non_object_envelope_data_falls_back_to_the_root():
+    event_type, event = BolnaWebhook.decode(json.dumps({"event": "call.updated", "data": "", "id": "c"}))
+    assert event_type == "call.updated"
+    assert event.external_id == "c"